@@ -0,0 +1,199 @@
+# app/ai/cache.py
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+EXPLAIN_CACHE_SIZE = int(os.getenv("EXPLAIN_CACHE_SIZE", "1024"))
+EXPLAIN_CACHE_TTL_S = float(os.getenv("EXPLAIN_CACHE_TTL_S", "3600"))
+
+# Optional on-disk tier (SQLite file); unset = memory only
+EXPLAIN_CACHE_DB = os.getenv("EXPLAIN_CACHE_DB")
+
+# Disk puts between prunes (expired rows, then rows past max_disk_entries)
+_PRUNE_EVERY = 64
+
+
+def canonical_key(payload: Dict[str, Any], model: str) -> str:
+    """
+    Content address of an explain payload: sha256 over canonical JSON
+    (sorted keys, no whitespace) together with the model name.
+    """
+    canonical = json.dumps(
+        {"model": model, "payload": payload},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ExplanationCache:
+    """
+    LRU + TTL cache for validated AI explanations.
+
+    - Memory tier: bounded OrderedDict, least recently used evicted first
+    - Disk tier (optional): SQLite table that survives restarts; disk hits
+      are promoted back into memory. Pruned every few puts, so it can run
+      up to _PRUNE_EVERY rows past max_disk_entries in between
+    - Only successful (validated) explanations should be stored
+    """
+
+    def __init__(
+        self,
+        max_entries: int = EXPLAIN_CACHE_SIZE,
+        ttl_s: float = EXPLAIN_CACHE_TTL_S,
+        db_path: Optional[str] = EXPLAIN_CACHE_DB,
+        max_disk_entries: Optional[int] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.max_disk_entries = max_disk_entries or max_entries * 10
+        self._disk_puts = 0
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS explanations ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS explanations_expires ON explanations (expires_at)"
+            )
+            self._db.commit()
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return value
+
+                del self._entries[key]
+                self._counters["expirations"] += 1
+
+            value = self._disk_get(key, now)
+            if value is not None:
+                self._counters["disk_hits"] += 1
+                return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def _disk_get(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        if self._db is None:
+            return None
+
+        row = self._db.execute(
+            "SELECT value, expires_at FROM explanations WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        raw, expires_at = row
+        if expires_at <= now:
+            self._db.execute("DELETE FROM explanations WHERE key = ?", (key,))
+            self._db.commit()
+            self._counters["expirations"] += 1
+            return None
+
+        value = json.loads(raw)
+        self._memory_put(key, value, expires_at)
+        return value
+
+    # -----------------------------
+    # Insert
+    # -----------------------------
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl_s
+
+        with self._lock:
+            self._memory_put(key, value, expires_at)
+
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO explanations (key, value, expires_at)"
+                    " VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+                self._disk_puts += 1
+                if self._disk_puts % _PRUNE_EVERY == 0:
+                    self._disk_prune()
+                self._db.commit()
+
+    def _memory_put(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _disk_prune(self) -> None:
+        self._db.execute("DELETE FROM explanations WHERE expires_at <= ?", (time.time(),))
+        self._db.execute(
+            "DELETE FROM explanations WHERE key IN ("
+            " SELECT key FROM explanations ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+
+    # -----------------------------
+    # Introspection
+    # -----------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["disk_hits"] + self._counters["misses"]
+            hits = self._counters["hits"] + self._counters["disk_hits"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_enabled": self._db is not None,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM explanations")
+                self._db.commit()
+
+
+_shared_cache: Optional[ExplanationCache] = None
+
+
+def get_explanation_cache() -> ExplanationCache:
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ExplanationCache()
+    return _shared_cache
@@ -2,8 +2,10 @@
 
 import os
 import json
+import asyncio
 import requests
-from typing import Dict, Any, Optional
+import httpx
+from typing import AsyncIterator, Dict, Any, Optional
 
 from app.ai.validation import validate_explanation
 
@@ -14,6 +16,10 @@ OLLAMA_URL = os.getenv(
 
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral")
 
+# Async client: in-flight generation cap and per-request deadline (seconds)
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "4"))
+OLLAMA_TIMEOUT_S = float(os.getenv("OLLAMA_TIMEOUT_S", "60"))
+
 
 # -----------------------------
 # Strict system prompt
@@ -80,6 +86,61 @@ Output MUST be valid JSON and match this schema exactly:
 """
 
 
+# -----------------------------
+# Output parsing
+# -----------------------------
+
+def parse_ai_output(raw_text: str) -> Optional[Dict[str, Any]]:
+    """
+    Strictly parse and validate the raw LLM completion.
+    Returns None if the output does not match the contract.
+    """
+
+    raw_text = raw_text.strip()
+    if not raw_text:
+        return None
+
+    # -----------------------------
+    # Parse JSON strictly
+    # -----------------------------
+    try:
+        parsed = json.loads(raw_text)
+    except json.JSONDecodeError:
+        print("AI returned non-JSON output")
+        return None
+
+    # -----------------------------
+    # Minimal structural validation
+    # -----------------------------
+    required_keys = {
+        "system_state_summary",
+        "failure_explanation",
+        "identified_factors",
+        "mitigation_suggestions",
+    }
+
+    if not isinstance(parsed, dict) or not required_keys.issubset(parsed.keys()):
+        print("AI output missing required fields")
+        return None
+
+    if not isinstance(parsed["identified_factors"], list):
+        return None
+
+    if not isinstance(parsed["mitigation_suggestions"], list):
+        return None
+
+    # Optional: validate text fields for hallucination signals
+    if not validate_explanation(parsed["failure_explanation"]):
+        return None
+
+    return parsed
+
+
+def build_full_prompt(explain_payload: Dict[str, Any]) -> str:
+    user_prompt = build_structured_prompt(explain_payload)
+    return f"{SYSTEM_PROMPT}\n\n{user_prompt}"
+
+
 # -----------------------------
 # AI explanation entry point
 # -----------------------------
@@ -101,14 +162,11 @@ def generate_ai_explanation(
     """
 
     try:
-        user_prompt = build_structured_prompt(explain_payload)
-        full_prompt = f"{SYSTEM_PROMPT}\n\n{user_prompt}"
-
         response = requests.post(
             OLLAMA_URL,
             json={
                 "model": OLLAMA_MODEL,
-                "prompt": full_prompt,
+                "prompt": build_full_prompt(explain_payload),
                 "stream": False,
             },
             timeout=60,
@@ -119,46 +177,213 @@ def generate_ai_explanation(
             return None
 
         data = response.json()
-        raw_text = data.get("response", "").strip()
+        return parse_ai_output(data.get("response", ""))
 
-        if not raw_text:
-            return None
+    except Exception as e:
+        print("OLLAMA AI ERROR:", e)
+        return None
 
-        # -----------------------------
-        # Parse JSON strictly
-        # -----------------------------
-        try:
-            parsed = json.loads(raw_text)
-        except json.JSONDecodeError:
-            print("AI returned non-JSON output")
-            return None
 
-        # -----------------------------
-        # Minimal structural validation
-        # -----------------------------
-        required_keys = {
-            "system_state_summary",
-            "failure_explanation",
-            "identified_factors",
-            "mitigation_suggestions",
-        }
+# -----------------------------
+# Async, pooled client
+# -----------------------------
 
-        if not required_keys.issubset(parsed.keys()):
-            print("AI output missing required fields")
-            return None
+class AsyncOllamaClient:
+    """
+    Shared Ollama client for async handlers.
 
-        if not isinstance(parsed["identified_factors"], list):
-            return None
+    - One keep-alive connection pool for every request
+    - At most max_concurrency generations in flight; the rest wait
+    - Each call has a deadline covering both the wait and the request
+    """
+
+    def __init__(
+        self,
+        url: str = OLLAMA_URL,
+        model: str = OLLAMA_MODEL,
+        max_concurrency: int = OLLAMA_MAX_CONCURRENCY,
+        timeout_s: float = OLLAMA_TIMEOUT_S,
+    ):
+        self.url = url
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout_s = timeout_s
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _session(self) -> httpx.AsyncClient:
+        """
+        Pool and semaphore are bound to the running event loop; they are
+        (re)created lazily if the loop changes (e.g. between test clients).
+        The previous pool is closed first.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                await self._close_stale(self._client)
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=30,
+                ),
+                timeout=httpx.Timeout(self.timeout_s, connect=5.0),
+            )
+            self._limit = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client
+
+    @staticmethod
+    async def _close_stale(client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            # Its connections belong to the old (possibly closed) loop;
+            # whatever could not be closed gracefully is dropped
+            print("OLLAMA CLIENT CLOSE ERROR:", e)
+
+    async def _generate(self, prompt: str) -> Optional[str]:
+        client = await self._session()
+
+        async with self._limit:
+            response = await client.post(
+                self.url,
+                json={
+                    "model": self.model,
+                    "prompt": prompt,
+                    "stream": False,
+                },
+            )
 
-        if not isinstance(parsed["mitigation_suggestions"], list):
+        if response.status_code != 200:
+            print("OLLAMA ERROR:", response.text)
             return None
 
-        # Optional: validate text fields for hallucination signals
-        if not validate_explanation(parsed["failure_explanation"]):
+        # Anything but {"response": "<text>", ...} is a malformed reply
+        data = response.json()
+        if not isinstance(data, dict) or not isinstance(data.get("response"), str):
+            print("OLLAMA ERROR: unexpected response body:", response.text[:200])
+            return None
+        return data["response"]
+
+    async def generate(
+        self, prompt: str, deadline_s: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Raw completion text, or None on error / deadline.
+        """
+        try:
+            return await asyncio.wait_for(
+                self._generate(prompt), deadline_s or self.timeout_s
+            )
+        except asyncio.TimeoutError:
+            print("OLLAMA AI ERROR: deadline exceeded")
+            return None
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError: 200 with a non-JSON body (JSONDecodeError)
+            print("OLLAMA AI ERROR:", e)
             return None
 
-        return parsed
+    async def stream(
+        self, prompt: str, deadline_s: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield completion text incrementally from Ollama's NDJSON stream.
+        Stops silently on error or deadline; the caller validates whatever
+        text was assembled.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (deadline_s or self.timeout_s)
+        client = await self._session()
 
-    except Exception as e:
-        print("OLLAMA AI ERROR:", e)
+        try:
+            await asyncio.wait_for(self._limit.acquire(), deadline - loop.time())
+        except asyncio.TimeoutError:
+            print("OLLAMA AI ERROR: deadline exceeded")
+            return
+
+        try:
+            async with client.stream(
+                "POST",
+                self.url,
+                json={
+                    "model": self.model,
+                    "prompt": prompt,
+                    "stream": True,
+                },
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    print("OLLAMA ERROR:", response.text)
+                    return
+
+                lines = response.aiter_lines()
+                while True:
+                    try:
+                        line = await asyncio.wait_for(
+                            lines.__anext__(), deadline - loop.time()
+                        )
+                    except StopAsyncIteration:
+                        return
+
+                    if not line.strip():
+                        continue
+
+                    chunk = json.loads(line)
+                    if not isinstance(chunk, dict):
+                        print("OLLAMA ERROR: unexpected stream chunk:", line[:200])
+                        return
+                    if isinstance(chunk.get("response"), str) and chunk["response"]:
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        return
+
+        except asyncio.TimeoutError:
+            print("OLLAMA AI ERROR: deadline exceeded")
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
+            print("OLLAMA AI ERROR:", e)
+        finally:
+            self._limit.release()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_shared_client: Optional[AsyncOllamaClient] = None
+
+
+def get_ollama_client() -> AsyncOllamaClient:
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncOllamaClient()
+    return _shared_client
+
+
+async def close_ollama_client() -> None:
+    if _shared_client is not None:
+        await _shared_client.aclose()
+
+
+async def generate_ai_explanation_async(
+    explain_payload: Dict[str, Any],
+    client: Optional[AsyncOllamaClient] = None,
+    deadline_s: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Async counterpart of generate_ai_explanation on the shared client.
+    Same return contract (validated dict or None).
+    """
+
+    client = client or get_ollama_client()
+
+    raw_text = await client.generate(
+        build_full_prompt(explain_payload), deadline_s=deadline_s
+    )
+    if raw_text is None:
         return None
+
+    return parse_ai_output(raw_text)
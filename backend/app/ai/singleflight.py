@@ -0,0 +1,53 @@
+# app/ai/singleflight.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls that share a key.
+
+    The first caller for a key starts the work as a task; callers that
+    arrive while it is in flight await the same task and receive the same
+    result (or exception). The task is shielded, so a caller that
+    disconnects does not cancel the work for everyone else.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._counters = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+        }
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self._counters["calls"] += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            self._counters["executions"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self._counters["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "inflight": len(self._inflight),
+        }
+
+
+_shared_flight: Optional[SingleFlight] = None
+
+
+def get_explain_flight() -> SingleFlight:
+    global _shared_flight
+    if _shared_flight is None:
+        _shared_flight = SingleFlight()
+    return _shared_flight
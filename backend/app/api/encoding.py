@@ -0,0 +1,317 @@
+# app/api/encoding.py
+
+import gzip
+import json
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from app.core.rules import STATUS_BY_CODE
+from app.core.series import MetricSeries
+from app.core.simulation import SimulationResult, ServiceState
+from app.core.timeline import HealthTimeline
+from app.core.topology import Topology
+
+try:  # Rust-backed encoder, serializes numpy arrays natively
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:  # binary frames (Accept: application/x-msgpack)
+    import msgpack
+except ImportError:  # pragma: no cover - JSON only
+    msgpack = None
+
+try:  # Content-Encoding: br
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+# "points": [{"time", "value"}, ...] per metric (SimulationState)
+# "columns": {"time": [...], "values": [...]} per metric (SimulationStateColumns)
+MetricsLayout = Literal["points", "columns"]
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/msgpack", "application/vnd.msgpack")
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def negotiated_responses(status_code: int = 200) -> Dict[int, Dict[str, Any]]:
+    """
+    OpenAPI `responses` entry documenting the alternate media type.
+    """
+    return {
+        status_code: {
+            "description": (
+                "JSON by default. With Accept: application/x-msgpack, the same "
+                "document as a MessagePack frame whose metric series are packed "
+                "(see app.api.encoding.pack_series)."
+            ),
+            "content": {MSGPACK_MEDIA_TYPE: {}},
+        }
+    }
+
+
+# -----------------------------
+# JSON Encoding
+# -----------------------------
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Compact JSON bytes. Uses orjson when installed, stdlib json otherwise;
+    numpy arrays and scalars are accepted either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY, default=_default)
+    return json.dumps(
+        content, separators=(",", ":"), ensure_ascii=False, default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered straight from plain dicts / arrays.
+
+    Returning a Response skips FastAPI's response_model validation, so
+    the route's response_model only documents the schema; the content
+    builders below must keep to it.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# -----------------------------
+# SimulationResult -> Content
+# -----------------------------
+
+def system_mode(result: SimulationResult) -> str:
+    return max(
+        (svc.status for svc in result.services.values()),
+        key=STATUS_BY_CODE.index,
+    ).value
+
+
+def service_nodes(services: Dict[str, ServiceState]) -> List[Dict[str, Any]]:
+    """
+    ServiceNode-shaped dicts.
+    """
+    return [
+        {
+            "id": key,
+            "name": svc.name,
+            "status": svc.status.value,
+            "latency_ms": round(svc.latency_ms, 1),
+            "error_rate_pct": round(svc.error_rate_pct, 2),
+        }
+        for key, svc in services.items()
+    ]
+
+
+def metrics_content(metrics: Dict[str, MetricSeries], layout: str = "points") -> Dict[str, Any]:
+    if layout == "packed":
+        return {name: pack_series(series) for name, series in metrics.items()}
+    if layout == "columns":
+        return {
+            name: {"time": series.time, "values": series.values}
+            for name, series in metrics.items()
+        }
+    return {name: series.to_points() for name, series in metrics.items()}
+
+
+# Status code -> name, for decoding whole timelines at once
+_STATUS_NAMES = np.array([status.value for status in STATUS_BY_CODE])
+
+
+def health_content(timeline: HealthTimeline, layout: str = "points") -> Dict[str, Any]:
+    """
+    HealthTimeline-shaped dict: per service, its status per tick plus the
+    timeline's transition summary. layout="packed" sends each status
+    series as int8 codes (bytes) and the time axis like pack_series.
+    """
+    summary = timeline.summary()
+    if layout == "packed":
+        time = np.asarray(timeline.time)
+        statuses = [timeline.status[:, j].astype("i1").tobytes() for j in range(len(summary))]
+        content = {
+            "start": int(time[0]) if len(time) else 0,
+            "time_deltas": np.diff(time).astype("<i4").tobytes(),
+        }
+    else:
+        statuses = _STATUS_NAMES[timeline.status.T].tolist()
+        content = {"time": timeline.time}
+
+    content["services"] = {
+        key: {"status": status, **summary[key]}
+        for key, status in zip(timeline.service_keys, statuses)
+    }
+    return content
+
+
+def simulation_state_content(
+    result: SimulationResult,
+    topology: Topology,
+    layout: str = "points",
+) -> Dict[str, Any]:
+    """
+    SimulationState (layout="points") or SimulationStateColumns
+    (layout="columns") as plain data, without building per-point models.
+    layout="packed" is the binary-frame variant (see pack_series).
+    """
+    return {
+        "system_mode": system_mode(result),
+        "topology": {
+            "id": topology.id,
+            "version": topology.version,
+            "services": service_nodes(result.services),
+            # DependencyEdge list, built once per topology version
+            "dependencies": topology.dependency_nodes,
+        },
+        "metrics": metrics_content(result.metrics, layout),
+        "run_id": result.run_id,
+        "seed": result.seed,
+        "health": (
+            health_content(result.timeline, layout) if result.timeline is not None else None
+        ),
+    }
+
+
+# -----------------------------
+# Packed Series (binary frames)
+# -----------------------------
+
+def pack_series(series: MetricSeries) -> Dict[str, Any]:
+    """
+    Compact form of one metric series:
+      start        first time (int)
+      time_deltas  int32 little-endian, time[i + 1] - time[i]
+      values       float32 little-endian
+    """
+    if len(series) == 0:
+        return {"start": 0, "time_deltas": b"", "values": b""}
+
+    return {
+        "start": int(series.time[0]),
+        "time_deltas": np.diff(series.time).astype("<i4").tobytes(),
+        "values": series.values.astype("<f4").tobytes(),
+    }
+
+
+def unpack_series(packed: Dict[str, Any]) -> MetricSeries:
+    values = np.frombuffer(packed["values"], dtype="<f4")
+    if len(values) == 0:
+        return MetricSeries([], [])
+
+    deltas = np.frombuffer(packed["time_deltas"], dtype="<i4")
+    time = np.concatenate(([0], np.cumsum(deltas, dtype=np.int64))) + packed["start"]
+    return MetricSeries(time, values)
+
+
+# -----------------------------
+# Content Negotiation
+# -----------------------------
+
+def _quality(header: str) -> Dict[str, float]:
+    """
+    "gzip, br;q=0.8" -> {"gzip": 1.0, "br": 0.8}
+    """
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name.lower()] = q
+    return accepted
+
+
+def wants_msgpack(request: Request) -> bool:
+    """
+    True when the client prefers MessagePack over JSON (and it is installed).
+    """
+    if msgpack is None:
+        return False
+
+    accepted = _quality(request.headers.get("accept", ""))
+    q_msgpack = max(accepted.get(t, 0.0) for t in MSGPACK_MEDIA_TYPES)
+    q_json = max(accepted.get(t, 0.0) for t in ("application/json", "application/*", "*/*"))
+    return q_msgpack > 0 and q_msgpack >= q_json
+
+
+def _compress(request: Request, body: bytes) -> Tuple[bytes, Optional[str]]:
+    if len(body) < COMPRESS_MIN_BYTES:
+        return body, None
+
+    accepted = _quality(request.headers.get("accept-encoding", ""))
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return brotli.compress(body, quality=BROTLI_QUALITY), "br"
+    if accepted.get("gzip", 0) > 0:
+        return gzip.compress(body, compresslevel=GZIP_LEVEL), "gzip"
+    return body, None
+
+
+def negotiated_response(
+    request: Request,
+    content_for: Callable[[str], Dict[str, Any]],
+    layout: MetricsLayout = "points",
+    status_code: int = 200,
+) -> Response:
+    """
+    Encode content_for(layout) per the request's Accept headers.
+    - Accept: application/x-msgpack -> MessagePack frame, packed series
+    - otherwise JSON in the requested layout, gzip / br compressed when
+      the client accepts it and the body is large enough
+    """
+    headers = {"Vary": "Accept, Accept-Encoding"}
+
+    if wants_msgpack(request):
+        return Response(
+            msgpack.packb(content_for("packed"), use_bin_type=True),
+            status_code=status_code,
+            media_type=MSGPACK_MEDIA_TYPE,
+            headers=headers,
+        )
+
+    body, encoding = _compress(request, dumps(content_for(layout)))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(
+        body, status_code=status_code, media_type="application/json", headers=headers
+    )
+
+
+def simulation_response(
+    request: Request,
+    result: SimulationResult,
+    topology: Topology,
+    layout: MetricsLayout = "points",
+) -> Response:
+    """
+    Negotiated SimulationState response.
+    """
+    return negotiated_response(
+        request,
+        lambda layout: simulation_state_content(result, topology, layout),
+        layout,
+    )
@@ -0,0 +1,179 @@
+# app/api/executors.py
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import APIRouter
+
+router = APIRouter()
+
+# Threads per workload class:
+# - simulation: short CPU-bound requests (simulate, inject, sessions, runs)
+# - batch: long requests that mostly wait on the sweep's process pool or
+#   scan the run store
+# - llm: explain requests (payload assembly; the model call itself is
+#   async and capped by OLLAMA_MAX_CONCURRENCY)
+SIMULATION_WORKERS = int(os.getenv("SIMULATION_WORKERS", str(min(8, (os.cpu_count() or 1) + 2))))
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "2"))
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", "4"))
+
+# Recent tasks per pool behind the wait / run time percentiles
+POOL_STATS_WINDOW = 1024
+
+SIMULATION = "simulation"
+BATCH = "batch"
+LLM = "llm"
+
+
+# -----------------------------
+# Workload Pool
+# -----------------------------
+
+def _percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {"mean": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50": round(ordered[last // 2] * 1000, 3),
+        "p95": round(ordered[int(last * 0.95)] * 1000, 3),
+        "max": round(ordered[last] * 1000, 3),
+    }
+
+
+class WorkloadPool:
+    """
+    Sized thread pool for one class of blocking work.
+
+    Handlers await run(); the event loop stays free while the call waits
+    for a worker and runs, so a saturated pool only delays its own
+    workload. Tracks queued / active calls and, over the last `window`
+    calls, the time spent waiting for a worker and running.
+    """
+
+    def __init__(self, name: str, workers: int, window: int = POOL_STATS_WINDOW):
+        self.name = name
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-pool")
+
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._waits: deque = deque(maxlen=window)
+        self._runs: deque = deque(maxlen=window)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        fn(*args, **kwargs) on a worker, in a copy of the caller's context.
+        """
+        call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._waits.append(started - submitted)
+            try:
+                return call()
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._runs.append(time.perf_counter() - started)
+
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, task)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            queued, active = self._queued, self._active
+            peak_queued, completed = self._peak_queued, self._completed
+            waits, runs = list(self._waits), list(self._runs)
+
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "active": active,
+            "queued": queued,
+            "peak_queued": peak_queued,
+            # Busy workers / workers; queued > 0 means saturated
+            "saturation": round(active / self.workers, 3),
+            "completed": completed,
+            "wait_ms": _percentiles(waits),
+            "run_ms": _percentiles(runs),
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# -----------------------------
+# Shared Pools
+# -----------------------------
+
+_shared_pools: Optional[Dict[str, WorkloadPool]] = None
+_shared_lock = threading.Lock()
+
+
+def get_executor_pools() -> Dict[str, WorkloadPool]:
+    global _shared_pools
+    with _shared_lock:
+        if _shared_pools is None:
+            _shared_pools = {
+                SIMULATION: WorkloadPool(SIMULATION, SIMULATION_WORKERS),
+                BATCH: WorkloadPool(BATCH, BATCH_WORKERS),
+                LLM: WorkloadPool(LLM, LLM_WORKERS),
+            }
+        return _shared_pools
+
+
+def shutdown_executor_pools() -> None:
+    global _shared_pools
+    with _shared_lock:
+        pools, _shared_pools = _shared_pools, None
+    for pool in (pools or {}).values():
+        pool.shutdown()
+
+
+def offload(pool: str):
+    """
+    Turns a blocking handler into an async one that runs on `pool`.
+
+    FastAPI reads the wrapped signature (functools.wraps), so parameters,
+    validation and docs are unchanged; only where the body runs moves.
+    """
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        async def handler(*args: Any, **kwargs: Any) -> Any:
+            return await get_executor_pools()[pool].run(fn, *args, **kwargs)
+
+        return handler
+
+    return decorate
+
+
+# -----------------------------
+# Pool Statistics
+# -----------------------------
+
+@router.get("/executors")
+async def executor_stats():
+    """
+    Saturation and queue wait time of each workload pool.
+    """
+    return {"pools": [pool.stats() for pool in get_executor_pools().values()]}
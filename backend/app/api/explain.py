@@ -1,11 +1,21 @@
 # app/api/explain.py
 
-from fastapi import APIRouter
-from pydantic import BaseModel
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, model_validator
+
+from app.api.executors import LLM, get_executor_pools, offload
+from app.api.sse import SSE_HEADERS, format_sse
+from app.api.topologies import resolve_topology
 
 from app.core.simulation import run_baseline_simulation
 from app.core.failures import FailureScenario, FAILURE_APPLIERS
 from app.core.propagation import propagate_failures
+from app.core.session import get_session_store
+from app.core.rng import MAX_SEED, make_run_id
+from app.core.runstore import get_run_store
 
 from app.core.explain_payload import build_explain_payload
 
@@ -14,7 +24,14 @@ from app.models.explanation import (
     MitigationSuggestion,
 )
 
-from app.ai.explainer import generate_ai_explanation
+from app.ai.explainer import (
+    build_full_prompt,
+    generate_ai_explanation_async,
+    get_ollama_client,
+    parse_ai_output,
+)
+from app.ai.cache import canonical_key, get_explanation_cache
+from app.ai.singleflight import get_explain_flight
 
 router = APIRouter()
 
@@ -24,48 +41,123 @@ router = APIRouter()
 # -----------------------------
 
 class ExplainRequest(BaseModel):
-    scenario: FailureScenario
+    # Optional only with run_id (defaults to the stored run's scenario)
+    scenario: Optional[FailureScenario] = None
+    seed: Optional[int] = Field(None, ge=0, lt=MAX_SEED)
+
+    # Explain the live state of a /sessions run instead of a fresh one
+    session_id: Optional[str] = None
+
+    # Explain a stored run (GET /runs) without recomputing it
+    run_id: Optional[str] = None
+
+    # Registry topology for fresh runs (GET /topologies)
+    topology: Optional[str] = None
+    topology_version: Optional[int] = None
+
+    @model_validator(mode="after")
+    def _scenario_or_run(self) -> "ExplainRequest":
+        if self.session_id and self.run_id:
+            raise ValueError("Provide either session_id or run_id")
+        if self.scenario is None and not self.run_id:
+            raise ValueError("scenario is required unless run_id is given")
+        return self
 
 
 # -----------------------------
-# Explain Endpoint
+# Shared Steps
 # -----------------------------
 
-@router.post("/explain", response_model=ExplanationResponse)
-def explain(request: ExplainRequest):
-    # -------------------------------------------------
-    # 1. Run baseline simulation (deterministic)
-    # -------------------------------------------------
-    result = run_baseline_simulation()
+def _explain_payload(request: ExplainRequest) -> Dict[str, Any]:
+    if request.session_id:
+        # ---------------------------------------------
+        # 1–2. Current session state; metric trends
+        #      read the session's window views
+        # ---------------------------------------------
+        session = get_session_store().get(request.session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired session")
 
-    # -------------------------------------------------
-    # 2. Apply failure scenario + propagation
-    # -------------------------------------------------
-    applier = FAILURE_APPLIERS.get(request.scenario)
-    if applier:
-        applier(result)
-        propagate_failures(result)
+        with session.lock:
+            payload = build_explain_payload(
+                result=session.snapshot(),
+                scenario=request.scenario.value,
+            )
+    elif request.run_id:
+        # ---------------------------------------------
+        # 1–2. Stored run, metrics read from the mmap'd segment
+        # ---------------------------------------------
+        stored = get_run_store().get(request.run_id)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Unknown run")
 
-    # -------------------------------------------------
-    # 3. Build deterministic explain payload
-    #    (THIS is the single source of truth for AI)
-    # -------------------------------------------------
-    payload = build_explain_payload(
-        result=result,
-        scenario=request.scenario.value,
-    )
+        scenario = request.scenario.value if request.scenario else stored.scenario
+        payload = build_explain_payload(
+            result=stored.result,
+            scenario=scenario or "baseline",
+        )
+    else:
+        scenario = request.scenario.value
+        applier = FAILURE_APPLIERS.get(request.scenario)
+        topology = resolve_topology(request.topology, request.topology_version)
+
+        # Same steps as /inject-failure, so a seeded run it stored
+        # (or one stored here earlier) is reused as is
+        store = get_run_store()
+        stored = None
+        if applier and request.seed is not None:
+            stored = store.get(
+                make_run_id("inject_failure", scenario, request.seed, topology=topology.run_key)
+            )
+
+        if stored is not None:
+            result = stored.result
+        else:
+            # ---------------------------------------------
+            # 1. Run baseline simulation (deterministic)
+            # ---------------------------------------------
+            result = run_baseline_simulation(seed=request.seed)
+
+            # ---------------------------------------------
+            # 2. Apply failure scenario + propagation
+            # ---------------------------------------------
+            if applier:
+                applier(result)
+                propagate_failures(result, topology.graph_for(tuple(result.services)))
+                result.run_id = make_run_id(
+                    "inject_failure", scenario, result.seed, topology=topology.run_key
+                )
+                result.topology = topology.key
+                store.put(result, "inject_failure", scenario)
+
+        # ---------------------------------------------
+        # 3. Build deterministic explain payload
+        #    (THIS is the single source of truth for AI)
+        # ---------------------------------------------
+        payload = build_explain_payload(
+            result=result,
+            scenario=scenario,
+        )
 
     print("=== EXPLAIN PAYLOAD ===")
     print(payload)
 
-    # -------------------------------------------------
-    # 4. Call AI explainer (bounded, structured)
-    # -------------------------------------------------
-    ai_result = generate_ai_explanation(payload)
+    return payload
 
-    print("=== AI STRUCTURED RESULT ===")
-    print(ai_result)
 
+def _prepare_explain(request: ExplainRequest) -> Tuple[Dict[str, Any], str, Optional[Dict[str, Any]]]:
+    """
+    Payload, its cache key and any cached explanation. Blocking (run
+    store, simulation, disk cache), so it runs on the LLM pool.
+    """
+    payload = _explain_payload(request)
+    cache_key = canonical_key(payload, get_ollama_client().model)
+    return payload, cache_key, get_explanation_cache().get(cache_key)
+
+
+def _explanation_response(
+    payload: Dict[str, Any], ai_result: Optional[Dict[str, Any]]
+) -> ExplanationResponse:
     # -------------------------------------------------
     # 5. Map AI output → API response
     # -------------------------------------------------
@@ -109,3 +201,89 @@ def explain(request: ExplainRequest):
         identified_factors=[],
         mitigation_suggestions=[],
     )
+
+
+# -----------------------------
+# Explain Endpoint
+# -----------------------------
+
+@router.post("/explain", response_model=ExplanationResponse)
+async def explain(request: ExplainRequest):
+    pool = get_executor_pools()[LLM]
+    payload, cache_key, ai_result = await pool.run(_prepare_explain, request)
+
+    # -------------------------------------------------
+    # 4. Call AI explainer (bounded, structured),
+    #    unless this exact payload was already explained.
+    #    Concurrent identical payloads share one generation.
+    # -------------------------------------------------
+    async def generate():
+        ai_result = await generate_ai_explanation_async(payload)
+        if ai_result:
+            await pool.run(get_explanation_cache().put, cache_key, ai_result)
+        return ai_result
+
+    if ai_result is None:
+        ai_result = await get_explain_flight().do(cache_key, generate)
+
+    print("=== AI STRUCTURED RESULT ===")
+    print(ai_result)
+
+    return _explanation_response(payload, ai_result)
+
+
+# -----------------------------
+# Streaming Explain Endpoint (SSE)
+# -----------------------------
+
+@router.post("/explain/stream")
+async def explain_stream(request: ExplainRequest):
+    """
+    Same contract as /explain, streamed as Server-Sent Events:
+    - event "token": partial completion text as it is generated
+    - event "result": final ExplanationResponse, produced by the same
+      parsing / validation as /explain (fallback if validation fails)
+    Cached explanations skip straight to "result".
+    """
+
+    pool = get_executor_pools()[LLM]
+    payload, cache_key, ai_result = await pool.run(_prepare_explain, request)
+    client = get_ollama_client()
+
+    async def events():
+        nonlocal ai_result
+
+        if ai_result is None:
+            chunks = []
+            async for token in client.stream(build_full_prompt(payload)):
+                chunks.append(token)
+                yield format_sse({"text": token}, event="token")
+
+            ai_result = parse_ai_output("".join(chunks))
+            if ai_result:
+                await pool.run(get_explanation_cache().put, cache_key, ai_result)
+
+        response = _explanation_response(payload, ai_result)
+        yield format_sse(response.model_dump(), event="result")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+# -----------------------------
+# Cache / coalescing statistics
+# -----------------------------
+
+@router.get("/explain/cache")
+@offload(LLM)
+def explain_cache_stats():
+    # Takes the cache lock, which disk writes hold
+    return get_explanation_cache().stats()
+
+
+@router.get("/explain/singleflight")
+async def explain_singleflight_stats():
+    return get_explain_flight().stats()
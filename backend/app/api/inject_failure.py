@@ -1,67 +1,149 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional, Union
+
+from app.api.encoding import (
+    FastJSONResponse,
+    MetricsLayout,
+    negotiated_responses,
+    simulation_response,
+)
+from app.api.executors import SIMULATION, offload
+from app.api.topologies import resolve_topology, run_topology
 
 from app.core.simulation import run_baseline_simulation
-from app.core.failures import FailureScenario, FAILURE_APPLIERS
+from app.core.failures import (
+    FailureScenario,
+    FAILURE_APPLIERS,
+    TimedFault,
+    compose_failures,
+    composition_key,
+)
 from app.core.propagation import propagate_failures
+from app.core.rng import MAX_SEED, make_run_id
+from app.core.runstore import get_run_store
 
-from app.models.simulation_state import SimulationState
-from app.models.topology import SystemTopology, ServiceNode, DependencyEdge
-from app.models.metrics import MetricsBundle, MetricPoint
+from app.models.simulation_state import SimulationState, SimulationStateColumns
 
 router = APIRouter()
 
 
-class InjectFailureRequest(BaseModel):
+# Upper bound on faults composed into one run
+MAX_FAULTS = 16
+
+
+class FaultSpec(BaseModel):
+    """
+    One timed fault, in ticks of the metric window (see TimedFault).
+    """
     scenario: FailureScenario
+    start: int = Field(0, ge=0)
+    duration: Optional[int] = Field(None, ge=1)
+    ramp: int = Field(0, ge=0)
+
+
+class InjectFailureRequest(BaseModel):
+    # Exactly one of scenario / faults
+    scenario: Optional[FailureScenario] = None
+    faults: Optional[List[FaultSpec]] = Field(None, min_length=1, max_length=MAX_FAULTS)
+    seed: Optional[int] = Field(None, ge=0, lt=MAX_SEED)
+
+    # Inject into a stored run (GET /runs) instead of a fresh baseline
+    run_id: Optional[str] = None
+
+    # Registry topology (GET /topologies); default: the stored run's
+    # topology, else the latest "default"
+    topology: Optional[str] = None
+    topology_version: Optional[int] = None
 
+    @model_validator(mode="after")
+    def _scenario_or_faults(self) -> "InjectFailureRequest":
+        if (self.scenario is None) == (self.faults is None):
+            raise ValueError("Provide either scenario or faults")
+        return self
 
-@router.post("/inject-failure", response_model=SimulationState)
-def inject_failure(request: InjectFailureRequest):
-    #  Start from a clean baseline
-    result = run_baseline_simulation()
 
-    #  Apply the requested failure
-    applier = FAILURE_APPLIERS.get(request.scenario)
-    if applier is None:
+@router.post(
+    "/inject-failure",
+    response_model=Union[SimulationState, SimulationStateColumns],
+    response_class=FastJSONResponse,
+    responses=negotiated_responses(),
+)
+@offload(SIMULATION)
+def inject_failure(
+    request: InjectFailureRequest,
+    http_request: Request,
+    layout: MetricsLayout = "points",
+):
+    """
+    Injects failures into a baseline run (or a stored run, via run_id).
+    - scenario: one failure, applied to the current service state
+    - faults: several timed failures (start / duration / ramp in ticks),
+      applied across the metric window and propagated together
+    - topology / topology_version select the dependency graph
+    """
+    faults = [TimedFault(**fault.model_dump()) for fault in request.faults or []]
+    scenarios = [fault.scenario for fault in faults] or [request.scenario]
+    if any(s not in FAILURE_APPLIERS for s in scenarios):
         raise HTTPException(status_code=400, detail="Unknown failure scenario")
 
-    applier(result)
+    store = get_run_store()
 
-    #  Propagate failure effects
-    propagate_failures(result)
+    source = None
+    if request.run_id:
+        #  Start from a stored run (its metric series are mmap views)
+        source = store.get(request.run_id)
+        if source is None:
+            raise HTTPException(status_code=404, detail="Unknown run")
 
-    #  Build topology
-    topology = SystemTopology(
-        services=[
-            ServiceNode(
-                id=key,
-                name=svc.name,
-                status=svc.status.value,
+    if request.topology is None and request.topology_version is None and source is not None:
+        topology = run_topology(source.result.topology)
+    else:
+        topology = resolve_topology(request.topology, request.topology_version)
+
+    if faults:
+        scenario = "+".join(dict.fromkeys(s.value for s in scenarios))
+        run_key = composition_key(faults)
+
+        def inject(result):
+            compose_failures(result, faults, topology.graph_for(tuple(result.services)))
+    else:
+        scenario = run_key = request.scenario.value
+
+        def inject(result):
+            FAILURE_APPLIERS[request.scenario](result)
+            propagate_failures(result, topology.graph_for(tuple(result.services)))
+
+    if source is not None:
+        result = source.result
+        result.run_id = make_run_id(
+            "inject_failure", run_key, result.seed,
+            parent=request.run_id, topology=topology.run_key,
+        )
+        if result.timeline is not None:
+            result.timeline = result.timeline.copy()
+    else:
+        #  Seeded runs are reproducible: serve a stored one as is
+        if request.seed is not None:
+            stored = store.get(
+                make_run_id("inject_failure", run_key, request.seed, topology=topology.run_key)
             )
-            for key, svc in result.services.items()
-        ],
-        dependencies=[
-            DependencyEdge(source="api_gateway", target="orders_service"),
-            DependencyEdge(source="orders_service", target="database"),
-        ],
-    )
-
-    # Build metrics
-    metrics = MetricsBundle(
-        latency_ms=[MetricPoint(**m) for m in result.metrics["latency_ms"]],
-        error_rate_pct=[MetricPoint(**m) for m in result.metrics["error_rate_pct"]],
-    )
-
-    #  Compute overall system mode
-    system_mode = max(
-        (svc.status.value for svc in result.services.values()),
-        key=lambda s: ["healthy", "degraded", "unhealthy"].index(s),
-    )
-
-    #  Return typed response
-    return SimulationState(
-        system_mode=system_mode,
-        topology=topology,
-        metrics=metrics,
-    )
+            if stored is not None:
+                return simulation_response(http_request, stored.result, topology, layout)
+
+        #  Start from a clean baseline
+        result = run_baseline_simulation(seed=request.seed)
+        result.run_id = make_run_id("inject_failure", run_key, result.seed, topology=topology.run_key)
+
+    result.topology = topology.key
+
+    #  Apply the requested failure(s) and propagate their effects
+    try:
+        inject(result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    store.put(result, "inject_failure", scenario, parent_run_id=request.run_id)
+
+    #  Encode the negotiated response directly (see app.api.encoding)
+    return simulation_response(http_request, result, topology, layout)
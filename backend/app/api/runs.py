@@ -0,0 +1,121 @@
+# app/api/runs.py
+
+from typing import List, Optional, Union
+
+from fastapi import APIRouter, HTTPException, Query, Request
+
+from app.api.encoding import (
+    FastJSONResponse,
+    MetricsLayout,
+    negotiated_responses,
+    simulation_response,
+)
+from app.api.executors import BATCH, SIMULATION, offload
+from app.api.topologies import run_topology
+from app.core.blast_radius import analyze_run
+from app.core.runstore import get_run_store
+from app.models.runs import RunBlastRadius, RunMetricScan, RunSummary
+from app.models.simulation_state import SimulationState, SimulationStateColumns
+
+router = APIRouter()
+
+MAX_LIST = 1000
+MAX_SCAN = 100_000
+MAX_BLAST_LIST = 10_000
+
+
+# -----------------------------
+# Run Endpoints
+# -----------------------------
+
+@router.get("/runs", response_model=List[RunSummary])
+@offload(SIMULATION)
+def list_runs(
+    kind: Optional[str] = None,
+    scenario: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_LIST),
+):
+    """
+    Stored runs, newest first (metadata only).
+    """
+    return get_run_store().list(kind=kind, scenario=scenario, limit=limit)
+
+
+@router.get("/runs/scan", response_model=RunMetricScan, response_class=FastJSONResponse)
+@offload(BATCH)
+def scan_runs(
+    metric: str,
+    kind: Optional[str] = None,
+    scenario: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_SCAN),
+):
+    """
+    Per-run min / max / mean / last of one metric across stored runs.
+    Reads the mmap'd segments directly; nothing is recomputed or parsed.
+    """
+    runs = []
+    for run_id, series in get_run_store().scan(metric, kind=kind, scenario=scenario, limit=limit):
+        values = series.values
+        stats = {"run_id": run_id, "points": len(values)}
+        if len(values):
+            stats.update(
+                min=float(values.min()),
+                max=float(values.max()),
+                mean=float(values.mean()),
+                last=float(values[-1]),
+            )
+        runs.append(stats)
+
+    return FastJSONResponse({"metric": metric, "runs": runs})
+
+
+@router.get(
+    "/runs/{run_id}",
+    response_model=Union[SimulationState, SimulationStateColumns],
+    response_class=FastJSONResponse,
+    responses=negotiated_responses(),
+)
+@offload(SIMULATION)
+def get_run(run_id: str, request: Request, layout: MetricsLayout = "points"):
+    """
+    A stored /simulate or /inject-failure run, as it was returned then.
+    """
+    stored = get_run_store().get(run_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Unknown run")
+
+    return simulation_response(
+        request, stored.result, run_topology(stored.result.topology), layout
+    )
+
+
+@router.get(
+    "/runs/{run_id}/blast-radius",
+    response_model=RunBlastRadius,
+    response_class=FastJSONResponse,
+)
+@offload(SIMULATION)
+def get_run_blast_radius(
+    run_id: str,
+    limit: Optional[int] = Query(100, ge=1, le=MAX_BLAST_LIST),
+):
+    """
+    Root causes and their propagation paths, the worst-latency critical
+    path, and the blast radius of every failing service in a stored run,
+    over the topology it ran on. Reachability is memoized per compiled
+    graph, so repeat queries on large topologies skip the graph walk.
+    Service lists are cut to `limit` entries.
+    """
+    stored = get_run_store().get(run_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Unknown run")
+
+    result = stored.result
+    topology = run_topology(result.topology)
+    report = analyze_run(result, topology.graph_for(tuple(result.services)))
+
+    return FastJSONResponse({
+        "run_id": run_id,
+        "topology": {"id": topology.id, "version": topology.version},
+        **report.to_content(limit),
+    })
@@ -5,7 +5,7 @@ router = APIRouter()
 
 
 @router.get("/scenarios")
-def list_scenarios():
+async def list_scenarios():
     return {
         "scenarios": [scenario.value for scenario in FailureScenario]
     }
@@ -0,0 +1,205 @@
+# app/api/sessions.py
+
+from typing import Literal, Optional, Union
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
+
+from app.api.encoding import (
+    FastJSONResponse,
+    MetricsLayout,
+    metrics_content,
+    negotiated_response,
+    negotiated_responses,
+    service_nodes,
+    simulation_state_content,
+    system_mode,
+)
+from app.api.executors import SIMULATION, offload
+from app.core.rng import MAX_SEED
+from app.core.ringbuffer import ROLLUP_AGGREGATES, ROLLUP_RESOLUTIONS
+from app.core.session import (
+    MAX_TICKS_PER_CALL,
+    SimulationSession,
+    get_session_store,
+)
+from app.core.simulation import WINDOW_TICKS
+from app.core.topology import get_topology_registry
+from app.models.session import (
+    MetricHistoryResponse,
+    SessionDelta,
+    SessionDeltaColumns,
+    SessionState,
+    SessionStateColumns,
+)
+
+router = APIRouter()
+
+
+# -----------------------------
+# Request Model
+# -----------------------------
+
+class CreateSessionRequest(BaseModel):
+    scenario: Optional[str] = None
+    seed: Optional[int] = Field(None, ge=0, lt=MAX_SEED)
+    window: int = Field(WINDOW_TICKS, ge=1, le=MAX_TICKS_PER_CALL)
+
+
+# -----------------------------
+# Response Helpers
+# -----------------------------
+
+def _get_session(session_id: str) -> SimulationSession:
+    session = get_session_store().get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return session
+
+
+def _state_response(
+    request: Request, session: SimulationSession, layout: MetricsLayout, status_code: int = 200
+) -> Response:
+    snapshot = session.snapshot()
+    return negotiated_response(
+        request,
+        lambda layout: {
+            **simulation_state_content(snapshot, get_topology_registry().default, layout),
+            "session_id": session.id,
+            "tick": session.tick,
+            "window": session.window,
+        },
+        layout,
+        status_code=status_code,
+    )
+
+
+# -----------------------------
+# Session Endpoints
+# -----------------------------
+
+@router.post(
+    "/sessions",
+    status_code=201,
+    response_model=Union[SessionState, SessionStateColumns],
+    response_class=FastJSONResponse,
+    responses=negotiated_responses(201),
+)
+@offload(SIMULATION)
+def create_session(req: CreateSessionRequest, request: Request, layout: MetricsLayout = "points"):
+    """
+    Starts a stateful simulation run and returns its full initial state
+    (the first `window` ticks). Poll /sessions/{id}/tick for deltas.
+    """
+    session = get_session_store().create(req.scenario, seed=req.seed, window=req.window)
+    return _state_response(request, session, layout, status_code=201)
+
+
+@router.get(
+    "/sessions/{session_id}",
+    response_model=Union[SessionState, SessionStateColumns],
+    response_class=FastJSONResponse,
+    responses=negotiated_responses(),
+)
+@offload(SIMULATION)
+def get_session(session_id: str, request: Request, layout: MetricsLayout = "points"):
+    """
+    Full current state, e.g. to resynchronize a client.
+    """
+    session = _get_session(session_id)
+    # Rendered under the lock: the window is a view into the rings
+    with session.lock:
+        return _state_response(request, session, layout)
+
+
+@router.post(
+    "/sessions/{session_id}/tick",
+    response_model=Union[SessionDelta, SessionDeltaColumns],
+    response_class=FastJSONResponse,
+    responses=negotiated_responses(),
+)
+@offload(SIMULATION)
+def tick_session(
+    session_id: str,
+    request: Request,
+    ticks: int = Query(1, ge=1, le=MAX_TICKS_PER_CALL),
+    layout: MetricsLayout = "points",
+):
+    """
+    Advances the session by `ticks` and returns only what changed:
+    new metric points and services whose reported state changed.
+    """
+    session = _get_session(session_id)
+
+    with session.lock:
+        delta = session.advance(ticks)
+
+    return negotiated_response(
+        request,
+        lambda layout: {
+            "session_id": session.id,
+            "run_id": delta.system.run_id,
+            "tick": delta.tick,
+            "window_start": delta.window_start,
+            "system_mode": system_mode(delta.system),
+            "services": service_nodes(delta.services),
+            "metrics": metrics_content(delta.appended, layout),
+        },
+        layout,
+    )
+
+
+@router.get("/sessions/{session_id}/history", response_model=MetricHistoryResponse)
+@offload(SIMULATION)
+def session_history(
+    session_id: str,
+    metric: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    resolution: Optional[int] = None,
+    max_points: Optional[int] = Query(None, ge=1),
+    how: Literal[ROLLUP_AGGREGATES] = "avg",
+):
+    """
+    Metric history over [start, end) (default: everything retained).
+    - resolution picks a rollup (1 / 10 / 60 ticks) explicitly
+    - otherwise the finest retained resolution that covers start and
+      fits max_points is used, so long ranges come from the rollups
+      instead of raw points
+    """
+    if resolution is not None and resolution not in ROLLUP_RESOLUTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"resolution must be one of {list(ROLLUP_RESOLUTIONS)}",
+        )
+
+    session = _get_session(session_id)
+    history = session.history.get(metric)
+    if history is None:
+        raise HTTPException(status_code=404, detail=f"Unknown metric: {metric}")
+
+    with session.lock:
+        end = session.tick if end is None else end
+        if resolution is None:
+            resolution, series = history.range(start, end, max_points=max_points, how=how)
+        else:
+            series = history.rollup(resolution, how).between(start, end)
+
+        # Rendered under the lock: the series are views into the rings
+        return FastJSONResponse({
+            "session_id": session.id,
+            "metric": metric,
+            "start": start,
+            "end": end,
+            "resolution": resolution,
+            "how": how,
+            "time": series.time,
+            "values": series.values,
+        })
+
+
+@router.delete("/sessions/{session_id}", status_code=204)
+async def delete_session(session_id: str):
+    if not get_session_store().delete(session_id):
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return Response(status_code=204)
@@ -1,13 +1,29 @@
 # app/api/simulate.py
 
-from fastapi import APIRouter
-from pydantic import BaseModel
-from typing import Optional
-
+import asyncio
+import time
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, Union
+
+from app.api.encoding import (
+    FastJSONResponse,
+    MetricsLayout,
+    negotiated_responses,
+    service_nodes,
+    simulation_response,
+    system_mode,
+)
+from app.api.executors import SIMULATION, get_executor_pools, offload
+from app.api.sse import SSE_HEADERS, format_sse
+from app.api.topologies import resolve_topology
+from app.core.rng import MAX_SEED
+from app.core.runstore import get_run_store
 from app.core.simulation import run_simulation
-from app.models.simulation_state import SimulationState
-from app.models.topology import SystemTopology, ServiceNode, DependencyEdge
-from app.models.metrics import MetricsBundle, MetricPoint
+from app.core.ticker import SimulationTicker
+from app.models.simulation_state import SimulationState, SimulationStateColumns
 
 router = APIRouter()
 
@@ -18,74 +34,106 @@ router = APIRouter()
 
 class SimulateRequest(BaseModel):
     scenario: Optional[str] = None
+    seed: Optional[int] = Field(None, ge=0, lt=MAX_SEED)
+
+    # Registry topology (GET /topologies); default: latest "default"
+    topology: Optional[str] = None
+    topology_version: Optional[int] = None
 
 
 # -----------------------------
 # Simulation Endpoint
 # -----------------------------
 
-@router.post("/simulate", response_model=SimulationState)
-def simulate(req: SimulateRequest):
+@router.post(
+    "/simulate",
+    response_model=Union[SimulationState, SimulationStateColumns],
+    response_class=FastJSONResponse,
+    responses=negotiated_responses(),
+)
+@offload(SIMULATION)
+def simulate(req: SimulateRequest, request: Request, layout: MetricsLayout = "points"):
     """
     Runs a system simulation.
     - If scenario is None → baseline behavior
     - If scenario is provided → scenario-aware degradation
+    - If seed is provided → the run is reproduced exactly
+    - topology / topology_version select the dependency graph
+    - The run is stored; GET /runs/{run_id} returns it again
+    - layout=columns returns each metric as parallel time / values arrays
+    - Accept: application/x-msgpack returns a binary frame; JSON is
+      gzip / br compressed per Accept-Encoding
     """
 
+    topology = resolve_topology(req.topology, req.topology_version)
+
     # Run simulation (baseline or scenario-aware)
-    result = run_simulation(req.scenario)
-
-    # -----------------------------
-    # Build topology response
-    # -----------------------------
-
-    topology = SystemTopology(
-        services=[
-            ServiceNode(
-                id=key,
-                name=svc.name,
-                status=svc.status.value,
-                latency_ms=round(svc.latency_ms, 1),
-                error_rate_pct=round(svc.error_rate_pct, 2),
-            )
-            for key, svc in result.services.items()
-        ],
-        dependencies=[
-            DependencyEdge(source="api_gateway", target="orders_service"),
-            DependencyEdge(source="orders_service", target="database"),
-        ],
-    )
+    result = run_simulation(req.scenario, seed=req.seed, topology=topology)
+    get_run_store().put(result, "simulate", req.scenario)
 
-    # -----------------------------
-    # Build metrics response
-    # -----------------------------
-
-    metrics = MetricsBundle(
-        latency_ms=[
-            MetricPoint(**m) for m in result.metrics["latency_ms"]
-        ],
-        error_rate_pct=[
-            MetricPoint(**m) for m in result.metrics["error_rate_pct"]
-        ],
-        request_volume=[
-            MetricPoint(**m) for m in result.metrics["request_volume"]
-        ],
-        queue_depth=[
-            MetricPoint(**m) for m in result.metrics["queue_depth"]
-        ],
-    )
+    # Encoded straight to bytes; no per-point models
+    return simulation_response(request, result, topology, layout)
 
-    # -----------------------------
-    # Derive system mode
-    # -----------------------------
 
-    system_mode = max(
-        (svc.status.value for svc in result.services.values()),
-        key=lambda s: ["healthy", "degraded", "unhealthy"].index(s),
-    )
+# -----------------------------
+# Streaming Endpoint (SSE)
+# -----------------------------
+
+@router.get("/simulate/stream")
+async def simulate_stream(
+    request: Request,
+    scenario: Optional[str] = None,
+    tick_ms: int = Query(1000, ge=50, le=60_000),
+    ticks: Optional[int] = Query(None, ge=1),
+    seed: Optional[int] = Query(None, ge=0, lt=MAX_SEED),
+):
+    """
+    Streams one simulation run tick by tick as Server-Sent Events.
+    - The first frame is sent immediately, then one every tick_ms
+    - ticks limits the stream length (default: until the client leaves)
+    - seed replays the same tick sequence
+    - Frames are produced on demand, so a slow reader slows the stream
+      down instead of queueing frames; missed ticks are not replayed
+    """
+
+    ticker = SimulationTicker(scenario, seed=seed)
+    interval = tick_ms / 1000
+    pool = get_executor_pools()[SIMULATION]
+
+    async def frames():
+        deadline = time.monotonic()
+
+        while ticks is None or ticker.tick < ticks:
+            if await request.is_disconnected():
+                break
+
+            tick = ticker.tick
+            result = await pool.run(ticker.advance)
+
+            yield format_sse(
+                {
+                    "tick": tick,
+                    "run_id": result.run_id,
+                    "seed": result.seed,
+                    "system_mode": system_mode(result),
+                    "services": service_nodes(result.services),
+                    "metrics": {
+                        name: series[0] for name, series in result.metrics.items()
+                    },
+                },
+                event="tick",
+                id=str(tick),
+            )
+
+            if ticks is not None and ticker.tick >= ticks:
+                break
+
+            # Fixed-rate schedule without catch-up bursts after a stall
+            deadline = max(deadline + interval, time.monotonic())
+            await asyncio.sleep(deadline - time.monotonic())
 
-    return SimulationState(
-        system_mode=system_mode,
-        topology=topology,
-        metrics=metrics,
+    return StreamingResponse(
+        frames(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
     )
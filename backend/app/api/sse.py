@@ -0,0 +1,23 @@
+# app/api/sse.py
+
+import json
+from typing import Any, Optional
+
+# Disable proxy buffering / caching so frames reach the client immediately
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(data: Any, event: Optional[str] = None, id: Optional[str] = None) -> str:
+    """
+    Encode one Server-Sent Events frame with a compact JSON data line.
+    """
+    lines = []
+    if event:
+        lines.append(f"event: {event}")
+    if id is not None:
+        lines.append(f"id: {id}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":")))
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,120 @@
+# app/api/sweep.py
+
+import os
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from app.api.executors import BATCH, get_executor_pools
+from app.api.sse import SSE_HEADERS, format_sse
+from app.core.failures import FailureScenario
+from app.core.rng import MAX_SEED
+from app.core.sweep import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_RUNS_PER_CELL,
+    SWEEP_WORKERS,
+    discard_sweep_pool,
+    get_sweep_pool,
+    run_sweep,
+)
+
+router = APIRouter()
+
+# Upper bound on runs in one sweep request (cells x runs_per_cell)
+MAX_SWEEP_RUNS = int(os.getenv("MAX_SWEEP_RUNS", "10000000"))
+
+
+# -----------------------------
+# Request Model
+# -----------------------------
+
+class SweepRequest(BaseModel):
+    scenarios: Optional[List[FailureScenario]] = None
+    severities: Optional[List[str]] = None
+    threshold_sets: Optional[List[str]] = None
+    runs_per_cell: int = Field(DEFAULT_RUNS_PER_CELL, ge=1, le=10_000_000)
+    chunk_size: int = Field(DEFAULT_CHUNK_SIZE, ge=100, le=1_000_000)
+    workers: Optional[int] = Field(None, ge=1, le=256)
+    seed: Optional[int] = Field(None, ge=0, lt=MAX_SEED)
+
+
+def _run_sweep(req: SweepRequest, progress=None) -> dict:
+    """
+    Sweep on the shared process pool. workers caps this request's chunks
+    in flight and is clamped to the pool size.
+    """
+    kwargs = req.model_dump()
+    if req.scenarios:
+        kwargs["scenarios"] = [s.value for s in req.scenarios]
+    kwargs["workers"] = min(req.workers or SWEEP_WORKERS, SWEEP_WORKERS)
+
+    pool = get_sweep_pool()
+    try:
+        return run_sweep(pool=pool, max_runs=MAX_SWEEP_RUNS, progress=progress, **kwargs)
+    except BrokenProcessPool:
+        discard_sweep_pool(pool)
+        raise
+
+
+# -----------------------------
+# Sweep Endpoints
+# -----------------------------
+
+@router.post("/sweep")
+async def sweep(req: SweepRequest):
+    """
+    Runs the scenario × severity × threshold grid on a process pool and
+    returns the aggregated outcome matrices.
+    """
+    try:
+        return await get_executor_pools()[BATCH].run(_run_sweep, req)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/sweep/stream")
+async def sweep_stream(req: SweepRequest):
+    """
+    Same as /sweep, streamed as Server-Sent Events:
+    - event "progress": {"done": chunks finished, "total": chunks}
+    - event "result": the aggregated matrices
+    - event "error": invalid grid parameters, or the sweep failed
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def progress(done: int, total: int) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, ("progress", {"done": done, "total": total}))
+
+    async def run() -> None:
+        try:
+            result = await get_executor_pools()[BATCH].run(_run_sweep, req, progress)
+            await queue.put(("result", result))
+        except ValueError as e:
+            await queue.put(("error", {"detail": str(e)}))
+        except Exception as e:
+            # Anything else (dead worker, pickling, memory) still ends
+            # the stream instead of leaving the client waiting
+            print("SWEEP ERROR:", repr(e))
+            await queue.put(("error", {"detail": f"Sweep failed: {type(e).__name__}"}))
+
+    async def events():
+        task = asyncio.ensure_future(run())
+        try:
+            while True:
+                event, data = await queue.get()
+                yield format_sse(data, event=event)
+                if event != "progress":
+                    break
+        finally:
+            await task
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
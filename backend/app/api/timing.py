@@ -0,0 +1,37 @@
+# app/api/timing.py
+
+import time
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a `Server-Timing: app;dur=<ms>` header to every HTTP response.
+
+    dur covers the time spent inside the application (routing, handler,
+    serialization) up to the first response byte, so a load generator
+    can split client-observed latency into app time and everything else
+    (accept queue, parsing, transport).
+
+    Plain ASGI rather than BaseHTTPMiddleware to keep per-request
+    overhead negligible.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                duration_ms = (time.perf_counter() - start) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", f"app;dur={duration_ms:.3f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
@@ -0,0 +1,101 @@
+# app/api/topologies.py
+
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.api.executors import SIMULATION, offload
+from app.core.topology import DEFAULT_TOPOLOGY, Topology, get_topology_registry
+from app.models.topology import TopologySpec, TopologySummary
+
+router = APIRouter()
+
+
+# -----------------------------
+# Shared Helpers
+# -----------------------------
+
+def resolve_topology(topology_id: Optional[str], version: Optional[int] = None) -> Topology:
+    """
+    Topology referenced by a request (default: the default topology's
+    latest version); 404 when unknown.
+    """
+    topology = get_topology_registry().get(topology_id or DEFAULT_TOPOLOGY, version)
+    if topology is None:
+        label = topology_id if version is None else f"{topology_id}@{version}"
+        raise HTTPException(status_code=404, detail=f"Unknown topology: {label}")
+    return topology
+
+
+def run_topology(key: Optional[str]) -> Topology:
+    """
+    Topology a stored run was computed with.
+    """
+    topology = get_topology_registry().resolve(key)
+    if topology is None:
+        raise HTTPException(status_code=409, detail=f"Topology {key} is no longer registered")
+    return topology
+
+
+def _document_response(
+    request: Optional[Request], topology: Topology, status_code: int = 200, immutable: bool = False
+) -> Response:
+    # A version's pre-encoded document never changes, so its key doubles
+    # as a strong validator. Only /versions/{version} URLs are immutable;
+    # the latest-version URL must be revalidated (304 while unchanged)
+    etag = f'"{topology.key}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "public, max-age=31536000, immutable" if immutable else "no-cache",
+    }
+    if request is not None and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        topology.document, status_code=status_code, media_type="application/json", headers=headers
+    )
+
+
+# -----------------------------
+# Topology Endpoints
+# -----------------------------
+
+@router.get("/topologies", response_model=List[TopologySummary])
+async def list_topologies():
+    """
+    Registered topologies, latest version of each.
+    """
+    return get_topology_registry().list()
+
+
+@router.get("/topologies/{topology_id}")
+async def get_topology(topology_id: str, request: Request):
+    """
+    Latest version of a topology, as registered (pre-encoded JSON).
+    """
+    return _document_response(request, resolve_topology(topology_id))
+
+
+@router.get("/topologies/{topology_id}/versions/{version}")
+async def get_topology_version(topology_id: str, version: int, request: Request):
+    return _document_response(request, resolve_topology(topology_id, version), immutable=True)
+
+
+@router.post("/topologies/{topology_id}", status_code=201)
+@offload(SIMULATION)
+def upload_topology(topology_id: str, spec: TopologySpec):
+    """
+    Register the next version of a topology (201). Re-uploading the
+    latest version's spec returns it unchanged (200).
+    - services must be simulated services (see SERVICE_PROFILES)
+    - dependencies must form a DAG over them
+    """
+    try:
+        topology, created = get_topology_registry().register(
+            topology_id, spec.model_dump(exclude_none=True)
+        )
+    except OverflowError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return _document_response(None, topology, 201 if created else 200)
@@ -0,0 +1,312 @@
+# app/core/batch.py
+from typing import Dict, List, Optional, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.core.rules import (
+    STATUS_BY_CODE,
+    DEFAULT_THRESHOLDS,
+    ThresholdSpec,
+    classify_health,
+)
+from .propagation import default_graph
+from .queueing import queueing_delay
+from .rng import RunRandom
+from .series import MetricSeries
+from .simulation import (
+    SimulationResult,
+    ServiceState,
+    WINDOW_TICKS,
+    SEVERITY_TIERS,
+    SEVERITY_WEIGHTS,
+    SERVICE_PROFILES,
+    SERVICE_CAPACITY,
+    METRIC_RANGES,
+    SCENARIO_PROFILES,
+    normalize_scenario,
+)
+
+
+# Severity code for runs without a scenario
+NO_SEVERITY = -1
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+# -----------------------------
+# Columnar Result
+# -----------------------------
+
+@dataclass
+class SimulationBatch:
+    """
+    N independent runs of one scenario, stored column-wise.
+
+    Row i of every array belongs to the same run; row(i) materializes it
+    as a regular SimulationResult.
+    """
+    scenario: Optional[str]
+    seed: int
+    service_keys: List[str]
+    severity: np.ndarray            # (n,) int8, index into SEVERITY_TIERS
+    latency_ms: np.ndarray          # (n, services)
+    error_rate_pct: np.ndarray      # (n, services) FRACTIONS (0–1)
+    status: np.ndarray              # (n, services) int8, index into STATUS_BY_CODE
+    metrics: Dict[str, np.ndarray]  # metric -> (n, WINDOW_TICKS)
+
+    def __len__(self) -> int:
+        return len(self.severity)
+
+    def row(self, i: int) -> SimulationResult:
+        services = {
+            key: ServiceState(
+                name=SERVICE_PROFILES[key].name,
+                latency_ms=float(self.latency_ms[i, j]),
+                error_rate_pct=float(self.error_rate_pct[i, j]),
+                status=STATUS_BY_CODE[self.status[i, j]],
+            )
+            for j, key in enumerate(self.service_keys)
+        }
+
+        # Series share the batch buffers (row views, no copy)
+        metrics = {
+            metric: MetricSeries.from_values(values[i])
+            for metric, values in self.metrics.items()
+        }
+
+        code = self.severity[i]
+        return SimulationResult(
+            services=services,
+            metrics=metrics,
+            severity=SEVERITY_TIERS[code] if code != NO_SEVERITY else None,
+        )
+
+    def system_mode(self) -> np.ndarray:
+        """
+        Worst service status per run, as status codes.
+        """
+        return self.status.max(axis=1)
+
+    def severity_distribution(self) -> Dict[str, float]:
+        counts = np.bincount(
+            self.severity[self.severity >= 0], minlength=len(SEVERITY_TIERS)
+        )
+        return {
+            tier: float(count) / len(self)
+            for tier, count in zip(SEVERITY_TIERS, counts)
+        }
+
+    def status_distribution(self) -> Dict[str, Dict[str, float]]:
+        """
+        Fraction of runs in each health status, per service and overall.
+        """
+        distribution = {}
+        columns = list(self.service_keys) + ["system"]
+        codes = np.column_stack([self.status, self.system_mode()])
+
+        for j, key in enumerate(columns):
+            counts = np.bincount(codes[:, j], minlength=len(STATUS_BY_CODE))
+            distribution[key] = {
+                status.value: float(count) / len(self)
+                for status, count in zip(STATUS_BY_CODE, counts)
+            }
+
+        return distribution
+
+    def outcome_bands(
+        self, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Per-service latency / error percentiles across all runs.
+        """
+        latency = np.percentile(self.latency_ms, percentiles, axis=0)
+        errors = np.percentile(self.error_rate_pct, percentiles, axis=0)
+
+        return {
+            key: {
+                "latency_ms": {
+                    f"p{q:g}": float(latency[k, j])
+                    for k, q in enumerate(percentiles)
+                },
+                "error_rate_pct": {
+                    f"p{q:g}": float(errors[k, j])
+                    for k, q in enumerate(percentiles)
+                },
+            }
+            for j, key in enumerate(self.service_keys)
+        }
+
+    def metric_bands(
+        self, metric: str, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> Dict[str, np.ndarray]:
+        """
+        Per-tick percentile band of a metric series across all runs.
+        """
+        bands = np.percentile(self.metrics[metric], percentiles, axis=0)
+        return {f"p{q:g}": bands[k] for k, q in enumerate(percentiles)}
+
+
+# -----------------------------
+# Batch Simulation
+# -----------------------------
+
+def _apply_queueing(
+    latency: np.ndarray, metrics: Dict[str, np.ndarray], include_metrics: bool
+) -> None:
+    """
+    Batch form of apply_queueing: every run's window at once.
+    Drops request_volume again when metrics were not requested.
+    """
+    capacity, service_ms, share = SERVICE_CAPACITY
+    wait_ms, queue = queueing_delay(
+        metrics["request_volume"], capacity, service_ms, share, last_only=not include_metrics
+    )
+    latency += wait_ms[:, -1]
+
+    if not include_metrics:
+        del metrics["request_volume"]
+        return
+    if "latency_ms" in metrics:
+        metrics["latency_ms"] += wait_ms @ share
+    if "queue_depth" in metrics:
+        metrics["queue_depth"] += np.trunc(queue.sum(axis=2))
+
+
+def run_simulation_batch(
+    scenario: Optional[str],
+    n: int,
+    seed: Optional[int] = None,
+    include_metrics: bool = True,
+    severity: Optional[str] = None,
+    thresholds: ThresholdSpec = DEFAULT_THRESHOLDS,
+) -> SimulationBatch:
+    """
+    Vectorized Monte Carlo version of run_simulation.
+
+    Produces n independent runs of one scenario in a single call. Every
+    row follows the same steps as run_simulation (baseline, severity
+    tier, degradation, queueing delay, health pass 1, propagation, clamp,
+    health pass 2).
+
+    Metric series cost n * WINDOW_TICKS values per metric; pass
+    include_metrics=False when only service outcomes are needed
+    (request_volume is still drawn, as it drives the queueing delay).
+
+    severity pins every run to one tier instead of drawing it, and
+    thresholds replaces the default health thresholds (both passes),
+    either shared or one per service (see rules.service_thresholds).
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+    if severity is not None and severity not in SEVERITY_TIERS:
+        raise ValueError(f"Unknown severity tier: {severity}")
+
+    rng = RunRandom(seed)
+    service_keys = list(SERVICE_PROFILES)
+
+    # -----------------------------
+    # Baseline
+    # -----------------------------
+    lat_base, lat_var = np.array(
+        [SERVICE_PROFILES[k].latency for k in service_keys], dtype=float
+    ).T
+    err_base, err_var = np.array(
+        [SERVICE_PROFILES[k].error_rate for k in service_keys], dtype=float
+    ).T
+
+    shape = (n, len(service_keys))
+    latency = np.maximum(
+        0.0, rng.stream("batch", "latency").uniform(lat_base - lat_var, lat_base + lat_var, shape)
+    )
+    errors = np.maximum(
+        0.0, rng.stream("batch", "errors").uniform(err_base - err_var, err_base + err_var, shape)
+    )
+
+    # request_volume drives the capacity model, so it is always drawn
+    metrics: Dict[str, np.ndarray] = {}
+    for metric, (low, high, integral) in METRIC_RANGES.items():
+        if include_metrics or metric == "request_volume":
+            gen = rng.stream("batch", "metric", metric)
+            if integral:
+                values = gen.integers(low, high, size=(n, WINDOW_TICKS), endpoint=True)
+                metrics[metric] = values.astype(float)
+            else:
+                metrics[metric] = np.maximum(0.0, gen.uniform(low, high, (n, WINDOW_TICKS)))
+
+    scenario_norm = normalize_scenario(scenario)
+    if not scenario_norm:
+        _apply_queueing(latency, metrics, include_metrics)
+        return SimulationBatch(
+            scenario=None,
+            seed=rng.seed,
+            service_keys=service_keys,
+            severity=np.full(n, NO_SEVERITY, dtype=np.int8),
+            latency_ms=latency,
+            error_rate_pct=errors,
+            status=classify_health(latency, errors, thresholds),
+            metrics=metrics,
+        )
+
+    if severity is None:
+        codes = rng.stream("batch", "severity").choice(
+            len(SEVERITY_TIERS), size=n, p=SEVERITY_WEIGHTS
+        ).astype(np.int8)
+    else:
+        codes = np.full(n, SEVERITY_TIERS.index(severity), dtype=np.int8)
+
+    # -----------------------------
+    # Scenario Degradation
+    # -----------------------------
+    profile = SCENARIO_PROFILES.get(scenario_norm)
+    if profile is not None:
+        j = service_keys.index(profile.target)
+        gen = rng.stream("batch", "scenario")
+
+        low, high = profile.latency_bounds[codes].T
+        latency[:, j] = gen.uniform(low, high)
+
+        low, high = profile.error_bounds[codes].T
+        errors[:, j] = gen.uniform(low, high)
+
+        for metric, (low, high) in profile.metric_multipliers.items():
+            if metric not in metrics:
+                continue
+            values = metrics[metric]
+            values *= rng.stream("batch", "multiplier", metric).uniform(low, high, values.shape)
+            if METRIC_RANGES[metric][2]:
+                np.trunc(values, out=values)
+
+    # Load (after any retry amplification) -> queueing delay
+    _apply_queueing(latency, metrics, include_metrics)
+
+    # -----------------------------
+    # Health Evaluation — PASS 1
+    # -----------------------------
+    status = classify_health(latency, errors, thresholds)
+
+    # -----------------------------
+    # Dependency Propagation
+    # -----------------------------
+    default_graph(tuple(service_keys)).propagate(latency, errors, status)
+
+    # -----------------------------
+    # Clamp error rate (fraction)
+    # -----------------------------
+    np.clip(errors, 0.0, 0.15, out=errors)  # cap at 15%
+
+    # -----------------------------
+    # Health Evaluation — PASS 2
+    # -----------------------------
+    status = classify_health(latency, errors, thresholds)
+
+    return SimulationBatch(
+        scenario=scenario_norm,
+        seed=rng.seed,
+        service_keys=service_keys,
+        severity=codes,
+        latency_ms=latency,
+        error_rate_pct=errors,
+        status=status,
+        metrics=metrics,
+    )
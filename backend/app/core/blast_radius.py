@@ -0,0 +1,320 @@
+# app/core/blast_radius.py
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .propagation import PropagationGraph
+from .rules import STATUS_BY_CODE
+from .simulation import SimulationResult
+
+# Graphs whose index (CSR adjacency + reachability bitsets) is kept
+GRAPH_INDEX_CACHE = 16
+
+_CODES = {status: code for code, status in enumerate(STATUS_BY_CODE)}
+
+
+# -----------------------------
+# Graph Index (memoized)
+# -----------------------------
+
+def _csr(n: int, rows: np.ndarray, columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compressed adjacency: neighbours of i are indices[ptr[i]:ptr[i + 1]].
+    """
+    order = np.argsort(rows, kind="stable")
+    ptr = np.zeros(n + 1, dtype=np.intp)
+    np.cumsum(np.bincount(rows, minlength=n), out=ptr[1:])
+    return ptr, columns[order]
+
+
+def _gather(ptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Neighbours of every node in `nodes`, concatenated, plus the position
+    in `nodes` of the node each neighbour belongs to.
+    """
+    counts = ptr[nodes + 1] - ptr[nodes]
+    owners = np.repeat(np.arange(len(nodes)), counts)
+    starts = np.repeat(ptr[nodes] - np.cumsum(counts) + counts, counts)
+    return indices[starts + np.arange(counts.sum())], owners
+
+
+class GraphIndex:
+    """
+    Per-graph structures for path queries, built once per compiled graph
+    (see graph_index):
+
+    - dependents / dependencies: CSR adjacency (who depends on i / what i
+      depends on)
+    - levels: node indices grouped by dependency depth, leaves first
+    - closure: upstream reachability as packed bitsets, one row of
+      ceil(n / 64) uint64 words per node; bit j of row i is set when j
+      depends on i, directly or transitively (i itself included).
+      Built lazily, in one pass per level from the top of the DAG down:
+      a node's row is the OR of its dependents' rows, so the whole table
+      costs O(edges * n / 64) word operations.
+    """
+
+    def __init__(self, graph: PropagationGraph):
+        self.graph = graph
+        n = self.n = len(graph.nodes)
+        self.words = (n + 63) // 64
+
+        self.dependents_ptr, self.dependents = _csr(n, graph.targets, graph.sources)
+        self.dependencies_ptr, self.dependencies = _csr(n, graph.sources, graph.targets)
+        self.levels = [
+            np.flatnonzero(graph.level == level) for level in range(int(graph.level.max(initial=0)) + 1)
+        ]
+        self.entry = np.diff(self.dependents_ptr) == 0   # nothing depends on it
+        self._closure: Optional[np.ndarray] = None
+
+    @property
+    def closure(self) -> np.ndarray:
+        if self._closure is None:
+            closure = np.zeros((self.n, self.words), dtype=np.uint64)
+            nodes = np.arange(self.n)
+            closure[nodes, nodes // 64] = np.left_shift(np.uint64(1), (nodes % 64).astype(np.uint64))
+
+            for level in reversed(self.levels):
+                has_dependents = level[~self.entry[level]]
+                if not len(has_dependents):
+                    continue
+                dependents, owners = _gather(self.dependents_ptr, self.dependents, has_dependents)
+                starts = np.searchsorted(owners, np.arange(len(has_dependents)))
+                closure[has_dependents] |= np.bitwise_or.reduceat(closure[dependents], starts, axis=0)
+
+            self._closure = closure
+        return self._closure
+
+    def upstream(self, node: int) -> np.ndarray:
+        """
+        Indices of every service that depends on `node`, transitively
+        (its potential blast radius), in index order.
+        """
+        bits = np.unpackbits(self.closure[node].view(np.uint8), bitorder="little")[: self.n]
+        bits[node] = 0
+        return np.flatnonzero(bits)
+
+    def upstream_mask(self, nodes: np.ndarray) -> np.ndarray:
+        """
+        (len(nodes), n) bool: row k flags the blast radius of nodes[k].
+        """
+        nodes = np.asarray(nodes, dtype=np.intp)
+        bits = np.unpackbits(self.closure[nodes].view(np.uint8), axis=1, bitorder="little")
+        bits = bits[:, : self.n].view(bool)
+        bits[np.arange(len(nodes)), nodes] = False
+        return bits
+
+    def upstream_count(self, nodes: np.ndarray) -> np.ndarray:
+        """
+        Blast radius size of each node, without listing it.
+        """
+        rows = self.closure[nodes].view(np.uint8)
+        return np.unpackbits(rows, axis=1).sum(axis=1) - 1
+
+
+@lru_cache(maxsize=GRAPH_INDEX_CACHE)
+def graph_index(graph: PropagationGraph) -> GraphIndex:
+    """
+    Memoized GraphIndex. Compiled graphs are shared and immutable
+    (default_graph, Topology.graph_for), so one index serves every run.
+    """
+    return GraphIndex(graph)
+
+
+# -----------------------------
+# Run Queries
+# -----------------------------
+
+def critical_path(index: GraphIndex, latency_ms: np.ndarray) -> Tuple[List[int], float]:
+    """
+    Worst-latency chain from an entry service (nothing depends on it)
+    down to a leaf: the path maximizing the sum of service latencies.
+
+    Longest-path DP over levels, leaves first: best[v] = latency[v] +
+    max(best[dependencies of v]). O(nodes + edges).
+    """
+    n = index.n
+    if n == 0:
+        return [], 0.0
+
+    best = np.asarray(latency_ms, dtype=float).copy()
+    step = np.full(n, -1, dtype=np.intp)
+
+    for level in index.levels[1:]:
+        dependencies, owners = _gather(index.dependencies_ptr, index.dependencies, level)
+        starts = np.searchsorted(owners, np.arange(len(level)))
+        worst = np.maximum.reduceat(best[dependencies], starts)
+        # Argmax within each segment: first dependency reaching the max
+        hit = best[dependencies] == np.repeat(worst, np.diff(np.r_[starts, len(owners)]))
+        first_hit = np.minimum.reduceat(np.where(hit, np.arange(len(owners)), len(owners)), starts)
+        best[level] += worst
+        step[level] = dependencies[first_hit]
+
+    entries = np.flatnonzero(index.entry)
+    node = int(entries[np.argmax(best[entries])])
+    total = float(best[node])
+
+    path = [node]
+    while step[node] >= 0:
+        node = int(step[node])
+        path.append(node)
+    return path, total
+
+
+def propagation_trees(
+    index: GraphIndex, status: np.ndarray
+) -> Tuple[np.ndarray, Dict[int, Dict[int, int]]]:
+    """
+    Who degraded whom in a run.
+
+    Failing services (status >= DEGRADED) push degradation into their
+    direct dependents (see PropagationGraph.propagate); a dependent that
+    is itself failing passes it on. Root causes are failing services with
+    no failing dependency.
+
+    All roots are walked up the dependents CSR together, as a frontier of
+    (root, service) pairs, continuing through failing services only; the
+    work is one vectorized step per level reached, O(reached pairs) total.
+
+    Returns (roots, trees): trees[root] maps every service it reached to
+    the service it was reached from, so paths can be read back.
+    """
+    n = index.n
+    failing = np.asarray(status) > 0
+    graph = index.graph
+
+    failing_dependencies = np.bincount(
+        graph.sources[failing[graph.targets]], minlength=n
+    )
+    roots = np.flatnonzero(failing & (failing_dependencies == 0))
+
+    frontier, frontier_roots = roots, roots
+    visited = roots * n + roots    # root * n + service, sorted
+    reached_roots, reached, parents = [], [], []
+
+    while len(frontier):
+        dependents, owners = _gather(index.dependents_ptr, index.dependents, frontier)
+        pair_roots = frontier_roots[owners]
+        keys, first = np.unique(pair_roots * n + dependents, return_index=True)
+        fresh = ~np.isin(keys, visited, assume_unique=True)
+        keys, first = keys[fresh], first[fresh]
+        visited = np.union1d(visited, keys)
+
+        children, pair_roots = dependents[first], pair_roots[first]
+        reached_roots.append(pair_roots)
+        reached.append(children)
+        parents.append(frontier[owners[first]])
+
+        passing = failing[children]
+        frontier, frontier_roots = children[passing], pair_roots[passing]
+
+    trees: Dict[int, Dict[int, int]] = {root: {} for root in roots.tolist()}
+    for root_batch, child_batch, parent_batch in zip(reached_roots, reached, parents):
+        for root, child, parent in zip(root_batch.tolist(), child_batch.tolist(), parent_batch.tolist()):
+            trees[root][child] = parent
+    return roots, trees
+
+
+def _path_to(parent: Dict[int, int], root: int, node: int) -> List[int]:
+    path = [node]
+    while node != root:
+        node = parent[node]
+        path.append(node)
+    path.reverse()
+    return path
+
+
+# -----------------------------
+# Report
+# -----------------------------
+
+@dataclass
+class BlastRadiusReport:
+    """
+    Propagation analysis of one run, by service index into `service_keys`.
+    """
+    service_keys: List[str]
+    failing: List[int]
+    roots: List[int]
+    # root -> {reached service -> service it was reached from}
+    trees: Dict[int, Dict[int, int]]
+    critical_path: List[int]
+    critical_path_latency_ms: float
+    index: GraphIndex
+
+    def paths(self, root: int) -> List[List[int]]:
+        """
+        Root-to-leaf propagation paths of one root cause (leaves: reached
+        services that reached nothing further).
+        """
+        parent = self.trees[root]
+        inner = set(parent.values())
+        leaves = [node for node in parent if node not in inner]
+        return [_path_to(parent, root, leaf) for leaf in sorted(leaves)] or [[root]]
+
+    def blast_radius(self, node: int) -> np.ndarray:
+        return self.index.upstream(node)
+
+    def to_content(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Plain data keyed by service id. Service lists are cut to `limit`
+        entries (sizes are always exact).
+        """
+        keys = self.service_keys
+
+        def names(indices) -> List[str]:
+            return [keys[i] for i in list(indices[:limit])]
+
+        # All failing services' radii in one unpack, listed row by row
+        # (only the first `limit` members of each are materialized)
+        reach = self.index.upstream_mask(self.failing)
+        sizes = reach.sum(axis=1).tolist()
+        return {
+            "failing": names(self.failing),
+            "root_causes": [
+                {
+                    "service": keys[root],
+                    "impacted": names(sorted(self.trees[root])),
+                    "paths": [names(path) for path in self.paths(root)[:limit]],
+                }
+                for root in self.roots
+            ],
+            "critical_path": {
+                "services": [keys[i] for i in self.critical_path],
+                "latency_ms": round(self.critical_path_latency_ms, 1),
+            },
+            "blast_radius": {
+                keys[node]: {"size": size, "services": names(np.flatnonzero(row))}
+                for node, size, row in zip(self.failing, sizes, reach)
+            },
+        }
+
+
+def analyze_run(result: SimulationResult, graph: PropagationGraph) -> BlastRadiusReport:
+    """
+    Root causes, propagation trees, critical path and blast radii of a
+    run's final service state. graph must be over result.services, in
+    that order (e.g. Topology.graph_for(result.services)).
+    """
+    if graph.nodes != tuple(result.services):
+        raise ValueError("graph nodes must match the run's services")
+
+    index = graph_index(graph)
+    states = list(result.services.values())
+    latency = np.array([svc.latency_ms for svc in states])
+    status = np.array([_CODES[svc.status] for svc in states], dtype=np.int8)
+
+    roots, trees = propagation_trees(index, status)
+    path, total = critical_path(index, latency)
+
+    return BlastRadiusReport(
+        service_keys=list(result.services),
+        failing=np.flatnonzero(status > 0).tolist(),
+        roots=roots.tolist(),
+        trees=trees,
+        critical_path=path,
+        critical_path_latency_ms=total,
+        index=index,
+    )
@@ -1,14 +1,23 @@
 # app/core/explain_payload.py
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
+from app.core.blast_radius import analyze_run
+from app.core.propagation import PropagationGraph
 from app.core.simulation import SimulationResult
+from app.core.topology import get_topology_registry
 
+# Cap on paths / services per list in the payload (it goes into a prompt)
+EXPLAIN_LIST_LIMIT = 5
 
-def compute_trend(values: List[float]) -> str:
+
+def compute_trend(values: Sequence[float]) -> str:
     """
     Simple deterministic trend detection.
+
+    Only the endpoints are read, so a window view (MetricSeries.values
+    over a session's ring buffer) is used as is, without copying.
     """
-    if not values:
+    if len(values) == 0:
         return "unknown"
 
     start = values[0]
@@ -21,7 +30,19 @@ def compute_trend(values: List[float]) -> str:
     return "stable"
 
 
-def build_explain_payload(result: SimulationResult, scenario: str) -> Dict:
+def run_graph(result: SimulationResult) -> PropagationGraph:
+    """
+    Dependency graph a run was propagated over (the default topology if
+    the run's is no longer registered).
+    """
+    registry = get_topology_registry()
+    topology = registry.resolve(result.topology) or registry.default
+    return topology.graph_for(tuple(result.services))
+
+
+def build_explain_payload(
+    result: SimulationResult, scenario: str, graph: Optional[PropagationGraph] = None
+) -> Dict:
     """
     Build a deterministic, LLM-safe explanation payload.
     """
@@ -43,27 +64,63 @@ def build_explain_payload(result: SimulationResult, scenario: str) -> Dict:
     # -----------------------------
     metric_trends = {
         "p95_latency": compute_trend(
-            [p["value"] for p in result.metrics["latency_ms"]]
+            result.metrics["latency_ms"].values
         ),
         "error_rate": compute_trend(
-            [p["value"] for p in result.metrics["error_rate_pct"]]
+            result.metrics["error_rate_pct"].values
         ),
         "request_volume": compute_trend(
-            [p["value"] for p in result.metrics["request_volume"]]
+            result.metrics["request_volume"].values
         ),
         "queue_depth": compute_trend(
-            [p["value"] for p in result.metrics["queue_depth"]]
+            result.metrics["queue_depth"].values
         ),
     }
 
     # -----------------------------
-    # Propagation path (static for now)
+    # Health timeline (when the run has one)
     # -----------------------------
+    health_timeline = None
+    if result.timeline is not None:
+        summary = result.timeline.summary()
+        health_timeline = {
+            result.services[key].name: summary[key]
+            for key in result.timeline.service_keys
+            if key in result.services
+        }
+
+    # -----------------------------
+    # Propagation (computed over the run's topology)
+    # -----------------------------
+    report = analyze_run(result, graph or run_graph(result))
+    keys = report.service_keys
+
+    def names(indices: Sequence[int]) -> List[str]:
+        return [result.services[keys[i]].name for i in indices[:EXPLAIN_LIST_LIMIT]]
+
     propagation_path = [
-        "Database → Orders Service → API Gateway"
+        " → ".join(names(path))
+        for root in report.roots
+        for path in report.paths(root)
+    ][:EXPLAIN_LIST_LIMIT]
+    root_causes = [
+        {
+            "service": result.services[keys[root]].name,
+            "impacted": names(sorted(report.trees[root])),
+        }
+        for root in report.roots[:EXPLAIN_LIST_LIMIT]
     ]
+    sizes = report.index.upstream_count(report.failing) if report.failing else []
+    blast_radius = {
+        result.services[keys[node]].name: int(size)
+        for node, size in zip(report.failing[:EXPLAIN_LIST_LIMIT], sizes)
+    }
+    critical_path = {
+        "services": [result.services[keys[i]].name for i in report.critical_path],
+        "latency_ms": round(report.critical_path_latency_ms, 1),
+    }
 
-    return {
+    payload = {
         "scenario": scenario,
         "system_mode": max(
             (svc["status"] for svc in services),
@@ -72,4 +129,13 @@ def build_explain_payload(result: SimulationResult, scenario: str) -> Dict:
         "services": services,
         "metric_trends": metric_trends,
         "propagation_path": propagation_path,
+        "root_causes": root_causes,
+        "critical_path": critical_path,
+        # Failing service -> number of services that depend on it
+        "blast_radius": blast_radius,
     }
+    if health_timeline is not None:
+        # Per service: time to DEGRADED / UNHEALTHY, ticks per status,
+        # recovery time (None = did not happen within the window)
+        payload["health_timeline"] = health_timeline
+    return payload
@@ -1,40 +1,251 @@
 ##app/core/failures
+from dataclasses import dataclass
 from enum import Enum
-from typing import Callable
+from typing import Callable, Optional, Sequence
 
-from .simulation import SimulationResult, ServiceState
-from .rules import evaluate_health
+import numpy as np
 
+from .simulation import SimulationResult, SCENARIO_PROFILES, SERVICE_CAPACITY, METRIC_RANGES
+from .scenarios import ScenarioProfile
+from .batch import SimulationBatch
+from .propagation import PropagationGraph, default_graph
+from .queueing import queueing_delay
+from .rng import RunRandom
+from .rules import STATUS_BY_CODE, evaluate_health, classify_health
+from .series import MetricSeries
+from .timeline import HealthTimeline
 
-class FailureScenario(str, Enum):
-    DATABASE_LATENCY_SPIKE = "database_latency_spike"
-    EXTERNAL_DEPENDENCY_DEGRADATION = "external_dependency_degradation"
-    RETRY_AMPLIFICATION = "retry_amplification"
 
+# One member per scenario in scenarios.json (e.g. DATABASE_LATENCY_SPIKE)
+FailureScenario = Enum(
+    "FailureScenario",
+    {name.upper(): name for name in SCENARIO_PROFILES},
+    type=str,
+)
 
-def apply_database_latency_spike(result: SimulationResult) -> None:
+
+class FailureApplier:
     """
-    Simulate a sudden database latency and error spike.
+    Compiled "inject" step of a scenario: shifts the target service's
+    latency / errors by fixed amounts and re-evaluates its health.
+
+    Works on a single SimulationResult (call it; every tick of its
+    timeline shifts too) or on every row of a SimulationBatch at once
+    (apply_batch).
     """
-    db = result.services["database"]
 
-    db.latency_ms += 1400
-    db.error_rate_pct += 6.0
-    db.status = evaluate_health(db.latency_ms, db.error_rate_pct)
+    __slots__ = ("target", "latency_ms", "error_rate_pct")
 
+    def __init__(self, profile: ScenarioProfile):
+        self.target = profile.target
+        self.latency_ms, self.error_rate_pct = profile.injection
 
-def apply_external_dependency_degradation(result: SimulationResult) -> None:
-    """
-    Simulate an external API becoming slow and flaky.
-    """
-    ext = result.services["external_dependency"]
+    def __call__(self, result: SimulationResult) -> None:
+        svc = result.services[self.target]
+
+        svc.latency_ms += self.latency_ms
+        svc.error_rate_pct += self.error_rate_pct
+        svc.status = evaluate_health(svc.latency_ms, svc.error_rate_pct)
+
+        timeline = result.timeline
+        if timeline is not None:
+            j = timeline.column(self.target)
+            timeline.latency_ms[:, j] += self.latency_ms
+            timeline.error_rate_pct[:, j] += self.error_rate_pct
+            timeline.status[:, j] = classify_health(
+                timeline.latency_ms[:, j], timeline.error_rate_pct[:, j]
+            )
 
-    ext.latency_ms += 600
-    ext.error_rate_pct += 2.0
-    ext.status = evaluate_health(ext.latency_ms, ext.error_rate_pct)
+    def apply_batch(self, batch: SimulationBatch) -> None:
+        j = batch.service_keys.index(self.target)
 
+        batch.latency_ms[:, j] += self.latency_ms
+        batch.error_rate_pct[:, j] += self.error_rate_pct
+        batch.status[:, j] = classify_health(
+            batch.latency_ms[:, j], batch.error_rate_pct[:, j]
+        )
 
+
+# Scenarios without an "inject" entry cannot be injected (no applier)
 FAILURE_APPLIERS: dict[FailureScenario, Callable[[SimulationResult], None]] = {
-    FailureScenario.DATABASE_LATENCY_SPIKE: apply_database_latency_spike,
-    FailureScenario.EXTERNAL_DEPENDENCY_DEGRADATION: apply_external_dependency_degradation,
+    FailureScenario(name): FailureApplier(profile)
+    for name, profile in SCENARIO_PROFILES.items()
+    if profile.injection is not None
 }
+
+
+# -----------------------------
+# Timed Fault Composition
+# -----------------------------
+
+@dataclass(frozen=True)
+class TimedFault:
+    """
+    One fault of a compound incident, over the run's metric window.
+
+    - start: first active tick (index into the window)
+    - duration: active ticks (None = until the end of the window)
+    - ramp: ticks to reach full intensity; intensity grows linearly
+      1 / (ramp + 1), 2 / (ramp + 1), ... from `start`
+    """
+    scenario: FailureScenario
+    start: int = 0
+    duration: Optional[int] = None
+    ramp: int = 0
+
+    def key(self) -> str:
+        end = "" if self.duration is None else self.duration
+        return f"{self.scenario.value}@{self.start}+{end}~{self.ramp}"
+
+    def activation(self, ticks: int) -> np.ndarray:
+        """
+        Intensity (0–1) per tick of a `ticks`-long window.
+        """
+        t = np.arange(ticks)
+        level = np.clip((t - self.start + 1) / (self.ramp + 1), 0.0, 1.0)
+        if self.duration is not None:
+            level[t >= self.start + self.duration] = 0.0
+        return level
+
+
+@dataclass
+class FaultTimeline(HealthTimeline):
+    """
+    HealthTimeline of a composed run, plus each fault's intensity per tick.
+    """
+    activation: np.ndarray = None     # (faults, ticks)
+
+
+def composition_key(faults: Sequence[TimedFault]) -> str:
+    """
+    Canonical description of a fault list (for run ids).
+    """
+    return "|".join(fault.key() for fault in faults)
+
+
+def compose_failures(
+    result: SimulationResult,
+    faults: Sequence[TimedFault],
+    graph: Optional[PropagationGraph] = None,
+) -> FaultTimeline:
+    """
+    Apply several timed faults to a run in one pass.
+
+    Every tick of the window gets the run's service state at that tick
+    (its timeline, or the final state throughout) plus each active
+    fault's inject shift, scaled by its intensity; all ticks then
+    cascade through the propagation graph together, errors are clamped
+    and health is re-evaluated. The result becomes the run's timeline.
+
+    Each fault also scales its scenario's metrics by per-point
+    multipliers, blended by intensity (1 + intensity * (m - 1)); extra
+    request_volume adds its queueing delay (app/core/queueing.py) to
+    every service and the latency / queue_depth metrics. Metric series
+    are replaced, not modified, so stored (read-only) runs can be
+    composed on. Multipliers are drawn from the run's seed, so composing
+    the same faults on the same run is reproducible.
+
+    graph defaults to the default topology's. Cost is O(ticks * faults)
+    plus one propagation over (ticks, services).
+    """
+    if not faults:
+        raise ValueError("At least one fault is required")
+
+    ticks = max((len(series) for series in result.metrics.values()), default=1)
+    appliers = []
+    for fault in faults:
+        applier = FAILURE_APPLIERS.get(fault.scenario)
+        if applier is None:
+            raise ValueError(f"Scenario cannot be injected: {fault.scenario.value}")
+        if not 0 <= fault.start < ticks:
+            raise ValueError(f"Fault start must be within the {ticks}-tick window")
+        appliers.append(applier)
+
+    activation = np.stack([fault.activation(ticks) for fault in faults])
+
+    # -----------------------------
+    # Metrics
+    # -----------------------------
+    # One (faults, ticks) draw per affected metric, blended by intensity
+    # and multiplied across faults
+    rows = {}
+    for i, fault in enumerate(faults):
+        profile = SCENARIO_PROFILES[fault.scenario.value]
+        for metric, bounds in profile.metric_multipliers.items():
+            if metric in result.metrics:
+                rows.setdefault(metric, []).append((i, *bounds))
+
+    rng = RunRandom(result.seed)
+    factors = {}
+    for metric, spec in rows.items():
+        index, low, high = (np.array(column) for column in zip(*spec))
+        drawn = rng.stream("fault", metric).uniform(
+            low[:, None], high[:, None], (len(index), ticks)
+        )
+        factors[metric] = np.prod(1.0 + activation[index] * (drawn - 1.0), axis=0)
+
+    volume = result.metrics.get("request_volume")
+    for metric, factor in factors.items():
+        series = result.metrics[metric]
+        values = series.values * factor[-len(series):]
+        if METRIC_RANGES.get(metric, (0, 0, False))[2]:
+            np.trunc(values, out=values)
+        result.metrics[metric] = MetricSeries(series.time, values)
+
+    # Extra queueing caused by the added load (e.g. retry amplification)
+    extra_wait = 0.0
+    if volume is not None and "request_volume" in factors:
+        capacity, service_ms, share = SERVICE_CAPACITY
+        before = queueing_delay(volume.values, capacity, service_ms, share)
+        after = queueing_delay(result.metrics["request_volume"].values, capacity, service_ms, share)
+        extra_wait = after[0] - before[0]
+
+        for metric, extra in (
+            ("latency_ms", extra_wait @ share),
+            ("queue_depth", np.trunc((after[1] - before[1]).sum(axis=1))),
+        ):
+            series = result.metrics.get(metric)
+            if series is not None:
+                result.metrics[metric] = MetricSeries(series.time, series.values + extra)
+
+    # -----------------------------
+    # Services, every tick at once
+    # -----------------------------
+    service_keys = list(result.services)
+    base = result.timeline
+    if base is not None and len(base) == ticks and base.service_keys == service_keys:
+        latency, errors = base.latency_ms + extra_wait, base.error_rate_pct.copy()
+    else:
+        latency = np.tile([svc.latency_ms for svc in result.services.values()], (ticks, 1))
+        errors = np.tile([svc.error_rate_pct for svc in result.services.values()], (ticks, 1))
+        latency += extra_wait
+
+    for level, applier in zip(activation, appliers):
+        j = service_keys.index(applier.target)
+        latency[:, j] += level * applier.latency_ms
+        errors[:, j] += level * applier.error_rate_pct
+
+    # Same settling as settle_services, but cascading: a fault deep in
+    # the graph reaches every service that transitively depends on it
+    status = classify_health(latency, errors)
+    if graph is None:
+        graph = default_graph(tuple(service_keys))
+    graph.propagate(latency, errors, status, cascade=True)
+    np.clip(errors, 0.0, 0.15, out=errors)  # cap at 15%
+    status = classify_health(latency, errors)
+
+    for j, svc in enumerate(result.services.values()):
+        svc.latency_ms = float(latency[-1, j])
+        svc.error_rate_pct = float(errors[-1, j])
+        svc.status = STATUS_BY_CODE[status[-1, j]]
+
+    series = max(result.metrics.values(), key=len, default=None)
+    result.timeline = FaultTimeline(
+        service_keys=service_keys,
+        time=series.time.copy() if series is not None and len(series) else np.arange(ticks),
+        latency_ms=latency,
+        error_rate_pct=errors,
+        status=status,
+        activation=activation,
+    )
+    return result.timeline
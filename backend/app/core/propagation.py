@@ -1,54 +1,256 @@
 # app/core/propagation.py
-from typing import TYPE_CHECKING
-from .rules import HealthStatus
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .rules import STATUS_BY_CODE, classify_health
 
 if TYPE_CHECKING:
     from .simulation import SimulationResult
 
 
-def propagate_failures(result: "SimulationResult") -> None:
+# -----------------------------
+# Edge Impacts
+# -----------------------------
+
+@dataclass(frozen=True)
+class EdgeImpact:
+    """
+    Latency / error added to a dependent, per health tier of its dependency.
+    Each tier is (latency_ms, error_rate_pct).
+    """
+    degraded: Tuple[float, float]
+    unhealthy: Tuple[float, float]
+
+
+DEFAULT_IMPACT = EdgeImpact(degraded=(120, 0.4), unhealthy=(500, 2.5))
+
+# Edges and their impacts are data: see topologies.json and
+# app/core/topology.py (compiled once per topology version)
+
+
+class DependencyCycleError(ValueError):
+    """
+    Raised when a dependency graph is not a DAG.
+    """
+
+    def __init__(self, nodes: Sequence[str]):
+        self.nodes = list(nodes)
+        super().__init__(
+            "Dependency cycle detected between: " + ", ".join(self.nodes)
+        )
+
+
+# -----------------------------
+# Compiled Dependency Graph
+# -----------------------------
+
+class PropagationGraph:
+    """
+    Dependency DAG compiled once into index arrays.
+
+    Nodes are addressed by position in `nodes`; state arrays passed to
+    propagate() have shape (..., len(nodes)), so the same graph serves a
+    single run and a batch of runs.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        edges: Iterable[Tuple[str, str]],
+        impacts: Optional[Dict[Tuple[str, str], EdgeImpact]] = None,
+        default_impact: EdgeImpact = DEFAULT_IMPACT,
+    ):
+        self.nodes: Tuple[str, ...] = tuple(nodes)
+        self.index: Dict[str, int] = {node: i for i, node in enumerate(self.nodes)}
+        impacts = impacts or {}
+
+        sources: List[int] = []
+        targets: List[int] = []
+        latency_impact: List[Tuple[float, float, float]] = []
+        error_impact: List[Tuple[float, float, float]] = []
+
+        for source, target in edges:
+            if source not in self.index or target not in self.index:
+                raise ValueError(f"Unknown service in edge {source} -> {target}")
+
+            impact = impacts.get((source, target), default_impact)
+            sources.append(self.index[source])
+            targets.append(self.index[target])
+            # Indexed by status code: healthy, degraded, unhealthy
+            latency_impact.append((0.0, impact.degraded[0], impact.unhealthy[0]))
+            error_impact.append((0.0, impact.degraded[1], impact.unhealthy[1]))
+
+        self.order, self.level = self._topological_order(sources, targets)
+
+        # Edges sorted by the level of their dependent, so that in cascade
+        # mode every edge is pushed after its dependency is final
+        edge_order = np.argsort(self.level[sources], kind="stable") if sources else []
+        self.sources = np.asarray(sources, dtype=np.intp)[edge_order]
+        self.targets = np.asarray(targets, dtype=np.intp)[edge_order]
+        self.latency_impact = np.asarray(latency_impact, dtype=float).reshape(-1, 3)[edge_order]
+        self.error_impact = np.asarray(error_impact, dtype=float).reshape(-1, 3)[edge_order]
+
+        edge_levels = self.level[self.sources]
+        self._levels = [
+            (
+                level,
+                np.flatnonzero(self.level == level),
+                slice(*np.searchsorted(edge_levels, [level, level + 1])),
+            )
+            for level in range(1, int(self.level.max(initial=0)) + 1)
+        ]
+
+    def _topological_order(
+        self, sources: List[int], targets: List[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Kahn's algorithm, dependencies first. A node's level is the length
+        of its longest dependency chain (0 for leaves).
+        """
+        n = len(self.nodes)
+        pending = [0] * n
+        dependents: List[List[int]] = [[] for _ in range(n)]
+
+        for source, target in zip(sources, targets):
+            pending[source] += 1
+            dependents[target].append(source)
+
+        level = [0] * n
+        order = [i for i in range(n) if pending[i] == 0]
+
+        for node in order:  # grows while iterating
+            for dependent in dependents[node]:
+                level[dependent] = max(level[dependent], level[node] + 1)
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    order.append(dependent)
+
+        if len(order) < n:
+            raise DependencyCycleError(
+                [self.nodes[i] for i in range(n) if pending[i] > 0]
+            )
+
+        return np.asarray(order, dtype=np.intp), np.asarray(level, dtype=np.intp)
+
+    def _push(
+        self,
+        edges: slice,
+        latency: np.ndarray,
+        errors: np.ndarray,
+        status: np.ndarray,
+    ) -> None:
+        sources = self.sources[edges]
+        targets = self.targets[edges]
+        rows = np.arange(len(sources))
+        upstream = status[:, targets]
+
+        np.add.at(latency, (slice(None), sources), self.latency_impact[edges][rows, upstream])
+        np.add.at(errors, (slice(None), sources), self.error_impact[edges][rows, upstream])
+
+    def propagate(
+        self,
+        latency_ms: np.ndarray,
+        error_rate_pct: np.ndarray,
+        status: np.ndarray,
+        cascade: bool = False,
+    ) -> None:
+        """
+        Push degradation through every edge, modifying arrays in place.
+
+        - cascade=False: every edge uses the status its dependency had on
+          entry (health is not recomputed, minor incidents do not escalate)
+        - cascade=True: nodes are visited in topological order and a node's
+          status is re-evaluated once all its dependencies have pushed into
+          it, so failures can travel the full depth of the graph
+        """
+        n = len(self.nodes)
+        latency = latency_ms.reshape(-1, n)
+        errors = error_rate_pct.reshape(-1, n)
+        codes = status.reshape(-1, n)
+
+        if not cascade:
+            self._push(slice(None), latency, errors, codes)
+        else:
+            for _, nodes, edges in self._levels:
+                self._push(edges, latency, errors, codes)
+                codes[:, nodes] = classify_health(
+                    latency[:, nodes], errors[:, nodes]
+                )
+
+        # reshape() copies non-contiguous input; write results back
+        for original, updated in (
+            (latency_ms, latency), (error_rate_pct, errors), (status, codes)
+        ):
+            if not np.shares_memory(original, updated):
+                original[...] = updated.reshape(original.shape)
+
+
+@lru_cache(maxsize=32)
+def default_graph(service_keys: Tuple[str, ...]) -> PropagationGraph:
+    """
+    Default topology's graph restricted to the given services.
+    """
+    # app.core.topology compiles PropagationGraphs (imports this module)
+    from .topology import get_topology_registry
+
+    return get_topology_registry().default.graph_for(service_keys)
+
+
+# -----------------------------
+# SimulationResult Entry Point
+# -----------------------------
+
+def propagate_failures(
+    result: "SimulationResult",
+    graph: Optional[PropagationGraph] = None,
+    cascade: bool = False,
+) -> None:
     """
     Propagate degradation through service dependencies.
 
-    Dependency chain:
+    Default dependency graph:
       API Gateway -> Orders Service -> Database
+                                    -> External Dependency
 
     Design rules:
     - Deterministic (no randomness)
     - DEGRADED propagates gently
     - UNHEALTHY propagates strongly
     - Propagation must NOT auto-escalate minor incidents
-    - Health is NOT recomputed here
-    """
-
-    db = result.services.get("database")
-    orders = result.services.get("orders_service")
-    api = result.services.get("api_gateway")
-
-    # -----------------------------
-    # Database → Orders Service
-    # -----------------------------
-    if db and orders:
-        if db.status == HealthStatus.UNHEALTHY:
-            # Severe DB issues: blocked threads, retries, queue buildup
-            orders.latency_ms += 500
-            orders.error_rate_pct += 2.5
-
-        elif db.status == HealthStatus.DEGRADED:
-            # Mild DB issues: slower queries, limited contention
-            orders.latency_ms += 120
-            orders.error_rate_pct += 0.4
-
-    # -----------------------------
-    # Orders Service → API Gateway
-    # -----------------------------
-    if orders and api:
-        if orders.status == HealthStatus.UNHEALTHY:
-            # Orders meltdown affects API response times & errors
-            api.latency_ms += 400
-            api.error_rate_pct += 1.5
-
-        elif orders.status == HealthStatus.DEGRADED:
-            # Minor downstream slowdown, not an outage
-            api.latency_ms += 90
-            api.error_rate_pct += 0.25
+    - Health is NOT recomputed here (unless cascade=True)
+
+    The run's timeline, if any, is propagated tick by tick the same way.
+    """
+
+    if graph is None:
+        graph = default_graph(tuple(result.services))
+
+    services = [result.services[key] for key in graph.nodes]
+
+    latency = np.array([svc.latency_ms for svc in services], dtype=float)
+    errors = np.array([svc.error_rate_pct for svc in services], dtype=float)
+    status = np.array(
+        [STATUS_BY_CODE.index(svc.status) for svc in services], dtype=np.int8
+    )
+
+    graph.propagate(latency, errors, status, cascade=cascade)
+
+    for svc, lat, err, code in zip(services, latency, errors, status):
+        svc.latency_ms = float(lat)
+        svc.error_rate_pct = float(err)
+        if cascade:
+            svc.status = STATUS_BY_CODE[code]
+
+    timeline = result.timeline
+    if timeline is not None:
+        columns = [timeline.column(key) for key in graph.nodes]
+        latency = timeline.latency_ms[:, columns]
+        errors = timeline.error_rate_pct[:, columns]
+        status = timeline.status[:, columns]
+        graph.propagate(latency, errors, status, cascade=cascade)
+        timeline.latency_ms[:, columns] = latency
+        timeline.error_rate_pct[:, columns] = errors
+        timeline.status[:, columns] = status
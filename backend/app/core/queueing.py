@@ -0,0 +1,79 @@
+# app/core/queueing.py
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Seconds per tick (request_volume is requests per tick)
+TICK_S = 1.0
+
+# Utilization cap for the steady-state wait formula; above it the
+# backlog term takes over
+RHO_MAX = 0.98
+
+
+def queueing_delay(
+    volume: np.ndarray,
+    capacity_rps: np.ndarray,
+    service_ms: np.ndarray,
+    traffic_share: np.ndarray,
+    backlog: Optional[np.ndarray] = None,
+    tick_s: float = TICK_S,
+    last_only: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-tick queueing delay of each service under an M/M/c model.
+
+    volume: (..., ticks) requests per tick entering the system. Service j
+    receives volume * traffic_share[j] and has c = capacity_rps * service
+    time servers, each serving 1 / service_ms requests per ms.
+
+    Returns (wait_ms, backlog), both (..., ticks, services):
+    - steady-state wait from Sakasegawa's M/M/c approximation,
+      Wq = S * rho^(sqrt(2(c+1)) - 1) / (c (1 - rho)), rho capped at RHO_MAX
+    - plus the time to drain the backlog Q, which follows the Lindley
+      recursion Q[t] = max(0, Q[t-1] + (arrivals[t] - capacity) * tick),
+      computed in closed form as S[t] - min(-Q0, min(S[..t])) over the
+      cumulative net inflow S. Q only grows while arrivals exceed capacity.
+
+    backlog: (..., services) queue carried in from earlier ticks (default 0).
+    last_only=True returns only the last tick (ticks axis of length 1),
+    skipping the per-tick wait of the others.
+    """
+    capacity = np.asarray(capacity_rps, dtype=float)
+    service_s = np.asarray(service_ms, dtype=float) / 1000
+    servers = capacity * service_s
+    rate = np.asarray(traffic_share, dtype=float) / tick_s  # per unit of volume
+
+    volume = np.asarray(volume, dtype=float)
+    ticks, n_services = volume.shape[-1], len(capacity)
+
+    # Steady-state wait
+    load = volume[..., -1:] if last_only else volume
+    rho = np.minimum(load[..., None] * (rate / capacity), RHO_MAX)
+    wait_s = rho ** (np.sqrt(2 * (servers + 1)) - 1)
+    wait_s *= service_s / servers
+    wait_s /= np.subtract(1.0, rho, out=rho)
+
+    # Backlog: only (run, service) pairs whose peak arrivals exceed
+    # capacity, or that start with a backlog, can queue at all
+    flat = volume.reshape(-1, ticks)
+    carried = (
+        np.zeros((len(flat), n_services)) if backlog is None
+        else np.broadcast_to(backlog, volume.shape[:-1] + (n_services,)).reshape(-1, n_services)
+    )
+    rows, cols = np.nonzero((flat.max(axis=1)[:, None] * rate > capacity) | (carried > 0))
+
+    queue = np.zeros((len(flat), 1 if last_only else ticks, n_services))
+    if len(rows):
+        net = flat[rows] * rate[cols, None] - capacity[cols, None]
+        net *= tick_s
+        np.cumsum(net, axis=1, out=net)
+        floor = np.minimum.accumulate(net, axis=1)
+        np.minimum(floor, -carried[rows, cols][:, None], out=floor)
+        net -= floor
+        queue[rows, :, cols] = net[:, -1:] if last_only else net
+    queue = queue.reshape(volume.shape[:-1] + queue.shape[1:])
+
+    wait_s += queue / capacity
+    wait_s *= 1000
+    return wait_s, queue
@@ -0,0 +1,278 @@
+# app/core/ringbuffer.py
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .series import MetricSeries
+
+# Rollup bucket widths, in time units (seconds at the default 1 s tick)
+ROLLUP_RESOLUTIONS: Tuple[int, ...] = (1, 10, 60)
+
+ROLLUP_AGGREGATES = ("min", "max", "avg", "sum", "count")
+
+# Below this many points, extend() appends one by one (cheaper than the
+# bulk reductions' fixed overhead)
+EXTEND_BULK_MIN = 16
+
+
+# -----------------------------
+# Ring Storage
+# -----------------------------
+
+class Ring:
+    """
+    Fixed-capacity ring of rows over preallocated column arrays.
+
+    Every column holds 2 * capacity slots and each row is written twice,
+    at slot i and i + capacity. The newest n rows are therefore always
+    the contiguous slice [head + capacity - n, head + capacity), so
+    windows are array views, never copies.
+
+    Views alias the ring: a later write can overwrite what they show.
+    Copy them to keep a stable snapshot.
+    """
+
+    __slots__ = ("capacity", "names", "columns", "head", "size")
+
+    def __init__(self, capacity: int, columns: Sequence[Tuple[str, type]]):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.names = tuple(name for name, _ in columns)
+        self.columns = tuple(np.zeros(2 * capacity, dtype=dtype) for _, dtype in columns)
+        self.head = 0   # slot of the next write
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, *row) -> None:
+        """
+        Append one row, O(1). Values are given in column order.
+        """
+        i, j = self.head, self.head + self.capacity
+        for column, value in zip(self.columns, row):
+            column[i] = column[j] = value
+
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def set_last(self, *row) -> None:
+        """
+        Overwrite the newest row in place.
+        """
+        i = (self.head - 1) % self.capacity
+        j = i + self.capacity
+        for column, value in zip(self.columns, row):
+            column[i] = column[j] = value
+
+    def last(self) -> Tuple:
+        """
+        Newest row, in column order (ring must not be empty).
+        """
+        i = (self.head - 1) % self.capacity
+        return tuple(column[i] for column in self.columns)
+
+    def extend(self, *columns: np.ndarray) -> None:
+        """
+        Append many rows at once; only the newest `capacity` are kept.
+        """
+        n = min(len(columns[0]), self.capacity)
+        if n == 0:
+            return
+
+        slots = (self.head + np.arange(n)) % self.capacity
+        for column, values in zip(self.columns, columns):
+            values = values[len(values) - n:]
+            column[slots] = values
+            column[slots + self.capacity] = values
+
+        self.head = (self.head + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def view(self, n: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+        """
+        Newest n rows (default: all), oldest first, as views per column.
+        """
+        n = self.size if n is None else max(0, min(n, self.size))
+        end = self.head + self.capacity
+        return tuple(column[end - n:end] for column in self.columns)
+
+
+# -----------------------------
+# Metric History
+# -----------------------------
+
+class MetricHistory:
+    """
+    Bounded history of one metric: a raw point ring plus min / max / sum /
+    count rollups per resolution, all updated on append.
+
+    Times must be non-decreasing. A bucket covers
+    [t - t % resolution, t - t % resolution + resolution).
+    """
+
+    __slots__ = ("raw", "rollups")
+
+    def __init__(
+        self,
+        capacity: int,
+        resolutions: Sequence[int] = ROLLUP_RESOLUTIONS,
+        rollup_capacity: Optional[int] = None,
+    ):
+        self.raw = Ring(capacity, (("time", np.int64), ("value", np.float64)))
+        self.rollups: Dict[int, Ring] = {
+            resolution: Ring(
+                rollup_capacity or capacity,
+                (
+                    ("time", np.int64),
+                    ("min", np.float64),
+                    ("max", np.float64),
+                    ("sum", np.float64),
+                    ("count", np.int64),
+                ),
+            )
+            for resolution in sorted(resolutions)
+        }
+
+    @classmethod
+    def from_series(cls, series: MetricSeries, capacity: Optional[int] = None, **kwargs) -> "MetricHistory":
+        history = cls(capacity or max(len(series), 1), **kwargs)
+        history.extend(series)
+        return history
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+
+    def append(self, time: int, value: float) -> None:
+        """
+        Append one point, O(1): one raw write plus one bucket update per
+        rollup.
+        """
+        if self.raw.size and time < self.raw.last()[0]:
+            raise ValueError("time must be non-decreasing")
+
+        self.raw.push(time, value)
+
+        for resolution, ring in self.rollups.items():
+            bucket = time - time % resolution
+            i = (ring.head - 1) % ring.capacity
+            bucket_time, low, high, total, count = ring.columns
+
+            if ring.size and bucket_time[i] == bucket:
+                j = i + ring.capacity
+                low[i] = low[j] = min(low[i], value)
+                high[i] = high[j] = max(high[i], value)
+                total[i] = total[j] = total[i] + value
+                count[i] = count[j] = count[i] + 1
+            else:
+                ring.push(bucket, value, value, value, 1)
+
+    def extend(self, series: MetricSeries) -> None:
+        """
+        Append a whole series; rollups are reduced per bucket in bulk.
+        """
+        if len(series) == 0:
+            return
+        if len(series) < EXTEND_BULK_MIN:
+            for time, value in zip(series.time.tolist(), series.values.tolist()):
+                self.append(time, value)
+            return
+
+        time, values = series.time, series.values
+        if np.any(np.diff(time) < 0) or (self.raw.size and time[0] < self.raw.last()[0]):
+            raise ValueError("time must be non-decreasing")
+
+        self.raw.extend(time, values)
+
+        for resolution, ring in self.rollups.items():
+            buckets = time - time % resolution
+            starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+            bucket_time = buckets[starts]
+            low = np.minimum.reduceat(values, starts)
+            high = np.maximum.reduceat(values, starts)
+            total = np.add.reduceat(values, starts)
+            count = np.diff(np.append(starts, len(values)))
+
+            # First group continues the currently open bucket
+            if ring.size and ring.last()[0] == bucket_time[0]:
+                _, l0, h0, s0, c0 = ring.last()
+                ring.set_last(
+                    bucket_time[0], min(l0, low[0]), max(h0, high[0]), s0 + total[0], c0 + count[0]
+                )
+                bucket_time, low, high, total, count = (
+                    a[1:] for a in (bucket_time, low, high, total, count)
+                )
+
+            ring.extend(bucket_time, low, high, total, count)
+
+    # -----------------------------
+    # Views
+    # -----------------------------
+
+    def window(self, n: Optional[int] = None) -> MetricSeries:
+        """
+        Newest n raw points as a zero-copy series.
+        """
+        return MetricSeries(*self.raw.view(n))
+
+    def rollup(self, resolution: int, how: str = "avg", n: Optional[int] = None) -> MetricSeries:
+        """
+        Newest n buckets of one rollup. min / max / sum / count are views;
+        avg is computed from sum / count.
+        """
+        if resolution not in self.rollups:
+            raise ValueError(f"No rollup at resolution {resolution}")
+        if how not in ROLLUP_AGGREGATES:
+            raise ValueError(f"Unknown aggregation: {how}")
+
+        time, low, high, total, count = self.rollups[resolution].view(n)
+        values = {
+            "min": low,
+            "max": high,
+            "sum": total,
+            "count": count,
+        }.get(how)
+        if values is None:
+            values = total / count
+        return MetricSeries(time, values)
+
+    def range(
+        self,
+        start: int,
+        end: int,
+        max_points: Optional[int] = None,
+        how: str = "avg",
+    ) -> Tuple[Optional[int], MetricSeries]:
+        """
+        Points with start <= time < end at the finest resolution that still
+        covers `start` and returns at most max_points points (falling back
+        to the coarsest rollup when none does).
+
+        Returns (resolution, series); resolution None means raw points.
+        Only the chosen ring is searched (binary search), never scanned.
+        """
+        candidates = [(None, self.raw)] + list(self.rollups.items())
+
+        chosen = None
+        for resolution, ring in candidates:
+            if ring.size == 0:
+                continue
+            chosen = (resolution, ring)
+            oldest = ring.view()[0][0]
+            step = resolution or 1
+            fits = max_points is None or -(-(end - start) // step) <= max_points
+            if oldest <= start and fits:
+                break
+
+        if chosen is None:
+            return None, MetricSeries([], [])
+
+        resolution, _ = chosen
+        series = self.window() if resolution is None else self.rollup(resolution, how)
+        return resolution, series.between(start, end)
@@ -0,0 +1,83 @@
+# app/core/rng.py
+import hashlib
+import secrets
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Seeds are stored as signed 64-bit ints (run store); valid: [0, MAX_SEED)
+MAX_SEED = 2**63
+
+
+def new_seed() -> int:
+    """
+    Fresh 63-bit seed (fits in a signed 64-bit int / JSON safe-ish).
+    """
+    return secrets.randbits(63)
+
+
+def _name_key(name: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def derive_seed(seed: int, *keys: int) -> int:
+    """
+    Child seed for a unit of parallel work (e.g. one chunk of a sweep),
+    independent of which worker runs it or in what order.
+    """
+    state = np.random.SeedSequence(seed, spawn_key=keys).generate_state(2, np.uint32)
+    return (int(state[0]) << 31) | (int(state[1]) >> 1)
+
+
+def make_run_id(
+    kind: str,
+    scenario: Optional[str],
+    seed: int,
+    parent: Optional[str] = None,
+    topology: Optional[str] = None,
+) -> str:
+    """
+    Stable id for a run: the same (kind, scenario, seed) always maps to the
+    same id, and recomputing with that seed reproduces the run.
+
+    parent is the run a derived run was computed from (e.g. a failure
+    injected into a stored run), so derived runs never collide with
+    fresh ones. topology is the key of a non-default topology.
+    """
+    raw = f"{kind}|{scenario or 'baseline'}|{seed}"
+    if parent:
+        raw += f"|{parent}"
+    if topology:
+        raw += f"|topology={topology}"
+    raw = raw.encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+class RunRandom:
+    """
+    Per-run random source derived from a single seed.
+
+    Every named consumer (a service, a metric, the severity draw) gets its
+    own numpy Generator keyed by (seed, name), so streams are independent
+    of each other and of the order in which they are requested. Repeated
+    stream() calls with the same name continue the same stream.
+
+    Nothing is shared between instances, so runs can be generated in
+    parallel across threads and processes.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = new_seed() if seed is None else int(seed)
+        self._streams: Dict[Tuple[str, ...], np.random.Generator] = {}
+
+    def stream(self, *names: str) -> np.random.Generator:
+        generator = self._streams.get(names)
+        if generator is None:
+            sequence = np.random.SeedSequence(
+                self.seed, spawn_key=tuple(_name_key(name) for name in names)
+            )
+            generator = np.random.Generator(np.random.PCG64(sequence))
+            self._streams[names] = generator
+        return generator
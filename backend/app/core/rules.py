@@ -1,6 +1,11 @@
 # app/core/rules.py
 
 from enum import Enum
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 
 class HealthStatus(str, Enum):
@@ -18,21 +23,123 @@ ERROR_RATE_DEGRADED_PCT = 3.0    # 3%
 ERROR_RATE_UNHEALTHY_PCT = 8.0   # 8%
 
 
-def evaluate_health(latency_ms: float, error_rate_pct: float) -> HealthStatus:
+@dataclass(frozen=True)
+class HealthThresholds:
+    latency_degraded_ms: float
+    latency_unhealthy_ms: float
+    error_rate_degraded_pct: float
+    error_rate_unhealthy_pct: float
+
+
+DEFAULT_THRESHOLDS = HealthThresholds(
+    latency_degraded_ms=LATENCY_DEGRADED_MS,
+    latency_unhealthy_ms=LATENCY_UNHEALTHY_MS,
+    error_rate_degraded_pct=ERROR_RATE_DEGRADED_PCT,
+    error_rate_unhealthy_pct=ERROR_RATE_UNHEALTHY_PCT,
+)
+
+# Named alternatives used to calibrate alerting (see app/core/sweep.py)
+THRESHOLD_SETS: Dict[str, HealthThresholds] = {
+    "default": DEFAULT_THRESHOLDS,
+    "strict": HealthThresholds(
+        latency_degraded_ms=200,
+        latency_unhealthy_ms=600,
+        error_rate_degraded_pct=2.0,
+        error_rate_unhealthy_pct=5.0,
+    ),
+    "lenient": HealthThresholds(
+        latency_degraded_ms=450,
+        latency_unhealthy_ms=1200,
+        error_rate_degraded_pct=5.0,
+        error_rate_unhealthy_pct=12.0,
+    ),
+}
+
+
+# Status codes used by array-based code paths (index into this list)
+STATUS_BY_CODE = [
+    HealthStatus.HEALTHY,
+    HealthStatus.DEGRADED,
+    HealthStatus.UNHEALTHY,
+]
+
+# One HealthThresholds for every service, or one per service (last axis)
+ThresholdSpec = Union[HealthThresholds, Sequence[HealthThresholds]]
+
+
+# -----------------------------
+# Array Classifier
+# -----------------------------
+
+@lru_cache(maxsize=64)
+def _bounds(thresholds: Tuple[HealthThresholds, ...]) -> Tuple[np.ndarray, ...]:
     """
-    error_rate_pct is expected to be in PERCENT (0–100).
+    (latency degraded, latency unhealthy, error degraded, error unhealthy)
+    bounds, each of shape (len(thresholds),).
+    """
+    return tuple(
+        np.array([getattr(t, name) for t in thresholds], dtype=float)
+        for name in (
+            "latency_degraded_ms",
+            "latency_unhealthy_ms",
+            "error_rate_degraded_pct",
+            "error_rate_unhealthy_pct",
+        )
+    )
+
+
+def service_thresholds(
+    service_keys: Iterable[str],
+    overrides: Optional[Mapping[str, HealthThresholds]] = None,
+    default: HealthThresholds = DEFAULT_THRESHOLDS,
+) -> Tuple[HealthThresholds, ...]:
+    """
+    Per-service thresholds (in service_keys order) for classify_health:
+    the override where one is given, `default` otherwise.
+    """
+    overrides = overrides or {}
+    return tuple(overrides.get(key, default) for key in service_keys)
+
+
+def classify_health(
+    latency_ms: np.ndarray,
+    error_rate_pct: np.ndarray,
+    thresholds: ThresholdSpec = DEFAULT_THRESHOLDS,
+) -> np.ndarray:
+    """
+    Health status codes (int8, see STATUS_BY_CODE) for whole arrays in
+    one pass: any shape, e.g. (services,), (ticks, services) or
+    (runs, ticks, services).
+
+    A value's code is the number of its metric's thresholds it reaches,
+    i.e. searchsorted(thresholds, value, side="right"); the status is the
+    worse of the latency and error codes. Written as broadcast
+    comparisons so that per-service thresholds (a sequence, matched
+    against the last axis) cost the same as shared ones.
     """
+    if isinstance(thresholds, HealthThresholds):
+        thresholds = (thresholds,)
+    lat_degraded, lat_unhealthy, err_degraded, err_unhealthy = _bounds(tuple(thresholds))
 
-    if (
-        latency_ms >= LATENCY_UNHEALTHY_MS
-        or error_rate_pct >= ERROR_RATE_UNHEALTHY_PCT
-    ):
-        return HealthStatus.UNHEALTHY
+    latency = np.asarray(latency_ms)
+    errors = np.asarray(error_rate_pct)
 
-    if (
-        latency_ms >= LATENCY_DEGRADED_MS
-        or error_rate_pct >= ERROR_RATE_DEGRADED_PCT
-    ):
-        return HealthStatus.DEGRADED
+    status = (latency >= lat_degraded).view(np.int8)
+    status += (latency >= lat_unhealthy).view(np.int8)
+    error_status = (errors >= err_degraded).view(np.int8)
+    error_status += (errors >= err_unhealthy).view(np.int8)
+    return np.maximum(status, error_status, out=status)
+
+
+def evaluate_health(
+    latency_ms: float,
+    error_rate_pct: float,
+    thresholds: HealthThresholds = DEFAULT_THRESHOLDS,
+) -> HealthStatus:
+    """
+    Status of a single service (scalar wrapper over classify_health).
+
+    error_rate_pct is expected to be in PERCENT (0–100).
+    """
+    return STATUS_BY_CODE[classify_health(latency_ms, error_rate_pct, thresholds).item()]
 
-    return HealthStatus.HEALTHY
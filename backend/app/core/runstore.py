@@ -0,0 +1,496 @@
+# app/core/runstore.py
+
+import os
+import json
+import mmap
+import time
+import fcntl
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.rules import HealthStatus
+from .rng import MAX_SEED
+from .series import MetricSeries
+from .simulation import SimulationResult, ServiceState
+from .timeline import HealthTimeline
+
+# Default: backend/runstore, wherever the server is started from
+RUN_STORE_DIR = os.getenv(
+    "RUN_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "runstore"),
+)
+RUN_STORE_SEGMENT_BYTES = int(os.getenv("RUN_STORE_SEGMENT_BYTES", str(8 * 1024 * 1024)))
+
+# Retention: oldest runs are evicted past either bound, and segment files
+# no run refers to any more are deleted (see RunStore.evict)
+RUN_STORE_MAX_RUNS = int(os.getenv("RUN_STORE_MAX_RUNS", "50000"))
+RUN_STORE_MAX_BYTES = int(os.getenv("RUN_STORE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# Puts between retention checks (the check counts rows and segment bytes)
+_EVICT_EVERY = 64
+
+_TIME_DTYPE = np.dtype("<i8")
+_VALUE_DTYPE = np.dtype("<f8")
+_STATUS_DTYPE = np.dtype("i1")
+_POINT_BYTES = _TIME_DTYPE.itemsize + _VALUE_DTYPE.itemsize
+
+# (name, declaration), in the order they were added
+_ADDED_COLUMNS = (
+    ("timeline_ticks", "INTEGER NOT NULL DEFAULT 0"),
+    # Topology key ("<id>@<version>"); NULL = the default topology
+    ("topology", "TEXT"),
+)
+
+
+# -----------------------------
+# Stored Run
+# -----------------------------
+
+@dataclass
+class StoredRun:
+    """
+    Metadata row plus the run itself; metric series are read-only views
+    over the segment mmap.
+    """
+    run_id: str
+    kind: str
+    scenario: Optional[str]
+    seed: Optional[int]
+    parent_run_id: Optional[str]
+    created_at: float
+    result: SimulationResult
+
+
+# -----------------------------
+# Run Store
+# -----------------------------
+
+class RunStore:
+    """
+    Local store of simulation runs.
+
+    - Metadata (kind, scenario, seed, services, segment location): SQLite
+    - Metric series: append-only segment files. One run is one contiguous
+      record: for each metric, time[n] int64 then values[n] float64
+      (little-endian). Reads are np.frombuffer views over an mmap of the
+      segment, so loading a run or scanning thousands of them never
+      parses JSON or copies series.
+    - Health timeline (optional, after the metrics): time[ticks] int64,
+      latency[ticks * services] and errors[...] float64, status[...] int8,
+      services in the run's service order.
+
+    Appends take an flock on the store directory, so several worker
+    processes can share one store. Run ids are content addresses
+    (make_run_id), so storing an id twice is a no-op.
+
+    Retention is bounded by max_runs and max_bytes (segment bytes on
+    disk), checked every few puts: the oldest runs are dropped, then any
+    sealed segment none of the remaining runs points into is deleted.
+    """
+
+    def __init__(
+        self,
+        root: str = RUN_STORE_DIR,
+        segment_bytes: int = RUN_STORE_SEGMENT_BYTES,
+        max_runs: int = RUN_STORE_MAX_RUNS,
+        max_bytes: int = RUN_STORE_MAX_BYTES,
+    ):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.max_runs = max_runs
+        self.max_bytes = max_bytes
+        self._puts = 0
+        os.makedirs(root, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._lock_file = open(os.path.join(root, ".lock"), "a+")
+        self._maps: Dict[int, Tuple[mmap.mmap, int]] = {}
+        self._maps_lock = threading.Lock()
+
+        self._db = sqlite3.connect(
+            os.path.join(root, "runs.sqlite3"), check_same_thread=False, timeout=30
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " scenario TEXT,"
+            " seed INTEGER,"
+            " severity TEXT,"
+            " parent_run_id TEXT,"
+            " created_at REAL NOT NULL,"
+            " services TEXT NOT NULL,"
+            " metrics TEXT NOT NULL,"
+            " points INTEGER NOT NULL,"
+            " segment INTEGER NOT NULL,"
+            " offset INTEGER NOT NULL)"
+        )
+        # Columns added after the first release; older stores gain them
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(runs)")}
+        for name, declaration in _ADDED_COLUMNS:
+            if name not in columns:
+                self._db.execute(f"ALTER TABLE runs ADD COLUMN {name} {declaration}")
+        self._db.execute("CREATE INDEX IF NOT EXISTS runs_scenario ON runs (scenario, created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS runs_created ON runs (created_at)")
+        self._db.commit()
+
+    # -----------------------------
+    # Segments
+    # -----------------------------
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.root, f"segment-{segment:06d}.bin")
+
+    def _segments(self) -> List[int]:
+        return sorted(
+            int(name[8:14]) for name in os.listdir(self.root)
+            if name.startswith("segment-") and name.endswith(".bin")
+        )
+
+    def _latest_segment(self) -> int:
+        return max(self._segments(), default=0)
+
+    def _append(self, record: bytes) -> Tuple[int, int]:
+        """
+        Append one record, returning (segment, offset). Caller holds _lock.
+        """
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            segment = self._latest_segment()
+            path = self._segment_path(segment)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+
+            if size and size + len(record) > self.segment_bytes:
+                segment, size = segment + 1, 0
+                path = self._segment_path(segment)
+
+            with open(path, "ab") as f:
+                f.write(record)
+            return segment, size
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _view(self, segment: int, offset: int, length: int) -> memoryview:
+        """
+        Read-only view of [offset, offset + length) in a segment, remapping
+        when the segment has grown past the cached mapping.
+        """
+        if length == 0:
+            return memoryview(b"")
+
+        with self._maps_lock:
+            cached = self._maps.get(segment)
+            if cached is None or cached[1] < offset + length:
+                with open(self._segment_path(segment), "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    mapped = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+                # Superseded maps stay alive while views of them exist
+                cached = (mapped, size)
+                self._maps[segment] = cached
+
+        return memoryview(cached[0])[offset:offset + length]
+
+    def _series(
+        self, segment: int, offset: int, metrics: List[str], points: int
+    ) -> Dict[str, MetricSeries]:
+        buffer = self._view(segment, offset, len(metrics) * points * _POINT_BYTES)
+        series = {}
+        for i, metric in enumerate(metrics):
+            base = i * points * _POINT_BYTES
+            time = np.frombuffer(buffer, _TIME_DTYPE, points, base)
+            values = np.frombuffer(buffer, _VALUE_DTYPE, points, base + points * _TIME_DTYPE.itemsize)
+            series[metric] = MetricSeries(time, values)
+        return series
+
+    def _timeline(
+        self, segment: int, offset: int, service_keys: List[str], ticks: int
+    ) -> HealthTimeline:
+        shape = (ticks, len(service_keys))
+        cells = ticks * len(service_keys)
+        buffer = self._view(
+            segment, offset,
+            ticks * _TIME_DTYPE.itemsize + cells * (2 * _VALUE_DTYPE.itemsize + _STATUS_DTYPE.itemsize),
+        )
+        base = ticks * _TIME_DTYPE.itemsize
+        return HealthTimeline(
+            service_keys=service_keys,
+            time=np.frombuffer(buffer, _TIME_DTYPE, ticks, 0),
+            latency_ms=np.frombuffer(buffer, _VALUE_DTYPE, cells, base).reshape(shape),
+            error_rate_pct=np.frombuffer(
+                buffer, _VALUE_DTYPE, cells, base + cells * _VALUE_DTYPE.itemsize
+            ).reshape(shape),
+            status=np.frombuffer(
+                buffer, _STATUS_DTYPE, cells, base + 2 * cells * _VALUE_DTYPE.itemsize
+            ).reshape(shape),
+        )
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+
+    def put(
+        self,
+        result: SimulationResult,
+        kind: str,
+        scenario: Optional[str] = None,
+        parent_run_id: Optional[str] = None,
+    ) -> None:
+        """
+        Persist a run under result.run_id (no-op if already stored).
+        All metric series must have the same length. The timeline is kept
+        when it covers the run's services in order.
+        """
+        if result.run_id is None:
+            raise ValueError("run_id is required to store a run")
+        if result.seed is not None and not 0 <= result.seed < MAX_SEED:
+            raise ValueError(f"seed must be in [0, {MAX_SEED})")
+
+        metrics = list(result.metrics)
+        points = len(result.metrics[metrics[0]]) if metrics else 0
+        if any(len(series) != points for series in result.metrics.values()):
+            raise ValueError("metric series must have equal length")
+
+        record = b"".join(
+            part
+            for series in result.metrics.values()
+            for part in (
+                series.time.astype(_TIME_DTYPE, copy=False).tobytes(),
+                series.values.astype(_VALUE_DTYPE, copy=False).tobytes(),
+            )
+        )
+        timeline = result.timeline
+        if timeline is not None and timeline.service_keys == list(result.services):
+            record += b"".join((
+                timeline.time.astype(_TIME_DTYPE, copy=False).tobytes(),
+                timeline.latency_ms.astype(_VALUE_DTYPE, copy=False).tobytes(),
+                timeline.error_rate_pct.astype(_VALUE_DTYPE, copy=False).tobytes(),
+                timeline.status.astype(_STATUS_DTYPE, copy=False).tobytes(),
+            ))
+            timeline_ticks = len(timeline)
+        else:
+            timeline_ticks = 0
+
+        services = {
+            key: [svc.name, svc.latency_ms, svc.error_rate_pct, svc.status.value]
+            for key, svc in result.services.items()
+        }
+
+        with self._lock:
+            if self._db.execute(
+                "SELECT 1 FROM runs WHERE run_id = ?", (result.run_id,)
+            ).fetchone():
+                return
+
+            segment, offset = self._append(record)
+            self._db.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    result.run_id, kind, scenario, result.seed, result.severity,
+                    parent_run_id, time.time(), json.dumps(services),
+                    ",".join(metrics), points, segment, offset, timeline_ticks,
+                    result.topology,
+                ),
+            )
+            self._db.commit()
+
+            self._puts += 1
+            if self._puts % _EVICT_EVERY == 0:
+                self._evict()
+
+    # -----------------------------
+    # Retention
+    # -----------------------------
+
+    def evict(self) -> int:
+        """
+        Apply the retention bounds now; returns the number of runs dropped.
+        """
+        with self._lock:
+            return self._evict()
+
+    def _evict(self) -> int:
+        """
+        Caller holds _lock. Drops the oldest runs past max_runs, then
+        whole oldest segments while the segments exceed max_bytes, then
+        deletes sealed segments with no runs left. The segment being
+        appended to is never deleted.
+        """
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            dropped = 0
+            count = self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+            if count > self.max_runs:
+                dropped += self._db.execute(
+                    "DELETE FROM runs WHERE run_id IN ("
+                    " SELECT run_id FROM runs ORDER BY created_at LIMIT ?)",
+                    (count - self.max_runs,),
+                ).rowcount
+
+            segments = self._segments()
+            sizes = {segment: os.path.getsize(self._segment_path(segment)) for segment in segments}
+            total = sum(sizes.values())
+            for segment in segments[:-1]:
+                if total <= self.max_bytes:
+                    break
+                dropped += self._db.execute(
+                    "DELETE FROM runs WHERE segment = ?", (segment,)
+                ).rowcount
+                total -= sizes[segment]
+            self._db.commit()
+
+            live = {row[0] for row in self._db.execute("SELECT DISTINCT segment FROM runs")}
+            for segment in segments[:-1]:
+                if segment not in live:
+                    os.remove(self._segment_path(segment))
+                    # Views handed out earlier keep their mapping alive
+                    with self._maps_lock:
+                        self._maps.pop(segment, None)
+            return dropped
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+
+    def get(self, run_id: str) -> Optional[StoredRun]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT run_id, kind, scenario, seed, severity, parent_run_id, created_at,"
+                " services, metrics, points, segment, offset, timeline_ticks, topology"
+                " FROM runs WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            (run_id, kind, scenario, seed, severity, parent, created_at,
+             services, metrics, points, segment, offset, timeline_ticks, topology) = row
+            metrics = metrics.split(",") if metrics else []
+            series = self._series(segment, offset, metrics, points)
+            services = json.loads(services)
+
+            timeline = None
+            if timeline_ticks:
+                timeline = self._timeline(
+                    segment,
+                    offset + len(metrics) * points * _POINT_BYTES,
+                    list(services),
+                    timeline_ticks,
+                )
+
+        result = SimulationResult(
+            services={
+                key: ServiceState(
+                    name=name,
+                    latency_ms=latency,
+                    error_rate_pct=errors,
+                    status=HealthStatus(status),
+                )
+                for key, (name, latency, errors, status) in services.items()
+            },
+            metrics=series,
+            severity=severity,
+            seed=seed,
+            run_id=run_id,
+            timeline=timeline,
+            topology=topology,
+        )
+        return StoredRun(
+            run_id=run_id,
+            kind=kind,
+            scenario=scenario,
+            seed=seed,
+            parent_run_id=parent,
+            created_at=created_at,
+            result=result,
+        )
+
+    def list(
+        self,
+        kind: Optional[str] = None,
+        scenario: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Newest runs first, metadata only.
+        """
+        where, params = self._filters(kind, scenario)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT run_id, kind, scenario, seed, severity, parent_run_id, created_at"
+                f" FROM runs{where} ORDER BY created_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+
+        keys = ("run_id", "kind", "scenario", "seed", "severity", "parent_run_id", "created_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def scan(
+        self,
+        metric: str,
+        kind: Optional[str] = None,
+        scenario: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Tuple[str, MetricSeries]]:
+        """
+        (run_id, series) for one metric across stored runs, oldest first.
+        Series are mmap views; only the metadata rows come from SQLite.
+        """
+        where, params = self._filters(kind, scenario)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT run_id, metrics, points, segment, offset FROM runs{where}"
+                " ORDER BY created_at LIMIT ?",
+                (*params, -1 if limit is None else limit),
+            ).fetchall()
+
+        for run_id, metrics, points, segment, offset in rows:
+            names = metrics.split(",")
+            if metric not in names:
+                continue
+            i = names.index(metric)
+            base = offset + i * points * _POINT_BYTES
+            buffer = self._view(segment, base, points * _POINT_BYTES)
+            yield run_id, MetricSeries(
+                np.frombuffer(buffer, _TIME_DTYPE, points, 0),
+                np.frombuffer(buffer, _VALUE_DTYPE, points, points * _TIME_DTYPE.itemsize),
+            )
+
+    def _filters(self, kind: Optional[str], scenario: Optional[str]) -> Tuple[str, Tuple]:
+        clauses, params = [], []
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if scenario is not None:
+            clauses.append("scenario = ?")
+            params.append(scenario)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), tuple(params)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+            self._lock_file.close()
+            self._maps.clear()
+
+
+_shared_store: Optional[RunStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_run_store() -> RunStore:
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = RunStore()
+        return _shared_store
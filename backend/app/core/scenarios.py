@@ -0,0 +1,137 @@
+# app/core/scenarios.py
+
+import os
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Declarative scenario definitions, loaded once at import
+SCENARIOS_FILE = os.getenv(
+    "SCENARIOS_FILE", os.path.join(os.path.dirname(__file__), "scenarios.json")
+)
+
+
+# -----------------------------
+# Compiled Scenario
+# -----------------------------
+
+@dataclass(frozen=True)
+class ScenarioProfile:
+    """
+    Severity-tiered degradation of a single target service, compiled
+    from one entry of the scenario file.
+    """
+    name: str
+    display_name: str
+    target: str
+    # Per-severity (low, high) ranges replacing the target's values
+    latency_ms: Dict[str, Tuple[float, float]]
+    error_rate_pct: Dict[str, Tuple[float, float]]
+    # Per-point (low, high) multipliers applied to metric series
+    metric_multipliers: Dict[str, Tuple[float, float]]
+    # /inject-failure: (latency_ms, error_rate_pct) added to the target,
+    # None when the scenario cannot be injected
+    injection: Optional[Tuple[float, float]] = None
+
+    # Same ranges as (tiers, 2) low / high arrays, indexed by severity
+    # code, for the vectorized batch engine
+    latency_bounds: np.ndarray = field(default=None, repr=False, compare=False)
+    error_bounds: np.ndarray = field(default=None, repr=False, compare=False)
+
+
+# -----------------------------
+# Loading
+# -----------------------------
+
+def _range(value: Any, where: str) -> Tuple[float, float]:
+    if (
+        not isinstance(value, (list, tuple))
+        or len(value) != 2
+        or not all(isinstance(v, (int, float)) for v in value)
+        or value[0] > value[1]
+    ):
+        raise ValueError(f"{where}: expected [low, high], got {value!r}")
+    return float(value[0]), float(value[1])
+
+
+def compile_scenario(
+    name: str,
+    spec: Mapping[str, Any],
+    services: Iterable[str],
+    metrics: Iterable[str],
+    tiers: Sequence[str],
+) -> ScenarioProfile:
+    """
+    Validate one scenario entry against the known services, metrics and
+    severity tiers, and precompute its lookup arrays.
+    """
+    target = spec.get("target")
+    if target not in set(services):
+        raise ValueError(f"{name}: unknown target service {target!r}")
+
+    severity = spec.get("severity") or {}
+    missing = [tier for tier in tiers if tier not in severity]
+    if missing:
+        raise ValueError(f"{name}: missing severity tiers {missing}")
+
+    latency = {
+        tier: _range(severity[tier].get("latency_ms"), f"{name}.severity.{tier}.latency_ms")
+        for tier in tiers
+    }
+    errors = {
+        tier: _range(severity[tier].get("error_rate_pct"), f"{name}.severity.{tier}.error_rate_pct")
+        for tier in tiers
+    }
+
+    known_metrics = set(metrics)
+    multipliers = {}
+    for metric, value in (spec.get("metric_multipliers") or {}).items():
+        if metric not in known_metrics:
+            raise ValueError(f"{name}: unknown metric {metric!r}")
+        multipliers[metric] = _range(value, f"{name}.metric_multipliers.{metric}")
+
+    injection = None
+    inject = spec.get("inject")
+    if inject is not None:
+        injection = (float(inject.get("latency_ms", 0.0)), float(inject.get("error_rate_pct", 0.0)))
+
+    return ScenarioProfile(
+        name=name,
+        display_name=spec.get("display_name") or name.replace("_", " ").title(),
+        target=target,
+        latency_ms=latency,
+        error_rate_pct=errors,
+        metric_multipliers=multipliers,
+        injection=injection,
+        latency_bounds=np.array([latency[tier] for tier in tiers], dtype=float),
+        error_bounds=np.array([errors[tier] for tier in tiers], dtype=float),
+    )
+
+
+def load_scenarios(
+    path: str,
+    services: Iterable[str],
+    metrics: Iterable[str],
+    tiers: Sequence[str],
+) -> Dict[str, ScenarioProfile]:
+    """
+    Read and compile every scenario in a scenario file:
+
+        {"scenarios": {"<id>": {"display_name", "target",
+                                "severity": {"<tier>": {"latency_ms": [lo, hi],
+                                                        "error_rate_pct": [lo, hi]}},
+                                "metric_multipliers": {"<metric>": [lo, hi]},
+                                "inject": {"latency_ms", "error_rate_pct"}}}}
+
+    "inject" is optional. Invalid entries fail the load (ValueError).
+    """
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+
+    services, metrics = list(services), list(metrics)
+    return {
+        name: compile_scenario(name, spec, services, metrics, tiers)
+        for name, spec in document.get("scenarios", {}).items()
+    }
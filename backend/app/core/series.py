@@ -0,0 +1,108 @@
+# app/core/series.py
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+
+_REDUCERS = {
+    "min": np.minimum.reduceat,
+    "max": np.maximum.reduceat,
+    "sum": np.add.reduceat,
+}
+
+
+class MetricSeries:
+    """
+    Columnar metric series: parallel int64 time and float64 value buffers.
+
+    Replaces the list of {"time", "value"} dicts. Conversion back to
+    points (and to Pydantic models) only happens at the API edge.
+    """
+
+    __slots__ = ("time", "values")
+
+    def __init__(self, time: Iterable[int], values: Iterable[float]):
+        self.time = np.asarray(time, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+
+        if self.time.shape != self.values.shape or self.time.ndim != 1:
+            raise ValueError("time and values must be 1-D arrays of equal length")
+
+    @classmethod
+    def from_values(cls, values: Iterable[float], start: int = 0) -> "MetricSeries":
+        values = np.asarray(values, dtype=np.float64)
+        return cls(np.arange(start, start + len(values)), values)
+
+    @classmethod
+    def from_points(cls, points: List[Dict[str, float]]) -> "MetricSeries":
+        return cls([p["time"] for p in points], [p["value"] for p in points])
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, key: Union[int, slice]):
+        """
+        Positional access: an int returns one point, a slice returns a
+        series sharing this series' buffers.
+        """
+        if isinstance(key, slice):
+            return MetricSeries(self.time[key], self.values[key])
+        return {"time": int(self.time[key]), "value": float(self.values[key])}
+
+    def __repr__(self) -> str:
+        return f"MetricSeries(len={len(self)}, values={self.values!r})"
+
+    def copy(self) -> "MetricSeries":
+        return MetricSeries(self.time.copy(), self.values.copy())
+
+    # -----------------------------
+    # Transformations
+    # -----------------------------
+
+    def scale(self, factors: Union[float, np.ndarray], integral: bool = False) -> None:
+        """
+        Multiply values in place by a scalar or a per-point factor array.
+        integral=True truncates the result (count metrics).
+        """
+        self.values *= factors
+        if integral:
+            np.trunc(self.values, out=self.values)
+
+    def between(self, start: int, end: int) -> "MetricSeries":
+        """
+        Points with start <= time < end (time must be sorted).
+        """
+        lo, hi = np.searchsorted(self.time, [start, end])
+        return self[lo:hi]
+
+    def downsample(self, bucket: int, how: str = "mean") -> "MetricSeries":
+        """
+        Aggregate consecutive groups of `bucket` points (min/max/sum/mean).
+        Each output point is stamped with its bucket's first time.
+        """
+        if bucket <= 0:
+            raise ValueError("bucket must be positive")
+        if len(self) == 0 or bucket == 1:
+            return self.copy()
+
+        starts = np.arange(0, len(self), bucket)
+
+        if how == "mean":
+            counts = np.diff(np.append(starts, len(self)))
+            values = np.add.reduceat(self.values, starts) / counts
+        elif how in _REDUCERS:
+            values = _REDUCERS[how](self.values, starts)
+        else:
+            raise ValueError(f"Unknown aggregation: {how}")
+
+        return MetricSeries(self.time[starts], values)
+
+    # -----------------------------
+    # API edge
+    # -----------------------------
+
+    def to_points(self) -> List[Dict[str, float]]:
+        return [
+            {"time": t, "value": v}
+            for t, v in zip(self.time.tolist(), self.values.tolist())
+        ]
@@ -0,0 +1,219 @@
+# app/core/session.py
+
+import os
+import time
+import secrets
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .ringbuffer import MetricHistory
+from .series import MetricSeries
+from .simulation import SimulationResult, ServiceState, WINDOW_TICKS
+from .ticker import SimulationTicker
+
+SESSION_MAX = int(os.getenv("SIM_SESSION_MAX", "256"))
+SESSION_TTL_S = float(os.getenv("SIM_SESSION_TTL_S", "900"))
+
+# Raw points kept per metric (at least `window`) and buckets per rollup.
+# ~300 KB per session at the defaults.
+SESSION_HISTORY = int(os.getenv("SIM_SESSION_HISTORY", "600"))
+SESSION_ROLLUP_BUCKETS = int(os.getenv("SIM_SESSION_ROLLUP_BUCKETS", "240"))
+
+# Upper bound for one advance (and for the window length)
+MAX_TICKS_PER_CALL = 10_000
+
+
+# Service fields as reported to clients (display precision)
+def _reported(svc: ServiceState) -> Tuple[str, float, float]:
+    return (svc.status.value, round(svc.latency_ms, 1), round(svc.error_rate_pct, 2))
+
+
+# -----------------------------
+# Delta
+# -----------------------------
+
+@dataclass
+class SessionDelta:
+    """
+    What changed in one advance of a session.
+
+    - appended: new points per metric (at most `window` of them)
+    - services: only services whose reported state changed
+    - window_start: first tick still in the window; clients drop older points
+    """
+    tick: int
+    window_start: int
+    appended: Dict[str, MetricSeries]
+    services: Dict[str, ServiceState]
+    system: SimulationResult
+
+
+# -----------------------------
+# Session
+# -----------------------------
+
+class SimulationSession:
+    """
+    A long-lived simulation run that clients poll for deltas.
+
+    Wraps a SimulationTicker: each advance generates only the new ticks
+    and appends them to a bounded MetricHistory per metric (raw ring plus
+    1 / 10 / 60 tick rollups), and services are settled once per advance
+    (for the last tick), not once per tick. Only services whose reported
+    state changed since the previous advance are returned.
+
+    The window served to clients is a zero-copy view of the newest
+    `window` raw points.
+
+    Deltas are relative to the previous advance, so a session should be
+    polled by one client.
+    """
+
+    def __init__(
+        self,
+        scenario: Optional[str],
+        seed: Optional[int] = None,
+        window: int = WINDOW_TICKS,
+        history: int = SESSION_HISTORY,
+        rollup_buckets: int = SESSION_ROLLUP_BUCKETS,
+    ):
+        if not 1 <= window <= MAX_TICKS_PER_CALL:
+            raise ValueError(f"window must be between 1 and {MAX_TICKS_PER_CALL}")
+
+        self.id = secrets.token_hex(8)
+        self.window = window
+        self.ticker = SimulationTicker(scenario, seed=seed, kind="session")
+        self.lock = threading.Lock()
+        self.last_seen = time.monotonic()
+
+        # Fill the initial window
+        result = self.ticker.advance(window)
+        self.services: Dict[str, ServiceState] = result.services
+        self.history: Dict[str, MetricHistory] = {
+            metric: MetricHistory.from_series(
+                series, capacity=max(window, history), rollup_capacity=rollup_buckets
+            )
+            for metric, series in result.metrics.items()
+        }
+        self._last_reported = {k: _reported(s) for k, s in self.services.items()}
+
+    @property
+    def tick(self) -> int:
+        return self.ticker.tick
+
+    @property
+    def metrics(self) -> Dict[str, MetricSeries]:
+        """
+        Current window per metric (views into the history rings).
+        """
+        return {metric: h.window(self.window) for metric, h in self.history.items()}
+
+    def snapshot(self) -> SimulationResult:
+        """
+        Full current state: latest services and the whole metric window.
+        """
+        return SimulationResult(
+            services=self.services,
+            metrics=self.metrics,
+            severity=self.ticker.severity,
+            seed=self.ticker.rng.seed,
+            run_id=self.ticker.run_id,
+        )
+
+    def advance(self, ticks: int = 1) -> SessionDelta:
+        if not 1 <= ticks <= MAX_TICKS_PER_CALL:
+            raise ValueError(f"ticks must be between 1 and {MAX_TICKS_PER_CALL}")
+
+        result = self.ticker.advance(ticks)
+        appended = {
+            metric: series[-self.window:] for metric, series in result.metrics.items()
+        }
+
+        for metric, series in result.metrics.items():
+            self.history[metric].extend(series)
+
+        changed: Dict[str, ServiceState] = {}
+        for key, svc in result.services.items():
+            reported = _reported(svc)
+            if reported != self._last_reported.get(key):
+                changed[key] = svc
+                self._last_reported[key] = reported
+        self.services = result.services
+
+        return SessionDelta(
+            tick=self.tick,
+            window_start=max(0, self.tick - self.window),
+            appended=appended,
+            services=changed,
+            system=self.snapshot(),
+        )
+
+
+# -----------------------------
+# Session Store
+# -----------------------------
+
+class SessionStore:
+    """
+    In-process session registry: bounded (least recently used evicted)
+    and idle sessions expire after ttl_s.
+    """
+
+    def __init__(self, max_sessions: int = SESSION_MAX, ttl_s: float = SESSION_TTL_S):
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+        self._sessions: "OrderedDict[str, SimulationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(
+        self, scenario: Optional[str], seed: Optional[int] = None, window: int = WINDOW_TICKS
+    ) -> SimulationSession:
+        session = SimulationSession(scenario, seed=seed, window=window)
+
+        with self._lock:
+            self._expire(time.monotonic())
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+        return session
+
+    def get(self, session_id: str) -> Optional[SimulationSession]:
+        now = time.monotonic()
+
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_seen = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self, now: float) -> None:
+        expired: List[str] = [
+            key for key, session in self._sessions.items()
+            if now - session.last_seen > self.ttl_s
+        ]
+        for key in expired:
+            del self._sessions[key]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+_shared_store: Optional[SessionStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = SessionStore()
+        return _shared_store
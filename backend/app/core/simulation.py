@@ -1,10 +1,25 @@
 # app/core/simulation.py
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 from dataclasses import dataclass
-import random
 
-from app.core.rules import evaluate_health, HealthStatus
-from .propagation import propagate_failures
+import numpy as np
+
+from app.core.rules import (
+    DEFAULT_THRESHOLDS,
+    STATUS_BY_CODE,
+    HealthStatus,
+    ThresholdSpec,
+    classify_health,
+)
+from .propagation import PropagationGraph, default_graph
+from .queueing import queueing_delay
+from .rng import RunRandom, make_run_id
+from .scenarios import SCENARIOS_FILE, ScenarioProfile, load_scenarios
+from .series import MetricSeries
+from .timeline import HealthTimeline
+
+if TYPE_CHECKING:
+    from .topology import Topology
 
 
 # -----------------------------
@@ -25,23 +40,178 @@ class ServiceState:
 @dataclass
 class SimulationResult:
     services: Dict[str, ServiceState]
-    metrics: Dict[str, List[Dict[str, float]]]
+    metrics: Dict[str, MetricSeries]
+    severity: Optional[str] = None
+    # Replay: the same seed (and scenario) reproduces the run exactly
+    seed: Optional[int] = None
+    run_id: Optional[str] = None
+    # Per-tick service state over the metric window (when computed)
+    timeline: Optional[HealthTimeline] = None
+    # Topology key ("<id>@<version>") it was computed with; None = default
+    topology: Optional[str] = None
+
+
+# -----------------------------
+# Simulation Profiles
+# -----------------------------
+# Shared by run_simulation and the vectorized batch engine
+# (app/core/batch.py) so both sample from the same distributions.
+
+WINDOW_TICKS = 30
+
+SEVERITY_TIERS = ("minor", "major", "critical")
+SEVERITY_WEIGHTS = (0.5, 0.35, 0.15)
+
+
+@dataclass(frozen=True)
+class ServiceProfile:
+    name: str
+    latency: Tuple[float, float]      # (base, variance) in ms
+    error_rate: Tuple[float, float]   # (base, variance) as FRACTIONS
+    # Capacity model (app/core/queueing.py): requests per second the
+    # service completes, and the share of request_volume it receives.
+    # The base latency is the per-request service time.
+    capacity_rps: float = 1000.0
+    traffic_share: float = 1.0
+
+
+SERVICE_PROFILES: Dict[str, ServiceProfile] = {
+    "api_gateway": ServiceProfile("API Gateway", (80, 20), (0.003, 0.002), 2400),                   # ~0.3%
+    "orders_service": ServiceProfile("Orders Service", (120, 30), (0.006, 0.004), 1000),            # ~0.6%
+    "database": ServiceProfile("Database", (100, 25), (0.004, 0.003), 1200),                        # ~0.4%
+    "external_dependency": ServiceProfile("External Dependency", (150, 40), (0.008, 0.005), 500, 0.3),  # ~0.8%
+}
+
+# Capacity model parameters as arrays, in SERVICE_PROFILES order
+SERVICE_CAPACITY = (
+    np.array([p.capacity_rps for p in SERVICE_PROFILES.values()]),
+    np.array([p.latency[0] for p in SERVICE_PROFILES.values()]),
+    np.array([p.traffic_share for p in SERVICE_PROFILES.values()]),
+)
+
+# Metric series sampling: (low, high, integral)
+METRIC_RANGES: Dict[str, Tuple[float, float, bool]] = {
+    "latency_ms": (90.0, 150.0, False),
+    # FRACTIONS (0–1)
+    "error_rate_pct": (0.002, 0.010, False),
+    "request_volume": (300, 600, True),
+    "queue_depth": (5, 40, True),
+}
+
+# Scenario behavior is data (scenarios.json), compiled once at import.
+# Lookups are by normalized scenario id.
+SCENARIO_PROFILES: Dict[str, ScenarioProfile] = load_scenarios(
+    SCENARIOS_FILE, SERVICE_PROFILES, METRIC_RANGES, SEVERITY_TIERS
+)
+
+# UI display name -> scenario id
+SCENARIO_DISPLAY_NAMES: Dict[str, str] = {
+    profile.display_name: name for name, profile in SCENARIO_PROFILES.items()
+}
 
 
 # -----------------------------
 # Helpers
 # -----------------------------
 
-def generate_latency(base: float, variance: float) -> float:
-    return max(0.0, random.uniform(base - variance, base + variance))
+def generate_latency(base: float, variance: float, rng: np.random.Generator) -> float:
+    return max(0.0, float(rng.uniform(base - variance, base + variance)))
 
 
-def generate_error_rate(base: float, variance: float) -> float:
+def generate_error_rate(base: float, variance: float, rng: np.random.Generator) -> float:
     """
     Error rate as FRACTION (0.0–1.0).
     Example: base=0.006 means ~0.6%
     """
-    return max(0.0, random.uniform(base - variance, base + variance))
+    return max(0.0, float(rng.uniform(base - variance, base + variance)))
+
+
+def generate_metric_series(
+    metric: str, rng: RunRandom, ticks: int = WINDOW_TICKS, start: int = 0
+) -> MetricSeries:
+    low, high, integral = METRIC_RANGES[metric]
+    gen = rng.stream("metric", metric)
+    if integral:
+        values = gen.integers(low, high, size=ticks, endpoint=True)
+    else:
+        values = np.maximum(0.0, gen.uniform(low, high, ticks))
+    return MetricSeries.from_values(values, start=start)
+
+
+def _draw_last_pair(
+    gen: np.random.Generator,
+    first: Tuple[float, float],
+    second: Tuple[float, float],
+    ticks: int,
+) -> Tuple[float, float]:
+    """
+    Last of `ticks` (first, second) uniform draws, each given as (low, high).
+
+    Rows are drawn in the same order as alternating scalar draws, so the
+    stream ends where `ticks` per-tick calls would have left it.
+    """
+    low = [first[0], second[0]]
+    high = [first[1], second[1]]
+    a, b = gen.uniform(low, high, size=(ticks, 2))[-1]
+    return float(a), float(b)
+
+
+def generate_services(rng: RunRandom, ticks: int = 1) -> Dict[str, ServiceState]:
+    """
+    Fresh baseline state for every profiled service.
+    Each service draws from its own stream.
+
+    ticks > 1 advances the streams by that many ticks at once and keeps
+    the last tick's state (same result as `ticks` separate calls).
+    """
+    services: Dict[str, ServiceState] = {}
+
+    for key, profile in SERVICE_PROFILES.items():
+        gen = rng.stream("service", key)
+        if ticks == 1:
+            latency = generate_latency(*profile.latency, gen)
+            errors = generate_error_rate(*profile.error_rate, gen)   # FRACTION (0–1)
+        else:
+            (lat_base, lat_var), (err_base, err_var) = profile.latency, profile.error_rate
+            latency, errors = _draw_last_pair(
+                gen,
+                (lat_base - lat_var, lat_base + lat_var),
+                (err_base - err_var, err_base + err_var),
+                ticks,
+            )
+            latency, errors = max(0.0, latency), max(0.0, errors)
+
+        services[key] = ServiceState(
+            name=profile.name,
+            latency_ms=latency,
+            error_rate_pct=errors,
+            status=HealthStatus.HEALTHY,
+        )
+
+    classify_services(services)
+    return services
+
+
+def classify_services(
+    services: Dict[str, ServiceState], thresholds: ThresholdSpec = DEFAULT_THRESHOLDS
+) -> None:
+    """
+    Re-evaluate every service's status with one classify_health call.
+    thresholds may be one per service, in `services` order.
+    """
+    states = list(services.values())
+    codes = classify_health(
+        [svc.latency_ms for svc in states],
+        [svc.error_rate_pct for svc in states],
+        thresholds,
+    )
+    for svc, code in zip(states, codes.tolist()):
+        svc.status = STATUS_BY_CODE[code]
+
+
+def draw_severity(rng: RunRandom) -> str:
+    index = rng.stream("severity").choice(len(SEVERITY_TIERS), p=SEVERITY_WEIGHTS)
+    return SEVERITY_TIERS[index]
 
 
 def normalize_scenario(s: Optional[str]) -> Optional[str]:
@@ -54,14 +224,8 @@ def normalize_scenario(s: Optional[str]) -> Optional[str]:
     if not s:
         return None
 
-    mapping = {
-        "Database Latency Spike": "database_latency_spike",
-        "External Dependency Degradation": "external_dependency_degradation",
-        "Retry Amplification": "retry_amplification",
-    }
-
-    if s in mapping:
-        return mapping[s]
+    if s in SCENARIO_DISPLAY_NAMES:
+        return SCENARIO_DISPLAY_NAMES[s]
 
     # best-effort normalization
     lowered = s.strip().lower().replace(" ", "_")
@@ -72,184 +236,259 @@ def normalize_scenario(s: Optional[str]) -> Optional[str]:
 # Baseline Simulation
 # -----------------------------
 
-def run_baseline_simulation() -> SimulationResult:
+def run_baseline_simulation(seed: Optional[int] = None) -> SimulationResult:
     """
-    Clean, healthy baseline (fresh data every run).
+    Clean, healthy baseline (fresh data every run unless seeded).
     """
 
-    services: Dict[str, ServiceState] = {}
+    rng = RunRandom(seed)
+    result = _baseline(rng)
+    apply_queueing(result, timeline=True)
+    result.run_id = make_run_id("baseline", None, rng.seed)
+    return result
 
-    api_latency = generate_latency(80, 20)
-    orders_latency = generate_latency(120, 30)
-    db_latency = generate_latency(100, 25)
-    external_latency = generate_latency(150, 40)
-
-    # FRACTIONS (0–1)
-    api_errors = generate_error_rate(0.003, 0.002)       # ~0.3%
-    orders_errors = generate_error_rate(0.006, 0.004)    # ~0.6%
-    db_errors = generate_error_rate(0.004, 0.003)        # ~0.4%
-    external_errors = generate_error_rate(0.008, 0.005)  # ~0.8%
-
-    services["api_gateway"] = ServiceState(
-        name="API Gateway",
-        latency_ms=api_latency,
-        error_rate_pct=api_errors,
-        status=evaluate_health(api_latency, api_errors),
-    )
-
-    services["orders_service"] = ServiceState(
-        name="Orders Service",
-        latency_ms=orders_latency,
-        error_rate_pct=orders_errors,
-        status=evaluate_health(orders_latency, orders_errors),
-    )
-
-    services["database"] = ServiceState(
-        name="Database",
-        latency_ms=db_latency,
-        error_rate_pct=db_errors,
-        status=evaluate_health(db_latency, db_errors),
-    )
-
-    services["external_dependency"] = ServiceState(
-        name="External Dependency",
-        latency_ms=external_latency,
-        error_rate_pct=external_errors,
-        status=evaluate_health(external_latency, external_errors),
-    )
 
+def _baseline(rng: RunRandom) -> SimulationResult:
+    services = generate_services(rng)
     metrics = {
-        "latency_ms": [{"time": i, "value": generate_latency(120, 30)} for i in range(30)],
-        # FRACTIONS (0–1)
-        "error_rate_pct": [{"time": i, "value": generate_error_rate(0.006, 0.004)} for i in range(30)],
-        "request_volume": [{"time": i, "value": random.randint(300, 600)} for i in range(30)],
-        "queue_depth": [{"time": i, "value": random.randint(5, 40)} for i in range(30)],
+        metric: generate_metric_series(metric, rng) for metric in METRIC_RANGES
     }
 
-    return SimulationResult(services=services, metrics=metrics)
+    return SimulationResult(services=services, metrics=metrics, seed=rng.seed)
 
 
 # -----------------------------
 # Scenario-Aware Simulation
 # -----------------------------
 
-def run_simulation(scenario: Optional[str]) -> SimulationResult:
+def run_simulation(
+    scenario: Optional[str],
+    seed: Optional[int] = None,
+    topology: Optional["Topology"] = None,
+) -> SimulationResult:
     """
     Scenario-aware simulation with severity tiers.
 
-    scenario values expected (enum):
-      - database_latency_spike
-      - external_dependency_degradation
-      - retry_amplification
+    scenario values expected: ids from scenarios.json (SCENARIO_PROFILES),
+    e.g. database_latency_spike. We also accept UI display strings and
+    normalize them. Unknown scenarios draw a severity but degrade nothing.
 
-    We also accept UI display strings and normalize them.
+    topology selects the dependency graph (default: the registry's
+    default topology). Pass the returned seed back in to replay a run
+    exactly.
     """
 
-    result = run_baseline_simulation()
+    rng = RunRandom(seed)
+    result = _baseline(rng)
 
     scenario_norm = normalize_scenario(scenario)
+    run_key = None
+    if topology is not None:
+        result.topology = topology.key
+        run_key = topology.run_key
+    result.run_id = make_run_id("simulate", scenario_norm, rng.seed, topology=run_key)
     if not scenario_norm:
+        apply_queueing(result, timeline=True)
         return result
 
-    severity = random.choices(
-        ["minor", "major", "critical"],
-        weights=[0.5, 0.35, 0.15],
-        k=1,
-    )[0]
+    severity = draw_severity(rng)
+    result.severity = severity
 
     # -----------------------------
-    # Database Latency Spike
+    # Scenario Degradation
     # -----------------------------
-    if scenario_norm == "database_latency_spike":
-        db = result.services["database"]
-
-        if severity == "minor":
-            db.latency_ms = random.uniform(400, 700)
-            db.error_rate_pct = random.uniform(0.015, 0.035)   # 1.5%–3.5%
-        elif severity == "major":
-            db.latency_ms = random.uniform(800, 1200)
-            db.error_rate_pct = random.uniform(0.040, 0.065)   # 4.0%–6.5%
-        else:  # critical
-            db.latency_ms = random.uniform(1300, 1800)
-            db.error_rate_pct = random.uniform(0.070, 0.100)   # 7%–10%
-
-        for p in result.metrics["queue_depth"]:
-            p["value"] = int(p["value"] * random.uniform(1.5, 3.0))
-
-        for p in result.metrics["latency_ms"]:
-            p["value"] *= random.uniform(1.2, 1.8)
-
-        for p in result.metrics["error_rate_pct"]:
-            p["value"] *= random.uniform(1.5, 4.0)
+    profile = SCENARIO_PROFILES.get(scenario_norm)
+    base = None
+    if profile is not None:
+        target = result.services[profile.target]
+        healthy = (target.latency_ms, target.error_rate_pct)
+        degrade_target(result.services, profile, severity, rng)
+        apply_metric_multipliers(result.metrics, profile, rng)
+        base = onset_timeline(
+            result.services, profile.target, healthy, rng, len(result.metrics["request_volume"])
+        )
+
+    # Load (request_volume, after any retry amplification) -> queueing
+    apply_queueing(result, timeline=True, base=base)
+
+    settle_services(
+        result,
+        topology.graph_for(tuple(result.services)) if topology is not None else None,
+    )
 
-    # -----------------------------
-    # External Dependency Degradation
-    # -----------------------------
-    elif scenario_norm == "external_dependency_degradation":
-        ext = result.services["external_dependency"]
+    return result
 
-        if severity == "minor":
-            ext.latency_ms = random.uniform(350, 600)
-            ext.error_rate_pct = random.uniform(0.015, 0.030)
-        elif severity == "major":
-            ext.latency_ms = random.uniform(650, 950)
-            ext.error_rate_pct = random.uniform(0.035, 0.060)
-        else:  # critical
-            ext.latency_ms = random.uniform(1000, 1400)
-            ext.error_rate_pct = random.uniform(0.065, 0.090)
 
-        for p in result.metrics["latency_ms"]:
-            p["value"] *= random.uniform(1.2, 1.6)
+# -----------------------------
+# Scenario Steps
+# -----------------------------
 
-        for p in result.metrics["error_rate_pct"]:
-            p["value"] *= random.uniform(1.5, 3.5)
+def degrade_target(
+    services: Dict[str, ServiceState],
+    profile: ScenarioProfile,
+    severity: str,
+    rng: RunRandom,
+    ticks: int = 1,
+) -> None:
+    """
+    Replace the target service's latency / errors with severity-tier values.
+    ticks > 1 keeps the last of that many per-tick draws.
+    """
+    gen = rng.stream("scenario", profile.target)
+    target = services[profile.target]
+    if ticks == 1:
+        target.latency_ms = float(gen.uniform(*profile.latency_ms[severity]))
+        target.error_rate_pct = float(gen.uniform(*profile.error_rate_pct[severity]))
+    else:
+        target.latency_ms, target.error_rate_pct = _draw_last_pair(
+            gen, profile.latency_ms[severity], profile.error_rate_pct[severity], ticks
+        )
+
+
+def onset_timeline(
+    services: Dict[str, ServiceState],
+    target: str,
+    healthy: Tuple[float, float],
+    rng: RunRandom,
+    ticks: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-tick (latency, errors), (ticks, services), of a scenario run
+    before queueing. Every service holds its current value except the
+    target, which stays at its `healthy` (pre-degradation) values until
+    an onset tick, then ramps linearly to its degraded values over a few
+    ticks; the last tick is the services' current state.
+
+    Onset and ramp come from their own stream, so seeded runs replay and
+    no other draw moves.
+    """
+    gen = rng.stream("onset", target)
+    onset = int(gen.integers(1, max(1, ticks // 2), endpoint=True)) if ticks > 1 else 0
+    ramp = int(gen.integers(0, max(0, min(ticks // 4, ticks - 1 - onset)), endpoint=True))
 
-    # -----------------------------
-    # Retry Amplification
-    # -----------------------------
-    elif scenario_norm == "retry_amplification":
-        orders = result.services["orders_service"]
+    states = list(services.values())
+    latency = np.tile([svc.latency_ms for svc in states], (ticks, 1))
+    errors = np.tile([svc.error_rate_pct for svc in states], (ticks, 1))
 
-        if severity == "minor":
-            orders.latency_ms = random.uniform(350, 600)
-            orders.error_rate_pct = random.uniform(0.020, 0.040)
-        elif severity == "major":
-            orders.latency_ms = random.uniform(650, 950)
-            orders.error_rate_pct = random.uniform(0.045, 0.070)
-        else:  # critical
-            orders.latency_ms = random.uniform(1000, 1500)
-            orders.error_rate_pct = random.uniform(0.075, 0.100)
+    # Written from the degraded end, so full intensity is exact
+    j = list(services).index(target)
+    remaining = 1.0 - np.clip((np.arange(ticks) - onset + 1) / (ramp + 1), 0.0, 1.0)
+    latency[:, j] -= remaining * (latency[-1, j] - healthy[0])
+    errors[:, j] -= remaining * (errors[-1, j] - healthy[1])
+    return latency, errors
 
-        for p in result.metrics["request_volume"]:
-            p["value"] = int(p["value"] * random.uniform(1.4, 2.5))
 
-        for p in result.metrics["queue_depth"]:
-            p["value"] = int(p["value"] * random.uniform(1.8, 3.5))
+def apply_metric_multipliers(
+    metrics: Dict[str, MetricSeries], profile: ScenarioProfile, rng: RunRandom
+) -> None:
+    """
+    Scale each affected series by an independent per-point factor.
+    """
+    for metric, (low, high) in profile.metric_multipliers.items():
+        series = metrics[metric]
+        series.scale(
+            rng.stream("multiplier", metric).uniform(low, high, len(series)),
+            integral=METRIC_RANGES[metric][2],
+        )
+
+
+def apply_queueing(
+    result: SimulationResult,
+    backlog: Optional[np.ndarray] = None,
+    timeline: bool = False,
+    base: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Add each service's queueing delay under the window's request_volume
+    (see queueing_delay):
+    - services: the last tick's delay is added to latency_ms
+    - latency_ms metric: + end-to-end delay per tick (share-weighted sum)
+    - queue_depth metric: + total backlog per tick
+
+    Service health is re-evaluated. backlog carries queued requests in
+    from a previous window (tickers); the backlog after the last tick is
+    returned.
+
+    timeline=True also sets result.timeline: every tick's state is `base`
+    (per-tick latency, errors before queueing, e.g. onset_timeline;
+    default: the services' current values throughout) plus that tick's
+    delay.
+    """
+    volume = result.metrics["request_volume"]
+    capacity, service_ms, share = SERVICE_CAPACITY
+    wait_ms, queue = queueing_delay(volume.values, capacity, service_ms, share, backlog)
+
+    if timeline:
+        if base is None:
+            services = result.services.values()
+            base = (
+                np.tile([svc.latency_ms for svc in services], (len(wait_ms), 1)),
+                np.tile([svc.error_rate_pct for svc in services], (len(wait_ms), 1)),
+            )
+        result.timeline = HealthTimeline.classify(
+            list(result.services), volume.time.copy(), base[0] + wait_ms, base[1]
+        )
+
+    for svc, wait in zip(result.services.values(), wait_ms[-1].tolist()):
+        svc.latency_ms += wait
+    classify_services(result.services)
+
+    latency = result.metrics.get("latency_ms")
+    if latency is not None:
+        latency.values += wait_ms @ share
+    depth = result.metrics.get("queue_depth")
+    if depth is not None:
+        depth.values += np.trunc(queue.sum(axis=1))
+
+    return queue[-1]
+
+
+def settle_services(
+    result: SimulationResult, graph: Optional[PropagationGraph] = None
+) -> None:
+    """
+    Health pass 1, dependency propagation, error clamp, health pass 2,
+    on arrays over all services at once. graph defaults to the default
+    topology's.
 
-        for p in result.metrics["error_rate_pct"]:
-            p["value"] *= random.uniform(1.8, 4.0)
+    With a timeline, every tick is settled in the same pass and the
+    services take the last tick's state.
+    """
+    services = list(result.services.values())
+    timeline = result.timeline
+    if timeline is not None:
+        latency, errors = timeline.latency_ms, timeline.error_rate_pct
+    else:
+        latency = np.array([[svc.latency_ms for svc in services]])
+        errors = np.array([[svc.error_rate_pct for svc in services]])
 
     # -----------------------------
     # Health Evaluation — PASS 1
     # -----------------------------
-    for svc in result.services.values():
-        svc.status = evaluate_health(svc.latency_ms, svc.error_rate_pct)
+    status = classify_health(latency, errors)
 
     # -----------------------------
     # Dependency Propagation
     # -----------------------------
-    propagate_failures(result)
+    if graph is None:
+        graph = default_graph(tuple(result.services))
+    graph.propagate(latency, errors, status)
 
     # -----------------------------
     # Clamp error rate (fraction)
     # -----------------------------
-    for svc in result.services.values():
-        svc.error_rate_pct = min(max(svc.error_rate_pct, 0.0), 0.15)  # cap at 15%
+    np.clip(errors, 0.0, 0.15, out=errors)  # cap at 15%
 
     # -----------------------------
     # Health Evaluation — PASS 2
     # -----------------------------
-    for svc in result.services.values():
-        svc.status = evaluate_health(svc.latency_ms, svc.error_rate_pct)
-
-    return result
\ No newline at end of file
+    status = classify_health(latency, errors)
+    if timeline is not None:
+        timeline.status = status
+
+    for svc, lat, err, code in zip(
+        services, latency[-1].tolist(), errors[-1].tolist(), status[-1].tolist()
+    ):
+        svc.latency_ms = lat
+        svc.error_rate_pct = err
+        svc.status = STATUS_BY_CODE[code]
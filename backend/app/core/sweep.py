@@ -0,0 +1,253 @@
+# app/core/sweep.py
+import os
+import sys
+import json
+import argparse
+import itertools
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.rules import STATUS_BY_CODE, THRESHOLD_SETS
+from .batch import run_simulation_batch
+from .failures import FailureScenario
+from .rng import new_seed, derive_seed
+from .simulation import SERVICE_PROFILES, SEVERITY_TIERS
+
+DEFAULT_RUNS_PER_CELL = 10_000
+DEFAULT_CHUNK_SIZE = 5_000
+
+# Processes in the shared sweep pool (get_sweep_pool)
+SWEEP_WORKERS = int(os.getenv("SWEEP_WORKERS", str(os.cpu_count() or 1)))
+
+# (scenario, severity, threshold set name)
+SweepCell = Tuple[str, str, str]
+
+ProgressCallback = Callable[[int, int], None]
+
+
+# -----------------------------
+# Worker
+# -----------------------------
+
+def _run_chunk(cell: SweepCell, n: int, seed: int) -> np.ndarray:
+    """
+    Status counts for one chunk of one cell: (services + system, statuses).
+    Runs in a worker process, so only small count arrays cross the pipe.
+    """
+    scenario, severity, thresholds = cell
+    batch = run_simulation_batch(
+        scenario,
+        n,
+        seed=seed,
+        include_metrics=False,
+        severity=severity,
+        thresholds=THRESHOLD_SETS[thresholds],
+    )
+
+    codes = np.column_stack([batch.status, batch.system_mode()])
+    counts = np.zeros((codes.shape[1], len(STATUS_BY_CODE)), dtype=np.int64)
+    for j in range(codes.shape[1]):
+        counts[j] = np.bincount(codes[:, j], minlength=len(STATUS_BY_CODE))
+    return counts
+
+
+# -----------------------------
+# Sweep
+# -----------------------------
+
+def run_sweep(
+    scenarios: Optional[Sequence[str]] = None,
+    severities: Optional[Sequence[str]] = None,
+    threshold_sets: Optional[Sequence[str]] = None,
+    runs_per_cell: int = DEFAULT_RUNS_PER_CELL,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    pool: Optional[Executor] = None,
+    max_runs: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Sweep scenario × severity tier × threshold set over many seeds.
+
+    Each cell's runs are split into chunks of chunk_size and fanned out
+    over a process pool; every chunk gets a seed derived from (seed, cell,
+    chunk), so results do not depend on worker count or scheduling.
+
+    pool: executor to run chunks on (e.g. get_sweep_pool()); by default a
+    process pool of `workers` is started for this sweep. Either way at
+    most `workers` chunks are in flight at once.
+    max_runs: reject grids of more runs in total (ValueError).
+
+    Returns outcome matrices indexed [scenario][severity][thresholds]
+    [service], e.g. p_unhealthy = probability a service ends unhealthy.
+    progress(done_chunks, total_chunks) is called as chunks finish.
+    """
+
+    scenarios = list(scenarios or [s.value for s in FailureScenario])
+    severities = list(severities or SEVERITY_TIERS)
+    threshold_sets = list(threshold_sets or THRESHOLD_SETS)
+
+    for tier in severities:
+        if tier not in SEVERITY_TIERS:
+            raise ValueError(f"Unknown severity tier: {tier}")
+    for name in threshold_sets:
+        if name not in THRESHOLD_SETS:
+            raise ValueError(f"Unknown threshold set: {name}")
+    if runs_per_cell <= 0 or chunk_size <= 0:
+        raise ValueError("runs_per_cell and chunk_size must be positive")
+
+    seed = new_seed() if seed is None else seed
+    columns = list(SERVICE_PROFILES) + ["system"]
+
+    cells: List[SweepCell] = [
+        (scenario, severity, thresholds)
+        for scenario in scenarios
+        for severity in severities
+        for thresholds in threshold_sets
+    ]
+    if max_runs is not None and len(cells) * runs_per_cell > max_runs:
+        raise ValueError(
+            f"Sweep of {len(cells)} cells x {runs_per_cell} runs exceeds {max_runs} runs"
+        )
+    chunks = [
+        (c, chunk, min(chunk_size, runs_per_cell - start))
+        for c in range(len(cells))
+        for chunk, start in enumerate(range(0, runs_per_cell, chunk_size))
+    ]
+
+    counts = np.zeros((len(cells), len(columns), len(STATUS_BY_CODE)), dtype=np.int64)
+
+    own_pool = pool is None
+    if own_pool:
+        pool = ProcessPoolExecutor(max_workers=workers)
+
+    queued = iter(chunks)
+    pending: Dict[Any, int] = {}
+
+    def submit(limit: int) -> None:
+        for c, chunk, n in itertools.islice(queued, limit):
+            pending[pool.submit(_run_chunk, cells[c], n, derive_seed(seed, c, chunk))] = c
+
+    try:
+        submit(workers or len(chunks))
+        done = 0
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                counts[pending.pop(future)] += future.result()
+                done += 1
+                if progress is not None:
+                    progress(done, len(chunks))
+            submit(len(finished))
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+        else:
+            for future in pending:
+                future.cancel()
+
+    # cell axis → (scenario, severity, thresholds) grid
+    shape = (len(scenarios), len(severities), len(threshold_sets), len(columns))
+    probabilities = counts / runs_per_cell
+
+    return {
+        "seed": seed,
+        "runs_per_cell": runs_per_cell,
+        "axes": {
+            "scenario": scenarios,
+            "severity": severities,
+            "thresholds": threshold_sets,
+            "service": columns,
+        },
+        **{
+            f"p_{status.value}": probabilities[:, :, k].reshape(shape).round(6).tolist()
+            for k, status in enumerate(STATUS_BY_CODE)
+        },
+    }
+
+
+# -----------------------------
+# Shared Pool
+# -----------------------------
+
+_shared_pool: Optional[ProcessPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+
+def get_sweep_pool() -> ProcessPoolExecutor:
+    """
+    One process pool for every sweep request, so concurrent requests
+    share SWEEP_WORKERS processes instead of forking their own.
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = ProcessPoolExecutor(max_workers=SWEEP_WORKERS)
+        return _shared_pool
+
+
+def discard_sweep_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a broken pool (a worker died); the next sweep starts a new one.
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is pool:
+            _shared_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_sweep_pool() -> None:
+    global _shared_pool
+    with _shared_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Sweep failure scenarios × severity × threshold sets."
+    )
+    parser.add_argument("--scenario", action="append", dest="scenarios")
+    parser.add_argument("--severity", action="append", dest="severities")
+    parser.add_argument("--thresholds", action="append", dest="threshold_sets")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS_PER_CELL)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    def report(done: int, total: int) -> None:
+        print(f"\r{done}/{total} chunks", end="", file=sys.stderr, flush=True)
+
+    result = run_sweep(
+        scenarios=args.scenarios,
+        severities=args.severities,
+        threshold_sets=args.threshold_sets,
+        runs_per_cell=args.runs,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        seed=args.seed,
+        progress=report,
+    )
+    print(file=sys.stderr)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+    else:
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
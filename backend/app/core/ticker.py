@@ -0,0 +1,82 @@
+# app/core/ticker.py
+from typing import Optional
+
+from .rng import RunRandom, make_run_id
+from .simulation import (
+    SimulationResult,
+    METRIC_RANGES,
+    SCENARIO_PROFILES,
+    normalize_scenario,
+    draw_severity,
+    generate_services,
+    generate_metric_series,
+    degrade_target,
+    apply_metric_multipliers,
+    apply_queueing,
+    settle_services,
+)
+
+
+class SimulationTicker:
+    """
+    Advances one scenario run a tick at a time.
+
+    The severity tier is drawn once, so every tick belongs to the same
+    incident. Named RNG streams continue across ticks, so a seeded ticker
+    replays the same tick sequence. Each tick re-samples service noise,
+    re-applies the scenario, and produces one new point per metric —
+    O(services + metrics) work, independent of how long the stream has
+    been running. Queued requests (the capacity model's backlog) carry
+    over from tick to tick.
+    """
+
+    def __init__(
+        self, scenario: Optional[str], seed: Optional[int] = None, kind: str = "stream"
+    ):
+        self.rng = RunRandom(seed)
+        self.scenario = normalize_scenario(scenario)
+        self.profile = SCENARIO_PROFILES.get(self.scenario) if self.scenario else None
+        self.severity = draw_severity(self.rng) if self.scenario else None
+        self.run_id = make_run_id(kind, self.scenario, self.rng.seed)
+        self.tick = 0
+        # Requests still queued per service, carried across ticks
+        self.backlog = None
+
+    def advance(self, ticks: int = 1) -> SimulationResult:
+        """
+        Compute the next `ticks` ticks: the service states after the last
+        of them plus a `ticks`-point series per metric, stamped with the
+        tick numbers.
+
+        Intermediate service states are drawn in bulk but never settled,
+        so advance(k) costs one health / propagation pass and yields the
+        same values as k calls to advance().
+        """
+        if ticks <= 0:
+            raise ValueError("ticks must be positive")
+
+        result = SimulationResult(
+            services=generate_services(self.rng, ticks=ticks),
+            metrics={
+                metric: generate_metric_series(
+                    metric, self.rng, ticks=ticks, start=self.tick
+                )
+                for metric in METRIC_RANGES
+            },
+            severity=self.severity,
+            seed=self.rng.seed,
+            run_id=self.run_id,
+        )
+
+        if self.profile is not None:
+            degrade_target(
+                result.services, self.profile, self.severity, self.rng, ticks=ticks
+            )
+            apply_metric_multipliers(result.metrics, self.profile, self.rng)
+
+        self.backlog = apply_queueing(result, self.backlog)
+        if self.scenario:
+            settle_services(result)
+
+        self.tick += ticks
+        return result
@@ -0,0 +1,132 @@
+# app/core/timeline.py
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.rules import DEFAULT_THRESHOLDS, STATUS_BY_CODE, ThresholdSpec, classify_health
+
+
+# -----------------------------
+# Health Timeline
+# -----------------------------
+
+@dataclass
+class HealthTimeline:
+    """
+    Per-tick state of every service over a run's window.
+
+    Arrays are (ticks, services), columns in `service_keys` order; `time`
+    holds the tick stamps of the run's metric series. The last row is the
+    run's reported service state.
+    """
+    service_keys: List[str]
+    time: np.ndarray            # (ticks,)
+    latency_ms: np.ndarray
+    error_rate_pct: np.ndarray
+    status: np.ndarray          # int8 codes (see STATUS_BY_CODE)
+
+    @classmethod
+    def classify(
+        cls,
+        service_keys: List[str],
+        time: np.ndarray,
+        latency_ms: np.ndarray,
+        error_rate_pct: np.ndarray,
+        thresholds: ThresholdSpec = DEFAULT_THRESHOLDS,
+    ) -> "HealthTimeline":
+        return cls(
+            service_keys=list(service_keys),
+            time=np.asarray(time),
+            latency_ms=latency_ms,
+            error_rate_pct=error_rate_pct,
+            status=classify_health(latency_ms, error_rate_pct, thresholds),
+        )
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def copy(self) -> "HealthTimeline":
+        """
+        Writable copy (stored timelines are read-only views).
+        """
+        return HealthTimeline(
+            service_keys=list(self.service_keys),
+            time=self.time.copy(),
+            latency_ms=self.latency_ms.copy(),
+            error_rate_pct=self.error_rate_pct.copy(),
+            status=self.status.copy(),
+        )
+
+    def column(self, key: str) -> int:
+        return self.service_keys.index(key)
+
+    def stats(self) -> Dict[str, np.ndarray]:
+        """
+        Transition statistics per service, as arrays over services, all in
+        the time units of `time` (ticks are one unit apart):
+
+        - time_to_degraded / time_to_unhealthy: from the first tick to the
+          first tick at DEGRADED-or-worse / UNHEALTHY (NaN: never)
+        - time_in_state: (services, 3) ticks spent per status code
+        - recovery_time: from the first degradation to the next HEALTHY
+          tick (NaN: never degraded, or not recovered by the window's end)
+
+        Each is a handful of reductions over the status codes, so long
+        windows cost O(ticks * services) with no Python loop.
+        """
+        # (services, ticks): every reduction below runs along contiguous rows
+        codes = np.ascontiguousarray(self.status.T)
+        services, ticks = codes.shape
+        rows = np.arange(services)
+        offset = (self.time - self.time[0]).astype(float)
+
+        def first(mask: np.ndarray) -> np.ndarray:
+            index = mask.argmax(axis=1)
+            return np.where(mask[rows, index], offset[index], np.nan)
+
+        degraded = codes > 0
+        unhealthy = codes > 1
+        time_to_degraded = first(degraded)
+        time_to_unhealthy = first(unhealthy)
+
+        # First HEALTHY tick after each service's first degradation
+        onset = degraded.argmax(axis=1)
+        recovered = ~degraded
+        recovered &= np.arange(ticks) > onset[:, None]
+        recovery_time = first(recovered) - time_to_degraded
+
+        n_degraded = degraded.sum(axis=1)
+        n_unhealthy = unhealthy.sum(axis=1)
+        time_in_state = np.stack(
+            [ticks - n_degraded, n_degraded - n_unhealthy, n_unhealthy], axis=1
+        )
+
+        return {
+            "time_to_degraded": time_to_degraded,
+            "time_to_unhealthy": time_to_unhealthy,
+            "time_in_state": time_in_state,
+            "recovery_time": recovery_time,
+        }
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        stats() as plain data keyed by service (NaN -> None).
+        """
+        stats = self.stats()
+
+        def value(x: float) -> Optional[float]:
+            return None if np.isnan(x) else x
+
+        summary = {}
+        for j, key in enumerate(self.service_keys):
+            summary[key] = {
+                "time_to_degraded": value(stats["time_to_degraded"][j].item()),
+                "time_to_unhealthy": value(stats["time_to_unhealthy"][j].item()),
+                "time_in_state": {
+                    status.value: count
+                    for status, count in zip(STATUS_BY_CODE, stats["time_in_state"][j].tolist())
+                },
+                "recovery_time": value(stats["recovery_time"][j].item()),
+            }
+        return summary
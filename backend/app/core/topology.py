@@ -0,0 +1,371 @@
+# app/core/topology.py
+
+import os
+import json
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .propagation import DEFAULT_IMPACT, EdgeImpact, PropagationGraph
+from .runstore import RUN_STORE_DIR
+from .simulation import SERVICE_PROFILES
+
+# Built-in topologies, loaded once at import of the registry
+TOPOLOGIES_FILE = os.getenv(
+    "TOPOLOGIES_FILE", os.path.join(os.path.dirname(__file__), "topologies.json")
+)
+# Uploaded versions (one JSON document per line), replayed on startup so
+# stored runs keep resolving their topology
+TOPOLOGY_UPLOADS_FILE = os.getenv(
+    "TOPOLOGY_UPLOADS_FILE", os.path.join(RUN_STORE_DIR, "topologies.jsonl")
+)
+
+DEFAULT_TOPOLOGY = "default"
+
+MAX_TOPOLOGIES = int(os.getenv("MAX_TOPOLOGIES", "256"))
+MAX_TOPOLOGY_VERSIONS = int(os.getenv("MAX_TOPOLOGY_VERSIONS", "64"))
+
+
+# -----------------------------
+# Compiled Topology
+# -----------------------------
+
+def _freeze(*arrays: np.ndarray) -> None:
+    for array in arrays:
+        array.setflags(write=False)
+
+
+@dataclass(frozen=True)
+class Topology:
+    """
+    One version of a service topology, compiled once and never modified.
+
+    - graph: the PropagationGraph over `services` (service-index map,
+      topological order and levels, edge index arrays); path queries
+      index it once (see blast_radius.graph_index)
+    - document: the serialized spec, encoded once per version and served
+      as is
+    """
+    id: str
+    version: int
+    display_name: str
+    services: Tuple[str, ...]
+    # (source, target): source depends on target
+    dependencies: Tuple[Tuple[str, str], ...]
+    impacts: Mapping[Tuple[str, str], EdgeImpact]
+    default_impact: EdgeImpact
+    # The registry's built-in default; its runs keep unqualified run ids
+    default: bool = False
+
+    graph: PropagationGraph = field(default=None, repr=False, compare=False)
+
+    spec: Mapping[str, Any] = field(default=None, repr=False, compare=False)
+    document: bytes = field(default=b"", repr=False, compare=False)
+    # {"source", "target"} per edge, shared by every response (read-only)
+    dependency_nodes: Tuple[Dict[str, str], ...] = field(default=(), repr=False, compare=False)
+
+    _graphs: Dict[Tuple[str, ...], PropagationGraph] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    @property
+    def key(self) -> str:
+        return f"{self.id}@{self.version}"
+
+    @property
+    def run_key(self) -> Optional[str]:
+        """
+        Topology part of run ids (None for the built-in default).
+        """
+        return None if self.default else self.key
+
+    @property
+    def index(self) -> Dict[str, int]:
+        return self.graph.index
+
+    @property
+    def order(self) -> np.ndarray:
+        return self.graph.order
+
+    def graph_for(self, service_keys: Sequence[str]) -> PropagationGraph:
+        """
+        This topology's graph over `service_keys`, in that order (the
+        column order of the state arrays), restricted to the services
+        present. Compiled once per key order.
+        """
+        service_keys = tuple(service_keys)
+        graph = self._graphs.get(service_keys)
+        if graph is None:
+            if service_keys == self.services:
+                graph = self.graph
+            else:
+                present = set(service_keys)
+                graph = PropagationGraph(
+                    service_keys,
+                    [
+                        (source, target)
+                        for source, target in self.dependencies
+                        if source in present and target in present
+                    ],
+                    impacts=dict(self.impacts),
+                    default_impact=self.default_impact,
+                )
+            # Racing threads compile equal graphs; either one may be kept
+            self._graphs[service_keys] = graph
+        return graph
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "version": self.version,
+            "display_name": self.display_name,
+            "services": list(self.services),
+        }
+
+
+# -----------------------------
+# Compilation
+# -----------------------------
+
+def _impact(value: Any, where: str) -> Tuple[float, float]:
+    if (
+        not isinstance(value, (list, tuple))
+        or len(value) != 2
+        or not all(isinstance(v, (int, float)) for v in value)
+    ):
+        raise ValueError(f"{where}: expected [latency_ms, error_rate_pct], got {value!r}")
+    return float(value[0]), float(value[1])
+
+
+def _edge_impact(spec: Mapping[str, Any], fallback: EdgeImpact, where: str) -> EdgeImpact:
+    return EdgeImpact(
+        degraded=_impact(spec["degraded"], f"{where}.degraded") if "degraded" in spec else fallback.degraded,
+        unhealthy=_impact(spec["unhealthy"], f"{where}.unhealthy") if "unhealthy" in spec else fallback.unhealthy,
+    )
+
+
+def compile_topology(
+    topology_id: str,
+    spec: Mapping[str, Any],
+    version: int = 1,
+    known_services: Optional[Iterable[str]] = None,
+    default: bool = False,
+) -> Topology:
+    """
+    Validate one topology entry and compile it:
+
+        {"display_name", "services": ["<id>", ...],
+         "default_impact": {"degraded": [ms, pct], "unhealthy": [ms, pct]},
+         "dependencies": [{"source", "target", "degraded", "unhealthy",
+                           "description"}, ...]}
+
+    Impacts are optional (default_impact, then DEFAULT_IMPACT). Services
+    must be unique (and in known_services, when given); edges must join
+    listed services and form a DAG. Invalid entries raise ValueError.
+    """
+    services = spec.get("services")
+    if (
+        not isinstance(services, list)
+        or not services
+        or not all(isinstance(s, str) and s for s in services)
+    ):
+        raise ValueError(f"{topology_id}: services must be a non-empty list of ids")
+    if len(set(services)) != len(services):
+        raise ValueError(f"{topology_id}: duplicate services")
+    if known_services is not None:
+        unknown = sorted(set(services) - set(known_services))
+        if unknown:
+            raise ValueError(f"{topology_id}: unknown services {unknown}")
+
+    fallback = _edge_impact(spec.get("default_impact") or {}, DEFAULT_IMPACT, f"{topology_id}.default_impact")
+
+    present = set(services)
+    dependencies: List[Tuple[str, str]] = []
+    impacts: Dict[Tuple[str, str], EdgeImpact] = {}
+    for i, edge in enumerate(spec.get("dependencies") or []):
+        where = f"{topology_id}.dependencies[{i}]"
+        if not isinstance(edge, Mapping):
+            raise ValueError(f"{where}: expected an object")
+        source, target = edge.get("source"), edge.get("target")
+        if source not in present or target not in present:
+            raise ValueError(f"{where}: unknown service in edge {source} -> {target}")
+        if (source, target) in impacts:
+            raise ValueError(f"{where}: duplicate edge {source} -> {target}")
+        dependencies.append((source, target))
+        impacts[(source, target)] = _edge_impact(edge, fallback, where)
+
+    # Raises DependencyCycleError (a ValueError) on cycles
+    graph = PropagationGraph(services, dependencies, impacts=impacts, default_impact=fallback)
+    _freeze(
+        graph.order, graph.level, graph.sources, graph.targets,
+        graph.latency_impact, graph.error_impact,
+    )
+
+    display_name = spec.get("display_name") or topology_id.replace("_", " ").title()
+    dependency_nodes = tuple(
+        {"source": source, "target": target} for source, target in dependencies
+    )
+    document = {
+        "id": topology_id,
+        "version": version,
+        "display_name": display_name,
+        "services": services,
+        "dependencies": [
+            {
+                "source": source,
+                "target": target,
+                "degraded": list(impacts[(source, target)].degraded),
+                "unhealthy": list(impacts[(source, target)].unhealthy),
+            }
+            for source, target in dependencies
+        ],
+    }
+
+    return Topology(
+        id=topology_id,
+        version=version,
+        display_name=display_name,
+        services=tuple(services),
+        dependencies=tuple(dependencies),
+        impacts=MappingProxyType(impacts),
+        default_impact=fallback,
+        default=default,
+        graph=graph,
+        spec=MappingProxyType(dict(spec)),
+        document=json.dumps(document, separators=(",", ":")).encode("utf-8"),
+        dependency_nodes=dependency_nodes,
+    )
+
+
+# -----------------------------
+# Registry
+# -----------------------------
+
+class TopologyRegistry:
+    """
+    Compiled topologies by id and version.
+
+    Built-ins come from the topology file (version 1); register() adds
+    versions at runtime and appends them to the uploads file, which is
+    replayed on startup. Topologies are immutable, so lookups hand out
+    shared objects without copying. Uploads are per process: other
+    workers see them after a restart.
+    """
+
+    def __init__(
+        self,
+        path: str = TOPOLOGIES_FILE,
+        uploads_path: Optional[str] = TOPOLOGY_UPLOADS_FILE,
+        known_services: Optional[Iterable[str]] = None,
+    ):
+        self.uploads_path = uploads_path
+        self.known_services = None if known_services is None else frozenset(known_services)
+
+        self._lock = threading.Lock()
+        self._versions: Dict[str, Dict[int, Topology]] = {}
+
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+        for topology_id, spec in document.get("topologies", {}).items():
+            self._add(
+                compile_topology(
+                    topology_id, spec, 1, self.known_services,
+                    default=topology_id == DEFAULT_TOPOLOGY,
+                )
+            )
+        if DEFAULT_TOPOLOGY not in self._versions:
+            raise ValueError(f"{path}: missing the {DEFAULT_TOPOLOGY!r} topology")
+        self.default = self._versions[DEFAULT_TOPOLOGY][1]
+
+        if uploads_path and os.path.exists(uploads_path):
+            with open(uploads_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._add(
+                            compile_topology(
+                                entry["id"], entry["spec"], entry["version"], self.known_services
+                            )
+                        )
+
+    def _add(self, topology: Topology) -> None:
+        self._versions.setdefault(topology.id, {})[topology.version] = topology
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+
+    def get(self, topology_id: str = DEFAULT_TOPOLOGY, version: Optional[int] = None) -> Optional[Topology]:
+        """
+        A given version, or the latest one (version None).
+        """
+        versions = self._versions.get(topology_id)
+        if not versions:
+            return None
+        if version is None:
+            version = max(versions)
+        return versions.get(version)
+
+    def resolve(self, key: Optional[str]) -> Optional[Topology]:
+        """
+        Topology of a run ("<id>@<version>", None = the default).
+        """
+        if key is None:
+            return self.default
+        topology_id, _, version = key.rpartition("@")
+        if not topology_id or not version.isdigit():
+            return None
+        return self.get(topology_id, int(version))
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {**versions[max(versions)].summary(), "versions": sorted(versions)}
+                for versions in self._versions.values()
+            ]
+
+    # -----------------------------
+    # Uploads
+    # -----------------------------
+
+    def register(self, topology_id: str, spec: Mapping[str, Any]) -> Tuple[Topology, bool]:
+        """
+        Add the next version of a topology. Returns (topology, created);
+        a spec equal to the latest version's returns that version instead.
+        """
+        with self._lock:
+            versions = self._versions.get(topology_id, {})
+            latest = versions[max(versions)] if versions else None
+            if latest is not None and dict(latest.spec) == dict(spec):
+                return latest, False
+            if latest is None and len(self._versions) >= MAX_TOPOLOGIES:
+                raise OverflowError(f"At most {MAX_TOPOLOGIES} topologies can be registered")
+            if len(versions) >= MAX_TOPOLOGY_VERSIONS:
+                raise OverflowError(f"At most {MAX_TOPOLOGY_VERSIONS} versions per topology")
+
+            version = max(versions, default=0) + 1
+            topology = compile_topology(topology_id, spec, version, self.known_services)
+
+            if self.uploads_path:
+                os.makedirs(os.path.dirname(self.uploads_path) or ".", exist_ok=True)
+                with open(self.uploads_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"id": topology_id, "version": version, "spec": spec}) + "\n")
+
+            # Readers only ever see fully compiled topologies
+            self._versions = {**self._versions, topology_id: {**versions, version: topology}}
+            return topology, True
+
+
+_shared_registry: Optional[TopologyRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def get_topology_registry() -> TopologyRegistry:
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = TopologyRegistry(known_services=SERVICE_PROFILES)
+        return _shared_registry
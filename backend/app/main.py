@@ -1,16 +1,37 @@
 # backend/app/main.py
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.ai.explainer import close_ollama_client
+from app.api.executors import shutdown_executor_pools
+from app.core.sweep import shutdown_sweep_pool
+from app.api.timing import ServerTimingMiddleware
+
 from app.api.simulate import router as simulate_router
 from app.api.inject_failure import router as inject_failure_router
 from app.api.scenarios import router as scenarios_router
 from app.api.explain import router as explain_router
+from app.api.sweep import router as sweep_router
+from app.api.sessions import router as sessions_router
+from app.api.runs import router as runs_router
+from app.api.topologies import router as topologies_router
+from app.api.executors import router as executors_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release pooled LLM connections, workload threads, sweep processes
+    await close_ollama_client()
+    shutdown_executor_pools()
+    shutdown_sweep_pool()
 
 
 # Fast api
-app = FastAPI(title="System Autopsy")
+app = FastAPI(title="System Autopsy", lifespan=lifespan)
 
 # -----------------------------
 # CORS CONFIGURATION (REQUIRED)
@@ -25,7 +46,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser tooling read per-request app time
+    expose_headers=["Server-Timing"],
 )
+app.add_middleware(ServerTimingMiddleware)
 
 # -----------------------------
 # Register API routers
@@ -34,11 +58,17 @@ app.include_router(simulate_router)
 app.include_router(inject_failure_router)
 app.include_router(scenarios_router)
 app.include_router(explain_router)
+app.include_router(sweep_router)
+app.include_router(sessions_router)
+app.include_router(runs_router)
+app.include_router(topologies_router)
+app.include_router(executors_router)
 
 
 # -----------------------------
 # Health check
 # -----------------------------
+# Async and inline: never waits behind a workload pool
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
@@ -0,0 +1,22 @@
+# app/models/health.py
+
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+
+class ServiceHealthTimeline(BaseModel):
+    # One status per tick, aligned with HealthTimeline.time
+    status: List[str]
+
+    # In time units of the metric series (ticks); None = never happened
+    time_to_degraded: Optional[float] = None
+    time_to_unhealthy: Optional[float] = None
+    # First degradation -> next healthy tick; None = not recovered
+    recovery_time: Optional[float] = None
+    # Ticks spent per status ("healthy" / "degraded" / "unhealthy")
+    time_in_state: Dict[str, int]
+
+
+class HealthTimeline(BaseModel):
+    time: List[int]
+    services: Dict[str, ServiceHealthTimeline]
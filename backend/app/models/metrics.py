@@ -14,3 +14,20 @@ class MetricsBundle(BaseModel):
     error_rate_pct: List[MetricPoint]
     request_volume: List[MetricPoint]
     queue_depth: List[MetricPoint]
+
+
+# -----------------------------
+# Columnar layout
+# -----------------------------
+# Same series as parallel arrays: time[i] pairs with values[i]
+
+class MetricColumns(BaseModel):
+    time: List[int]
+    values: List[float]
+
+
+class MetricsColumnsBundle(BaseModel):
+    latency_ms: MetricColumns
+    error_rate_pct: MetricColumns
+    request_volume: MetricColumns
+    queue_depth: MetricColumns
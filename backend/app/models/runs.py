@@ -0,0 +1,71 @@
+# app/models/runs.py
+
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+
+class RunSummary(BaseModel):
+    """
+    Stored run metadata (no metrics). parent_run_id is set for runs
+    derived from another stored run (e.g. a failure injected into it).
+    """
+    run_id: str
+    kind: str
+    scenario: Optional[str] = None
+    seed: Optional[int] = None
+    severity: Optional[str] = None
+    parent_run_id: Optional[str] = None
+    created_at: float
+
+
+class RunMetricStats(BaseModel):
+    run_id: str
+    points: int
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: Optional[float] = None
+    last: Optional[float] = None
+
+
+class RunMetricScan(BaseModel):
+    """
+    One metric summarized across stored runs, oldest run first.
+    """
+    metric: str
+    runs: List[RunMetricStats]
+
+
+class RootCause(BaseModel):
+    """
+    A failing service with no failing dependency, the services its
+    degradation reached, and the root-to-leaf paths it took.
+    """
+    service: str
+    impacted: List[str]
+    paths: List[List[str]]
+
+
+class CriticalPath(BaseModel):
+    """
+    Worst-latency chain from an entry service down to a leaf.
+    """
+    services: List[str]
+    latency_ms: float
+
+
+class BlastRadius(BaseModel):
+    """
+    Services depending on a failing service, directly or transitively
+    (size is exact; services may be cut to the request's limit).
+    """
+    size: int
+    services: List[str]
+
+
+class RunBlastRadius(BaseModel):
+    run_id: str
+    topology: Dict[str, object]
+    failing: List[str]
+    root_causes: List[RootCause]
+    critical_path: CriticalPath
+    blast_radius: Dict[str, BlastRadius]
@@ -0,0 +1,65 @@
+# app/models/session.py
+
+from pydantic import BaseModel
+from typing import List, Optional
+
+from .metrics import MetricsBundle, MetricsColumnsBundle
+from .simulation_state import SimulationState, SimulationStateColumns
+from .topology import ServiceNode
+
+
+class SessionState(SimulationState):
+    """
+    Full session state: topology plus the whole rolling metric window.
+    """
+    session_id: str
+    tick: int
+    window: int
+
+
+class SessionStateColumns(SimulationStateColumns):
+    session_id: str
+    tick: int
+    window: int
+
+
+class SessionDelta(BaseModel):
+    """
+    Changes since the previous tick call.
+
+    - services: only services whose reported state changed
+    - metrics: only the new points; points before window_start have
+      left the window
+    """
+    session_id: str
+    run_id: Optional[str] = None
+    tick: int
+    window_start: int
+    system_mode: str
+    services: List[ServiceNode]
+    metrics: MetricsBundle
+
+
+class SessionDeltaColumns(BaseModel):
+    session_id: str
+    run_id: Optional[str] = None
+    tick: int
+    window_start: int
+    system_mode: str
+    services: List[ServiceNode]
+    metrics: MetricsColumnsBundle
+
+
+class MetricHistoryResponse(BaseModel):
+    """
+    One metric over [start, end). resolution None = raw points, otherwise
+    the rollup bucket width the values were aggregated with (`how`).
+    """
+    session_id: str
+    metric: str
+    start: int
+    end: int
+    resolution: Optional[int] = None
+    how: str
+    time: List[int]
+    values: List[float]
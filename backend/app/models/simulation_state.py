@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Optional
 
-from .metrics import MetricsBundle
+from .health import HealthTimeline
+from .metrics import MetricsBundle, MetricsColumnsBundle
 from .topology import SystemTopology
 
 
@@ -8,3 +10,23 @@ class SimulationState(BaseModel):
     system_mode: str
     topology: SystemTopology
     metrics: MetricsBundle
+
+    # Replay: re-submit the seed to recompute this exact run
+    run_id: Optional[str] = None
+    seed: Optional[int] = Field(None, ge=0, lt=2**63)
+
+    # Per-tick service health over the metric window (when available)
+    health: Optional[HealthTimeline] = None
+
+
+class SimulationStateColumns(BaseModel):
+    """
+    SimulationState with metric series as parallel arrays (?layout=columns).
+    """
+    system_mode: str
+    topology: SystemTopology
+    metrics: MetricsColumnsBundle
+
+    run_id: Optional[str] = None
+    seed: Optional[int] = Field(None, ge=0, lt=2**63)
+    health: Optional[HealthTimeline] = None
@@ -1,6 +1,6 @@
 ## app/models/topology
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 
 class ServiceNode(BaseModel):
@@ -21,3 +21,42 @@ class SystemTopology(BaseModel):
     services: List[ServiceNode]
     dependencies: List[DependencyEdge]
 
+    # Registry topology the run was computed with (GET /topologies/{id})
+    id: Optional[str] = None
+    version: Optional[int] = None
+
+
+# -----------------------------
+# Topology Registry
+# -----------------------------
+
+class EdgeImpactSpec(BaseModel):
+    # (latency_ms, error_rate_pct) added to the source per tier of the target
+    degraded: Optional[List[float]] = Field(None, min_length=2, max_length=2)
+    unhealthy: Optional[List[float]] = Field(None, min_length=2, max_length=2)
+
+
+class DependencySpec(EdgeImpactSpec):
+    # source depends on target; degradation flows target -> source
+    source: str
+    target: str
+    description: Optional[str] = None
+
+
+class TopologySpec(BaseModel):
+    """
+    Upload body for POST /topologies/{topology_id} (same shape as an
+    entry of app/core/topologies.json).
+    """
+    display_name: Optional[str] = None
+    services: List[str] = Field(min_length=1)
+    dependencies: List[DependencySpec] = []
+    default_impact: Optional[EdgeImpactSpec] = None
+
+
+class TopologySummary(BaseModel):
+    id: str
+    version: int
+    display_name: str
+    services: List[str]
+    versions: List[int]
@@ -0,0 +1,375 @@
+# app/tools/loadtest.py
+
+import os
+import sys
+import json
+import time
+import socket
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+import numpy as np
+
+from app.core.failures import FailureScenario, FAILURE_APPLIERS
+
+SCENARIOS = [s.value for s in FailureScenario]
+# /inject-failure rejects scenarios without an applier
+INJECTABLE = [s.value for s in FAILURE_APPLIERS]
+
+DEFAULT_WORKERS = (1, 4, 16)
+DEFAULT_CONCURRENCY = 64
+DEFAULT_DURATION_S = 20.0
+DEFAULT_WARMUP_S = 3.0
+DEFAULT_MIX = "simulate=1"
+
+PERCENTILES = (50, 95, 99)
+STARTUP_TIMEOUT_S = 30.0
+
+
+# -----------------------------
+# Endpoint Mix
+# -----------------------------
+# name -> (path, request body builder). Every request carries a fresh
+# seed so /explain measures generation, not cache hits.
+
+ENDPOINTS: Dict[str, Tuple[str, Callable[[random.Random], Dict[str, Any]]]] = {
+    "simulate": (
+        "/simulate",
+        lambda rng: {"scenario": rng.choice([None] + SCENARIOS), "seed": rng.getrandbits(62)},
+    ),
+    "inject-failure": (
+        "/inject-failure",
+        lambda rng: {"scenario": rng.choice(INJECTABLE), "seed": rng.getrandbits(62)},
+    ),
+    "explain": (
+        "/explain",
+        lambda rng: {"scenario": rng.choice(SCENARIOS), "seed": rng.getrandbits(62)},
+    ),
+}
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    "simulate=8,inject-failure=1,explain=1" -> normalized weights.
+    """
+    weights: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        weights[name] = float(weight or 1)
+
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Endpoint mix weights must be positive")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+# -----------------------------
+# Measurements
+# -----------------------------
+
+class Recorder:
+    """
+    Per-endpoint latency samples for one load run.
+
+    latency: client-observed, request sent -> body read
+    app: the server's own Server-Timing app duration, when present
+    """
+
+    def __init__(self):
+        self.latency_ms: Dict[str, List[float]] = {}
+        self.app_ms: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(
+        self, endpoint: str, latency_ms: float, status: str, app_ms: Optional[float]
+    ) -> None:
+        self.latency_ms.setdefault(endpoint, []).append(latency_ms)
+        if app_ms is not None:
+            self.app_ms.setdefault(endpoint, []).append(app_ms)
+        counts = self.statuses.setdefault(endpoint, {})
+        counts[status] = counts.get(status, 0) + 1
+        if not status.startswith("2"):
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, elapsed_s: float) -> Dict[str, Any]:
+        endpoints = {
+            name: {
+                "requests": len(samples),
+                "rps": round(len(samples) / elapsed_s, 2),
+                "errors": self.errors.get(name, 0),
+                "statuses": self.statuses.get(name, {}),
+                "latency_ms": _distribution(samples),
+                "app_ms": _distribution(self.app_ms.get(name, [])),
+            }
+            for name, samples in sorted(self.latency_ms.items())
+        }
+
+        all_latency = [v for samples in self.latency_ms.values() for v in samples]
+        all_app = [v for samples in self.app_ms.values() for v in samples]
+        return {
+            "duration_s": round(elapsed_s, 3),
+            "requests": len(all_latency),
+            "rps": round(len(all_latency) / elapsed_s, 2),
+            "errors": sum(self.errors.values()),
+            "latency_ms": _distribution(all_latency),
+            "app_ms": _distribution(all_app),
+            "endpoints": endpoints,
+        }
+
+
+def _distribution(samples: Sequence[float]) -> Dict[str, float]:
+    if len(samples) == 0:
+        return {}
+
+    values = np.asarray(samples, dtype=float)
+    stats = {
+        f"p{q}": round(float(v), 3)
+        for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+    }
+    stats["mean"] = round(float(values.mean()), 3)
+    stats["max"] = round(float(values.max()), 3)
+    return stats
+
+
+def _app_duration_ms(response: httpx.Response) -> Optional[float]:
+    header = response.headers.get("server-timing", "")
+    for metric in header.split(","):
+        name, _, params = metric.strip().partition(";")
+        if name == "app" and params.startswith("dur="):
+            return float(params[4:])
+    return None
+
+
+# -----------------------------
+# Load Generator
+# -----------------------------
+
+async def run_load(
+    base_url: str,
+    mix: Dict[str, float],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    duration_s: float = DEFAULT_DURATION_S,
+    warmup_s: float = DEFAULT_WARMUP_S,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Closed-loop load: `concurrency` clients each issue one request at a
+    time, back to back, for warmup_s + duration_s. Only requests that
+    start after the warmup are recorded.
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    recorder = Recorder()
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    timeout = httpx.Timeout(60.0)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        loop_start = time.perf_counter()
+        measure_from = loop_start + warmup_s
+        stop_at = measure_from + duration_s
+
+        async def user(index: int) -> None:
+            rng = random.Random(None if seed is None else seed + index)
+
+            while True:
+                start = time.perf_counter()
+                if start >= stop_at:
+                    return
+
+                endpoint = rng.choices(names, weights)[0]
+                path, make_body = ENDPOINTS[endpoint]
+
+                try:
+                    response = await client.post(path, json=make_body(rng))
+                    status = str(response.status_code)
+                    app_ms = _app_duration_ms(response)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                    app_ms = None
+
+                if start >= measure_from:
+                    recorder.record(
+                        endpoint, (time.perf_counter() - start) * 1000, status, app_ms
+                    )
+
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+        # Includes draining requests still in flight at stop_at
+        elapsed = time.perf_counter() - measure_from
+
+    return recorder.summary(elapsed)
+
+
+# -----------------------------
+# Server Processes
+# -----------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_uvicorn(app_path: str, port: int, workers: int = 1, env: Optional[Dict[str, str]] = None):
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", app_path,
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+            "--no-access-log",
+        ],
+        env={**os.environ, **(env or {})},
+        # Route handlers print() their payloads; keep stderr for errors
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def _wait_until_ready(url: str, process: subprocess.Popen) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT_S
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}: {url}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not become ready: {url}")
+
+
+def _stop(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Load-test app.main:app under uvicorn and report RPS and latency percentiles."
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=list(DEFAULT_WORKERS),
+                        help="uvicorn worker counts to test, one run each")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION_S,
+                        help="measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP_S)
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help='endpoint weights, e.g. "simulate=8,inject-failure=1,explain=1"')
+    parser.add_argument("--target", help="load an already running server instead of spawning one")
+    parser.add_argument("--llm-url", help="Ollama generate URL; default spawns app.tools.stub_llm")
+    parser.add_argument("--llm-delay-ms", type=float, default=200.0,
+                        help="generation delay of the spawned stub LLM")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.concurrency <= 0 or args.duration <= 0:
+        parser.error("--concurrency and --duration must be positive")
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    report: Dict[str, Any] = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "mix": mix,
+            "target": args.target,
+            "llm": args.llm_url or f"stub ({args.llm_delay_ms:g} ms)",
+            "seed": args.seed,
+        },
+        "runs": [],
+    }
+
+    def load(base_url: str) -> Dict[str, Any]:
+        return asyncio.run(run_load(
+            base_url, mix,
+            concurrency=args.concurrency,
+            duration_s=args.duration,
+            warmup_s=args.warmup,
+            seed=args.seed,
+        ))
+
+    def log(run: Dict[str, Any], label: str) -> None:
+        latency = run["latency_ms"]
+        print(
+            f"{label}: {run['rps']:.1f} req/s, "
+            f"p50 {latency.get('p50', 0):.1f} ms, p95 {latency.get('p95', 0):.1f} ms, "
+            f"p99 {latency.get('p99', 0):.1f} ms, errors {run['errors']}",
+            file=sys.stderr,
+        )
+
+    if args.target:
+        run = {"workers": None, **load(args.target.rstrip("/"))}
+        log(run, args.target)
+        report["runs"].append(run)
+    else:
+        llm_url = args.llm_url
+        stub = None
+        if llm_url is None and "explain" in mix:
+            port = _free_port()
+            stub = _start_uvicorn(
+                "app.tools.stub_llm:app", port,
+                env={"STUB_LLM_DELAY_MS": str(args.llm_delay_ms)},
+            )
+            llm_url = f"http://127.0.0.1:{port}/api/generate"
+            _wait_until_ready(f"http://127.0.0.1:{port}/docs", stub)
+
+        try:
+            for workers in args.workers:
+                port = _free_port()
+                env = {"OLLAMA_URL": llm_url} if llm_url else {}
+                server = _start_uvicorn("app.main:app", port, workers=workers, env=env)
+                try:
+                    base_url = f"http://127.0.0.1:{port}"
+                    _wait_until_ready(f"{base_url}/health", server)
+                    run = {"workers": workers, **load(base_url)}
+                finally:
+                    _stop(server)
+
+                log(run, f"{workers} worker(s)")
+                report["runs"].append(run)
+        finally:
+            if stub is not None:
+                _stop(stub)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
+
+## cd backend ,
+##  python -m app.tools.loadtest --workers 1 4 16 --concurrency 64 --duration 30 --out load.json
+##  python -m app.tools.loadtest --mix "simulate=8,inject-failure=1,explain=1" --workers 4
@@ -0,0 +1,57 @@
+# app/tools/stub_llm.py
+
+import os
+import json
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+# Simulated generation time per request (ms) and stream chunking
+STUB_LLM_DELAY_MS = float(os.getenv("STUB_LLM_DELAY_MS", "200"))
+STUB_LLM_CHUNKS = int(os.getenv("STUB_LLM_CHUNKS", "10"))
+
+STUB_EXPLANATION = {
+    "system_state_summary": "The database is degraded and orders_service latency is elevated.",
+    "failure_explanation": "Database latency increased and propagated to dependent services.",
+    "identified_factors": ["database latency", "orders_service latency"],
+    "mitigation_suggestions": [
+        {
+            "title": "Limit retries",
+            "description": "Reduce retry counts and add backoff on database calls.",
+        }
+    ],
+}
+
+# -----------------------------
+# Ollama-compatible stub
+# -----------------------------
+# Speaks just enough of POST /api/generate for app.ai.explainer:
+# {"response": "<json>"} or, with "stream": true, NDJSON chunks.
+# Point the backend at it with OLLAMA_URL=http://127.0.0.1:<port>/api/generate
+
+app = FastAPI(title="Stub LLM")
+
+
+@app.post("/api/generate")
+async def generate(body: dict):
+    text = json.dumps(STUB_EXPLANATION)
+
+    if not body.get("stream"):
+        await asyncio.sleep(STUB_LLM_DELAY_MS / 1000)
+        return {"model": body.get("model"), "response": text, "done": True}
+
+    step = max(1, -(-len(text) // STUB_LLM_CHUNKS))
+    pause = STUB_LLM_DELAY_MS / 1000 / STUB_LLM_CHUNKS
+
+    async def chunks():
+        for i in range(0, len(text), step):
+            await asyncio.sleep(pause)
+            yield json.dumps({"response": text[i:i + step], "done": False}) + "\n"
+        yield json.dumps({"response": "", "done": True}) + "\n"
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+## cd backend ,
+##  uvicorn app.tools.stub_llm:app --port 11500
@@ -0,0 +1,56 @@
+# tests/benchmarks/conftest.py
+#
+# Hot-path benchmarks (pytest-benchmark). From backend/:
+#
+#   pip install -r requirements-dev.txt
+#
+#   # record a baseline (JSON under .benchmarks/)
+#   pytest tests/benchmarks --benchmark-save=baseline
+#
+#   # compare against the latest saved run, fail on >15% mean regression
+#   pytest tests/benchmarks --benchmark-compare --benchmark-compare-fail=mean:15%
+#
+#   # only small topologies
+#   pytest tests/benchmarks -k "not 5000"
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from fastapi.testclient import TestClient
+
+import app.api.explain as explain_api
+import app.core.runstore as runstore
+from app.ai.cache import get_explanation_cache
+from app.main import app
+
+STUB_EXPLANATION = {
+    "system_state_summary": "Database latency is elevated.",
+    "failure_explanation": "Database latency increased and propagated to dependent services.",
+    "identified_factors": ["database latency"],
+    "mitigation_suggestions": [
+        {"title": "Limit retries", "description": "Reduce retries and add backoff."}
+    ],
+}
+
+
+# -----------------------------
+# Stubbed LLM / API client
+# -----------------------------
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    async def stub_explanation(payload, **kwargs):
+        return STUB_EXPLANATION
+
+    monkeypatch.setattr(explain_api, "generate_ai_explanation_async", stub_explanation)
+    get_explanation_cache().clear()
+
+    # Runs are persisted per request; keep them out of the working tree
+    store = runstore.RunStore(str(tmp_path / "runstore"))
+    monkeypatch.setattr(runstore, "_shared_store", store)
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    store.close()
@@ -0,0 +1,78 @@
+# tests/benchmarks/test_bench_api.py
+#
+# End-to-end through the ASGI test client: routing, simulation,
+# response model validation and JSON serialization.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app.api.explain as explain_api
+from app.api.executors import LLM, get_executor_pools
+from app.core.failures import FailureScenario
+
+SCENARIOS = [s.value for s in FailureScenario]
+
+
+@pytest.mark.parametrize("layout", ["points", "columns"])
+@pytest.mark.parametrize("scenario", [None] + SCENARIOS, ids=lambda s: s or "baseline")
+def test_simulate_endpoint(benchmark, client, scenario, layout):
+    response = benchmark(
+        client.post, "/simulate", params={"layout": layout}, json={"scenario": scenario, "seed": 1}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("scenario", ["database_latency_spike", "external_dependency_degradation"])
+def test_inject_failure_endpoint(benchmark, client, scenario):
+    response = benchmark(client.post, "/inject-failure", json={"scenario": scenario, "seed": 1})
+    assert response.status_code == 200
+
+
+def test_explain_endpoint_stubbed_llm(benchmark, client):
+    # Fresh seed per call so every request misses the explanation cache
+    seeds = iter(range(1_000_000))
+
+    def call():
+        return client.post(
+            "/explain", json={"scenario": "database_latency_spike", "seed": next(seeds)}
+        )
+
+    response = benchmark(call)
+    assert response.status_code == 200
+    assert response.json()["identified_factors"] == ["database latency"]
+
+
+def test_health_while_explain_saturated(benchmark, client, monkeypatch):
+    # Explain payloads block on `release`, so every LLM worker is busy
+    # and the rest queue; /health must not wait behind them
+    release = threading.Event()
+    build_payload = explain_api._explain_payload
+
+    def held_payload(request):
+        release.wait(30)
+        return build_payload(request)
+
+    monkeypatch.setattr(explain_api, "_explain_payload", held_payload)
+    pool = get_executor_pools()[LLM]
+    requests = 2 * pool.workers
+
+    def explain(seed):
+        return client.post("/explain", json={"scenario": "database_latency_spike", "seed": seed})
+
+    with ThreadPoolExecutor(max_workers=requests) as senders:
+        pending = [senders.submit(explain, seed) for seed in range(requests)]
+        deadline = time.monotonic() + 10
+        while pool.stats()["queued"] < requests - pool.workers and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        try:
+            response = benchmark(client.get, "/health")
+            assert pool.stats()["saturation"] == 1.0
+        finally:
+            release.set()
+
+        assert all(f.result().status_code == 200 for f in pending)
+    assert response.status_code == 200
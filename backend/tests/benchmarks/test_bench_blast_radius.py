@@ -0,0 +1,36 @@
+# tests/benchmarks/test_bench_blast_radius.py
+
+import pytest
+
+from app.core.blast_radius import GraphIndex, analyze_run, graph_index
+from app.core.propagation import PropagationGraph
+
+from .topologies import TOPOLOGY_SIZES, make_result, make_topology
+
+
+@pytest.mark.parametrize("size", TOPOLOGY_SIZES)
+def test_build_closure(benchmark, size):
+    keys, edges = make_topology(size)
+    graph = PropagationGraph(keys, edges)
+
+    def build():
+        return GraphIndex(graph).closure
+
+    closure = benchmark(build)
+    assert closure.shape == (size, (size + 63) // 64)
+
+
+@pytest.mark.parametrize("size", TOPOLOGY_SIZES)
+def test_blast_radius_query(benchmark, size):
+    # Repeat queries on one topology: the memoized index is warm
+    keys, edges = make_topology(size)
+    graph = PropagationGraph(keys, edges)
+    graph_index(graph).closure
+    result = make_result(keys)
+
+    def query():
+        return analyze_run(result, graph).to_content(limit=100)
+
+    content = benchmark(query)
+    failing = [key for key, svc in result.services.items() if svc.status.value != "healthy"]
+    assert list(content["blast_radius"]) == failing
@@ -0,0 +1,26 @@
+# tests/benchmarks/test_bench_propagation.py
+
+import pytest
+
+from app.core.propagation import PropagationGraph, propagate_failures
+
+from .topologies import TOPOLOGY_SIZES, make_result, make_topology
+
+
+@pytest.mark.parametrize("size", TOPOLOGY_SIZES)
+def test_compile_graph(benchmark, size):
+    keys, edges = make_topology(size)
+    graph = benchmark(PropagationGraph, keys, edges)
+    assert len(graph.order) == size
+
+
+@pytest.mark.parametrize("cascade", [False, True], ids=["direct", "cascade"])
+@pytest.mark.parametrize("size", TOPOLOGY_SIZES)
+def test_propagate_failures(benchmark, size, cascade):
+    keys, edges = make_topology(size)
+    graph = PropagationGraph(keys, edges)
+
+    def setup():
+        return (make_result(keys),), {"graph": graph, "cascade": cascade}
+
+    benchmark.pedantic(propagate_failures, setup=setup, rounds=20)
@@ -0,0 +1,38 @@
+# tests/benchmarks/test_bench_ringbuffer.py
+
+import numpy as np
+import pytest
+
+from app.core.ringbuffer import MetricHistory
+from app.core.series import MetricSeries
+
+CAPACITY = 3600
+
+
+@pytest.fixture
+def history():
+    history = MetricHistory(CAPACITY)
+    history.extend(MetricSeries.from_values(np.random.default_rng(0).uniform(90, 150, 10 * CAPACITY)))
+    return history
+
+
+def test_append(benchmark, history):
+    ticks = iter(range(10 * CAPACITY, 10**9))
+    benchmark(lambda: history.append(next(ticks), 120.0))
+
+
+@pytest.mark.parametrize("k", [1, 30, 1000])
+def test_extend(benchmark, history, k):
+    starts = iter(range(10 * CAPACITY, 10**9, k))
+    values = np.full(k, 120.0)
+    benchmark(lambda: history.extend(MetricSeries.from_values(values, start=next(starts))))
+
+
+def test_window_view(benchmark, history):
+    series = benchmark(history.window, 30)
+    assert np.shares_memory(series.values, history.raw.columns[1])
+
+
+def test_long_range_from_rollups(benchmark, history):
+    resolution, series = benchmark(history.range, 0, 10 * CAPACITY, 600)
+    assert resolution == 60 and len(series) <= 600
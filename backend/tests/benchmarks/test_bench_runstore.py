@@ -0,0 +1,44 @@
+# tests/benchmarks/test_bench_runstore.py
+
+import itertools
+
+import numpy as np
+import pytest
+
+from app.core.runstore import RunStore
+from app.core.simulation import run_simulation
+
+RUNS = 1000
+SCENARIO = "database_latency_spike"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RunStore(str(tmp_path), segment_bytes=1024 * 1024)
+    for seed in range(RUNS):
+        store.put(run_simulation(SCENARIO, seed=seed), "simulate", SCENARIO)
+    yield store
+    store.close()
+
+
+def test_put(benchmark, store):
+    seeds = itertools.count(RUNS)
+
+    def put():
+        store.put(run_simulation(SCENARIO, seed=next(seeds)), "simulate", SCENARIO)
+
+    benchmark(put)
+
+
+def test_get(benchmark, store):
+    run_id = run_simulation(SCENARIO, seed=RUNS // 2).run_id
+    stored = benchmark(store.get, run_id)
+    assert not stored.result.metrics["latency_ms"].values.flags.writeable
+
+
+def test_scan_mean(benchmark, store):
+    def scan():
+        return [series.values.mean() for _, series in store.scan("latency_ms")]
+
+    means = benchmark(scan)
+    assert len(means) >= RUNS and np.all(np.isfinite(means))
@@ -0,0 +1,81 @@
+# tests/benchmarks/test_bench_simulation.py
+
+import numpy as np
+import pytest
+
+from app.core.batch import run_simulation_batch
+from app.core.explain_payload import build_explain_payload
+from app.core.failures import FailureScenario, TimedFault, compose_failures
+from app.core.rules import THRESHOLD_SETS, classify_health, service_thresholds
+from app.core.simulation import SERVICE_PROFILES, run_baseline_simulation, run_simulation
+from app.core.timeline import HealthTimeline
+
+SCENARIOS = [None] + [s.value for s in FailureScenario]
+
+
+def test_run_baseline_simulation(benchmark):
+    result = benchmark(run_baseline_simulation, seed=1)
+    assert len(result.services) == 4
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: s or "baseline")
+def test_run_simulation(benchmark, scenario):
+    result = benchmark(run_simulation, scenario, seed=1)
+    assert result.run_id
+
+
+@pytest.mark.parametrize("n", [1_000, 100_000])
+def test_run_simulation_batch(benchmark, n):
+    batch = benchmark(
+        run_simulation_batch, "database_latency_spike", n, seed=1, include_metrics=False
+    )
+    assert len(batch) == n
+
+
+@pytest.mark.parametrize("per_service", [False, True], ids=["shared", "per_service"])
+def test_classify_health(benchmark, per_service):
+    rng = np.random.default_rng(1)
+    latency = rng.uniform(50, 3000, (100_000, len(SERVICE_PROFILES)))
+    errors = rng.uniform(0, 15, latency.shape)
+    thresholds = (
+        service_thresholds(SERVICE_PROFILES, {"database": THRESHOLD_SETS["lenient"]})
+        if per_service else THRESHOLD_SETS["default"]
+    )
+
+    codes = benchmark(classify_health, latency, errors, thresholds)
+    assert codes.shape == latency.shape
+
+
+@pytest.mark.parametrize("ticks", [30, 10_000])
+def test_health_timeline_stats(benchmark, ticks):
+    rng = np.random.default_rng(1)
+    # Slow drift with noise, so services cross thresholds and recover
+    drift = np.sin(np.linspace(0, 6 * np.pi, ticks))[:, None] * 400
+    latency = 600 + drift + rng.normal(0, 150, (ticks, len(SERVICE_PROFILES)))
+    timeline = HealthTimeline.classify(
+        list(SERVICE_PROFILES), np.arange(ticks), latency, np.full(latency.shape, 0.5)
+    )
+
+    stats = benchmark(timeline.stats)
+    assert stats["time_in_state"].sum(axis=1).tolist() == [ticks] * len(SERVICE_PROFILES)
+
+
+@pytest.mark.parametrize("faults", [1, 3, 12])
+def test_compose_failures(benchmark, faults):
+    timed = [
+        TimedFault(list(FailureScenario)[i % 3], start=(5 * i) % 25, duration=10, ramp=3)
+        for i in range(faults)
+    ]
+
+    def setup():
+        return (run_baseline_simulation(seed=1), timed), {}
+
+    timeline = benchmark.pedantic(compose_failures, setup=setup, rounds=200)
+    assert timeline.status.shape == (30, 4)
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS[1:])
+def test_build_explain_payload(benchmark, scenario):
+    result = run_simulation(scenario, seed=1)
+    payload = benchmark(build_explain_payload, result=result, scenario=scenario)
+    assert payload["scenario"] == scenario
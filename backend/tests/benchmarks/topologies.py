@@ -0,0 +1,55 @@
+# tests/benchmarks/topologies.py
+
+import random
+from typing import Dict, List, Tuple
+
+from app.core.rules import evaluate_health
+from app.core.series import MetricSeries
+from app.core.simulation import SimulationResult, ServiceState
+
+TOPOLOGY_SIZES = [4, 100, 1000, 5000]
+
+
+# -----------------------------
+# Synthetic topologies
+# -----------------------------
+
+def make_topology(
+    size: int, fanout: int = 3, seed: int = 0
+) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Random layered DAG: service i depends on up to `fanout` services with
+    a higher index, so the graph is acyclic by construction.
+    """
+    rng = random.Random(seed)
+    keys = [f"svc_{i}" for i in range(size)]
+    edges = set()
+
+    for i in range(size - 1):
+        for _ in range(min(fanout, size - 1 - i)):
+            edges.add((keys[i], keys[rng.randrange(i + 1, size)]))
+
+    return keys, sorted(edges)
+
+
+def make_result(keys: List[str], failing_fraction: float = 0.05, seed: int = 0) -> SimulationResult:
+    """
+    SimulationResult over synthetic services, a fraction of them failing.
+    """
+    rng = random.Random(seed)
+    services: Dict[str, ServiceState] = {}
+
+    for key in keys:
+        latency = rng.uniform(1000, 1500) if rng.random() < failing_fraction else rng.uniform(60, 150)
+        errors = rng.uniform(0.002, 0.01)
+        services[key] = ServiceState(
+            name=key,
+            latency_ms=latency,
+            error_rate_pct=errors,
+            status=evaluate_health(latency, errors),
+        )
+
+    return SimulationResult(
+        services=services,
+        metrics={"latency_ms": MetricSeries.from_values([100.0] * 30)},
+    )
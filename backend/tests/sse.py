@@ -0,0 +1,22 @@
+# tests/sse.py
+
+import json
+from typing import Any, Dict, List
+
+
+def parse_sse(body: str) -> List[Dict[str, Any]]:
+    """
+    Frames of a text/event-stream body: {"event", "id", "data"} each,
+    data decoded from JSON. Every frame must end with a blank line.
+    """
+    assert body.endswith("\n\n"), "stream must end on a frame boundary"
+
+    frames = []
+    for block in body[:-2].split("\n\n"):
+        frame = {"event": "message", "id": None, "data": None}
+        for line in block.split("\n"):
+            field, _, value = line.partition(": ")
+            assert field in ("event", "id", "data"), f"unexpected line {line!r}"
+            frame[field] = json.loads(value) if field == "data" else value
+        frames.append(frame)
+    return frames
@@ -0,0 +1,57 @@
+# tests/test_api_validation.py
+#
+# Seeds are stored as signed 64-bit ints: out-of-range seeds are a 422 at
+# every entry point, never a 500 from the run store.
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.core.runstore as runstore
+from app.core.rng import MAX_SEED
+from app.main import app
+
+SCENARIO = "database_latency_spike"
+
+BAD_SEEDS = [-1, MAX_SEED, 2**64]
+
+ENDPOINTS = [
+    ("/simulate", {"scenario": SCENARIO}),
+    ("/inject-failure", {"scenario": SCENARIO}),
+    ("/sessions", {"scenario": SCENARIO}),
+    ("/explain", {"scenario": SCENARIO}),
+    ("/sweep", {"scenarios": [SCENARIO], "runs_per_cell": 1}),
+]
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    store = runstore.RunStore(str(tmp_path / "runstore"))
+    monkeypatch.setattr(runstore, "_shared_store", store)
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    store.close()
+
+
+@pytest.mark.parametrize("path, body", ENDPOINTS)
+@pytest.mark.parametrize("seed", BAD_SEEDS)
+def test_out_of_range_seed_is_422(client, path, body, seed):
+    response = client.post(path, json={**body, "seed": seed})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][-1] == "seed"
+
+
+@pytest.mark.parametrize("seed", BAD_SEEDS)
+def test_stream_out_of_range_seed_is_422(client, seed):
+    response = client.get("/simulate/stream", params={"scenario": SCENARIO, "seed": seed})
+    assert response.status_code == 422
+
+
+def test_largest_seed_is_stored_and_replayed(client):
+    first = client.post("/simulate", json={"scenario": SCENARIO, "seed": MAX_SEED - 1})
+    second = client.post("/simulate", json={"scenario": SCENARIO, "seed": MAX_SEED - 1})
+
+    assert first.status_code == 200
+    assert first.json() == second.json()
+    assert runstore.get_run_store().list()[0]["seed"] == MAX_SEED - 1
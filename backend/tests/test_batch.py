@@ -0,0 +1,85 @@
+# tests/test_batch.py
+#
+# run_simulation_batch draws from its own RNG streams, so rows are not
+# the same runs as run_simulation(seed=...); they must follow the same
+# steps and therefore the same outcome distribution.
+
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.core.batch import run_simulation_batch
+from app.core.rules import STATUS_BY_CODE, THRESHOLD_SETS, classify_health, evaluate_health
+from app.core.simulation import SEVERITY_TIERS, run_simulation
+
+SCALAR_RUNS = 800
+BATCH_RUNS = 4000
+
+
+@pytest.mark.parametrize("scenario", [None, "database_latency_spike", "external_dependency_degradation"])
+def test_batch_matches_scalar_distribution(scenario):
+    batch = run_simulation_batch(scenario, BATCH_RUNS, seed=1)
+    runs = [run_simulation(scenario, seed=seed) for seed in range(SCALAR_RUNS)]
+
+    if scenario is not None:
+        severities = Counter(run.severity for run in runs)
+        for tier, fraction in batch.severity_distribution().items():
+            assert abs(fraction - severities[tier] / SCALAR_RUNS) < 0.06
+
+    statuses = batch.status_distribution()
+    for j, key in enumerate(batch.service_keys):
+        counts = Counter(run.services[key].status.value for run in runs)
+        for status, fraction in statuses[key].items():
+            assert abs(fraction - counts[status] / SCALAR_RUNS) < 0.06, (key, status)
+
+        scalar_mean = np.mean([run.services[key].latency_ms for run in runs])
+        assert batch.latency_ms[:, j].mean() == pytest.approx(scalar_mean, rel=0.05)
+        assert batch.error_rate_pct[:, j].max() <= 0.15
+
+
+@pytest.mark.parametrize("thresholds", sorted(THRESHOLD_SETS))
+def test_batch_status_is_scalar_health_of_each_row(thresholds):
+    spec = THRESHOLD_SETS[thresholds]
+    batch = run_simulation_batch("retry_amplification", 200, seed=5, thresholds=spec)
+
+    assert np.array_equal(batch.status, classify_health(batch.latency_ms, batch.error_rate_pct, spec))
+    for i in range(0, len(batch), 20):
+        for j in range(len(batch.service_keys)):
+            expected = evaluate_health(batch.latency_ms[i, j], batch.error_rate_pct[i, j], spec)
+            assert STATUS_BY_CODE[batch.status[i, j]] == expected
+
+
+def test_row_materializes_batch_values():
+    batch = run_simulation_batch("database_latency_spike", 50, seed=2)
+    result = batch.row(7)
+
+    assert result.severity == SEVERITY_TIERS[batch.severity[7]]
+    for j, (key, svc) in enumerate(result.services.items()):
+        assert key == batch.service_keys[j]
+        assert svc.latency_ms == batch.latency_ms[7, j]
+        assert svc.status == STATUS_BY_CODE[batch.status[7, j]]
+    for metric, values in batch.metrics.items():
+        assert np.array_equal(result.metrics[metric].values, values[7])
+
+
+def test_seeded_batch_replays_and_outcomes_ignore_metrics():
+    a = run_simulation_batch("retry_amplification", 300, seed=9)
+    b = run_simulation_batch("retry_amplification", 300, seed=9)
+    lean = run_simulation_batch("retry_amplification", 300, seed=9, include_metrics=False)
+
+    for other in (b, lean):
+        assert np.array_equal(a.latency_ms, other.latency_ms)
+        assert np.array_equal(a.status, other.status)
+        assert np.array_equal(a.severity, other.severity)
+    assert lean.metrics == {}
+
+
+def test_pinned_severity():
+    batch = run_simulation_batch("database_latency_spike", 100, seed=0, severity="critical")
+    assert batch.severity_distribution()["critical"] == 1.0
+
+    with pytest.raises(ValueError):
+        run_simulation_batch("database_latency_spike", 10, severity="apocalyptic")
+    with pytest.raises(ValueError):
+        run_simulation_batch(None, 0)
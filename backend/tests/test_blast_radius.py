@@ -0,0 +1,82 @@
+# tests/test_blast_radius.py
+
+import numpy as np
+
+from app.core.blast_radius import GraphIndex, analyze_run, critical_path, propagation_trees
+from app.core.propagation import PropagationGraph
+from app.core.rules import HealthStatus
+from app.core.simulation import ServiceState, SimulationResult
+
+#   web -> api -> db <- worker      (x -> y: x depends on y)
+#            \-> cache
+SERVICES = ["web", "api", "db", "worker", "cache"]
+EDGES = [("web", "api"), ("api", "db"), ("worker", "db"), ("api", "cache")]
+WEB, API, DB, WORKER, CACHE = range(5)
+
+
+def _index():
+    return GraphIndex(PropagationGraph(SERVICES, EDGES))
+
+
+def test_upstream_is_transitive_dependents():
+    index = _index()
+    assert index.upstream(DB).tolist() == [WEB, API, WORKER]
+    assert index.upstream(CACHE).tolist() == [WEB, API]
+    assert index.upstream(WEB).tolist() == []
+    assert index.upstream_count(np.array([DB, CACHE, WEB])).tolist() == [3, 2, 0]
+
+
+def test_root_cause_and_paths():
+    index = _index()
+    status = np.array([1, 1, 2, 0, 0])    # db failing, api and web degraded
+
+    roots, trees = propagation_trees(index, status)
+
+    assert roots.tolist() == [DB]
+    # worker is reached but healthy, so it passes nothing on
+    assert trees[DB] == {API: DB, WORKER: DB, WEB: API}
+
+
+def test_independent_roots():
+    index = _index()
+    status = np.array([1, 1, 1, 0, 1])    # db and cache both failing
+
+    roots, trees = propagation_trees(index, status)
+
+    assert roots.tolist() == [DB, CACHE]
+    assert trees[CACHE] == {API: CACHE, WEB: API}
+
+
+def test_critical_path_is_worst_latency_chain():
+    index = _index()
+    path, total = critical_path(index, np.array([10.0, 20.0, 30.0, 100.0, 5.0]))
+    assert path == [WORKER, DB]
+    assert total == 130.0
+
+    path, total = critical_path(index, np.array([10.0, 20.0, 1.0, 1.0, 50.0]))
+    assert path == [WEB, API, CACHE]
+    assert total == 80.0
+
+
+def test_report_content():
+    statuses = {"web": "degraded", "api": "degraded", "db": "unhealthy", "worker": "healthy", "cache": "healthy"}
+    result = SimulationResult(
+        services={
+            key: ServiceState(name=key, latency_ms=10.0, error_rate_pct=0.0, status=HealthStatus(status))
+            for key, status in statuses.items()
+        },
+        metrics={},
+    )
+
+    report = analyze_run(result, PropagationGraph(SERVICES, EDGES))
+
+    assert report.paths(DB) == [[DB, API, WEB], [DB, WORKER]]
+    content = report.to_content()
+    assert content["failing"] == ["web", "api", "db"]
+    assert content["root_causes"] == [{
+        "service": "db",
+        "impacted": ["web", "api", "worker"],
+        "paths": [["db", "api", "web"], ["db", "worker"]],
+    }]
+    assert content["blast_radius"]["db"] == {"size": 3, "services": ["web", "api", "worker"]}
+    assert content["critical_path"] == {"services": ["web", "api", "db"], "latency_ms": 30.0}
@@ -0,0 +1,34 @@
+# tests/test_encoding.py
+
+import numpy as np
+
+from app.api.encoding import pack_series, unpack_series
+from app.core.series import MetricSeries
+
+
+def test_pack_round_trip():
+    series = MetricSeries([1_700_000_000, 1_700_000_001, 1_700_000_001, 1_700_000_010], [0.5, 120.25, -3.0, 1e6])
+    packed = pack_series(series)
+
+    assert packed["start"] == 1_700_000_000
+    assert len(packed["time_deltas"]) == 3 * 4
+    assert len(packed["values"]) == 4 * 4
+
+    unpacked = unpack_series(packed)
+    assert unpacked.time.tolist() == series.time.tolist()
+    assert unpacked.values.tolist() == series.values.astype(np.float32).tolist()
+
+
+def test_pack_is_little_endian():
+    packed = pack_series(MetricSeries([0, 2], [1.0, 2.0]))
+    assert packed["time_deltas"] == (2).to_bytes(4, "little")
+    assert packed["values"] == b"\x00\x00\x80\x3f\x00\x00\x00\x40"
+
+
+def test_pack_single_and_empty():
+    single = unpack_series(pack_series(MetricSeries([42], [7.0])))
+    assert single.time.tolist() == [42] and single.values.tolist() == [7.0]
+
+    packed = pack_series(MetricSeries([], []))
+    assert packed == {"start": 0, "time_deltas": b"", "values": b""}
+    assert len(unpack_series(packed)) == 0
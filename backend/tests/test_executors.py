@@ -0,0 +1,88 @@
+# tests/test_executors.py
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.core.runstore as runstore
+from app.api.executors import BATCH, LLM, SIMULATION, WorkloadPool, get_executor_pools, offload
+from app.main import app
+
+request_tag = contextvars.ContextVar("request_tag", default=None)
+
+
+def test_offload_runs_on_the_named_pool():
+    @offload(BATCH)
+    def handler(x, scale=1):
+        return threading.current_thread().name, request_tag.get(), x * scale
+
+    async def call():
+        request_tag.set("req-1")
+        return await handler(3, scale=2)
+
+    thread, tag, value = asyncio.run(call())
+    assert thread.startswith(f"{BATCH}-pool")
+    assert tag == "req-1"      # the caller's context travels with the call
+    assert value == 6
+    assert handler.__name__ == "handler"
+
+
+def test_pool_counts_waits_and_runs():
+    pool = WorkloadPool("test", workers=1)
+    release = threading.Event()
+
+    async def run():
+        first = asyncio.ensure_future(pool.run(release.wait))
+        second = asyncio.ensure_future(pool.run(lambda: "second"))
+        await asyncio.sleep(0.05)
+        busy = pool.stats()
+        release.set()
+        return busy, await first, await second
+
+    try:
+        busy, first, second = asyncio.run(run())
+        stats = pool.stats()
+    finally:
+        pool.shutdown()
+
+    # One worker: the second call waited behind the first
+    assert (busy["active"], busy["queued"], busy["saturation"]) == (1, 1, 1.0)
+    assert first is True and second == "second"
+    assert stats["completed"] == 2 and stats["active"] == stats["queued"] == 0
+    assert stats["peak_queued"] >= 1
+    assert stats["wait_ms"]["max"] >= 40
+    assert set(stats["run_ms"]) == {"mean", "p50", "p95", "max"}
+
+
+def test_pool_propagates_errors():
+    pool = WorkloadPool("test", workers=1)
+
+    def fail():
+        raise KeyError("boom")
+
+    try:
+        with pytest.raises(KeyError):
+            asyncio.run(pool.run(fail))
+        assert pool.stats()["completed"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_routes_report_on_their_pools(monkeypatch, tmp_path):
+    store = runstore.RunStore(str(tmp_path / "runstore"))
+    monkeypatch.setattr(runstore, "_shared_store", store)
+
+    with TestClient(app) as client:
+        before = {name: pool.stats()["completed"] for name, pool in get_executor_pools().items()}
+        assert client.post("/simulate", json={"seed": 1}).status_code == 200
+
+        pools = {pool["name"]: pool for pool in client.get("/executors").json()["pools"]}
+
+    assert set(pools) == {SIMULATION, BATCH, LLM}
+    assert pools[SIMULATION]["completed"] == before[SIMULATION] + 1
+    assert pools[BATCH]["completed"] == before[BATCH]
+    assert pools[SIMULATION]["wait_ms"]["p50"] is not None
+    store.close()
@@ -0,0 +1,125 @@
+# tests/test_explain_api.py
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.explain as explain_api
+import app.core.runstore as runstore
+from app.ai.cache import get_explanation_cache
+from app.main import app
+
+from .sse import parse_sse
+
+SCENARIO = "database_latency_spike"
+
+EXPLANATION = {
+    "system_state_summary": "Database latency is elevated.",
+    "failure_explanation": "Database latency increased and propagated to dependent services.",
+    "identified_factors": ["database latency"],
+    "mitigation_suggestions": [
+        {"title": "Limit retries", "description": "Reduce retries and add backoff."}
+    ],
+}
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    async def stub_explanation(payload, **kwargs):
+        return EXPLANATION
+
+    monkeypatch.setattr(explain_api, "generate_ai_explanation_async", stub_explanation)
+    get_explanation_cache().clear()
+
+    store = runstore.RunStore(str(tmp_path / "runstore"))
+    monkeypatch.setattr(runstore, "_shared_store", store)
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    store.close()
+
+
+@pytest.mark.parametrize("body", [
+    {"session_id": "s", "run_id": "r"},
+    {"session_id": "s", "run_id": "r", "scenario": SCENARIO},
+    {"session_id": "s"},
+    {},
+])
+def test_ambiguous_or_incomplete_request_is_422(client, body):
+    assert client.post("/explain", json=body).status_code == 422
+
+
+def test_live_session_with_run_id_is_422(client):
+    session_id = client.post("/sessions", json={"scenario": SCENARIO, "seed": 1}).json()["session_id"]
+    run_id = client.post("/simulate", json={"scenario": SCENARIO, "seed": 1}).json()["run_id"]
+
+    response = client.post("/explain", json={"session_id": session_id, "run_id": run_id})
+    assert response.status_code == 422
+
+
+def test_explains_session_and_stored_run(client):
+    session_id = client.post("/sessions", json={"scenario": SCENARIO, "seed": 1}).json()["session_id"]
+    run_id = client.post("/simulate", json={"scenario": SCENARIO, "seed": 1}).json()["run_id"]
+
+    for body in ({"session_id": session_id, "scenario": SCENARIO}, {"run_id": run_id}):
+        response = client.post("/explain", json=body)
+        assert response.status_code == 200
+        assert response.json()["identified_factors"] == EXPLANATION["identified_factors"]
+
+
+# -----------------------------
+# Streaming
+# -----------------------------
+
+class StubStreamClient:
+    model = "stub"
+
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    async def stream(self, prompt, deadline_s=None):
+        self.calls += 1
+        for i in range(0, len(self.text), 16):
+            yield self.text[i:i + 16]
+
+
+def _stream(client, monkeypatch, text, body):
+    stub = StubStreamClient(text)
+    monkeypatch.setattr(explain_api, "get_ollama_client", lambda: stub)
+    response = client.post("/explain/stream", json=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return stub, parse_sse(response.text)
+
+
+def test_stream_frames_tokens_then_result(client, monkeypatch):
+    body = {"scenario": SCENARIO, "seed": 3}
+    text = json.dumps(EXPLANATION)
+    _, frames = _stream(client, monkeypatch, text, body)
+
+    events = [frame["event"] for frame in frames]
+    assert events == ["token"] * (len(events) - 1) + ["result"]
+    assert "".join(frame["data"]["text"] for frame in frames[:-1]) == text
+    assert frames[-1]["data"] == client.post("/explain", json=body).json()
+
+
+def test_stream_serves_cached_result_without_tokens(client, monkeypatch):
+    body = {"scenario": SCENARIO, "seed": 4}
+    _, first = _stream(client, monkeypatch, json.dumps(EXPLANATION), body)
+    stub, second = _stream(client, monkeypatch, json.dumps(EXPLANATION), body)
+
+    assert stub.calls == 0
+    assert [frame["event"] for frame in second] == ["result"]
+    assert second[0]["data"] == first[-1]["data"]
+
+
+def test_stream_falls_back_on_invalid_completion(client, monkeypatch):
+    _, frames = _stream(client, monkeypatch, "not an explanation", {"scenario": SCENARIO, "seed": 5})
+
+    result = frames[-1]
+    assert result["event"] == "result"
+    assert result["data"]["identified_factors"] == []
+    assert result["data"]["text"][0].startswith("System is currently in a")
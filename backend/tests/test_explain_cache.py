@@ -0,0 +1,62 @@
+# tests/test_explain_cache.py
+#
+# ExplanationCache: LRU + TTL memory tier, optional SQLite tier.
+
+from app.ai.cache import _PRUNE_EVERY, ExplanationCache, canonical_key
+
+
+def test_canonical_key_ignores_key_order():
+    a = canonical_key({"scenario": "x", "services": {"db": 1, "api": 2}}, "llama3")
+    b = canonical_key({"services": {"api": 2, "db": 1}, "scenario": "x"}, "llama3")
+    assert a == b
+    assert a != canonical_key({"scenario": "x", "services": {"db": 1, "api": 2}}, "mistral")
+
+
+def test_least_recently_used_is_evicted():
+    cache = ExplanationCache(max_entries=2, db_path=None)
+    cache.put("a", {"v": "a"})
+    cache.put("b", {"v": "b"})
+    assert cache.get("a") == {"v": "a"}    # b is now the oldest
+
+    cache.put("c", {"v": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": "a"}
+    assert cache.get("c") == {"v": "c"}
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+
+
+def test_expired_entry_is_dropped():
+    cache = ExplanationCache(ttl_s=0, db_path=None)
+    cache.put("a", {"v": "a"})
+
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 0
+
+
+def test_disk_tier_survives_restart_and_promotes(tmp_path):
+    path = str(tmp_path / "explain.sqlite3")
+    ExplanationCache(max_entries=2, db_path=path).put("a", {"v": "a"})
+
+    cache = ExplanationCache(max_entries=2, db_path=path)
+    assert cache.get("a") == {"v": "a"}
+    assert cache.get("a") == {"v": "a"}
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["hits"]) == (1, 1)
+
+
+def test_disk_tier_is_pruned_periodically(tmp_path):
+    cache = ExplanationCache(max_entries=1, db_path=str(tmp_path / "explain.sqlite3"), max_disk_entries=2)
+    keys = [f"k{i:03d}" for i in range(_PRUNE_EVERY)]
+    for key in keys[:-1]:
+        cache.put(key, {"v": key})
+    assert cache._db.execute("SELECT COUNT(*) FROM explanations").fetchone()[0] == _PRUNE_EVERY - 1
+
+    cache.put(keys[-1], {"v": keys[-1]})
+
+    rows = cache._db.execute("SELECT key FROM explanations ORDER BY key").fetchall()
+    assert [key for key, in rows] == keys[-2:]
@@ -0,0 +1,37 @@
+# tests/test_failures.py
+
+import numpy as np
+import pytest
+
+from app.core.failures import FailureScenario, TimedFault, compose_failures
+from app.core.rules import STATUS_BY_CODE, classify_health
+from app.core.simulation import run_baseline_simulation
+
+ALL_FAULTS = [
+    TimedFault(FailureScenario.DATABASE_LATENCY_SPIKE, start=2, ramp=5),
+    TimedFault(FailureScenario.EXTERNAL_DEPENDENCY_DEGRADATION, start=8, duration=15),
+    TimedFault(FailureScenario.RETRY_AMPLIFICATION, start=12, ramp=3),
+]
+
+
+@pytest.mark.parametrize("faults", [ALL_FAULTS, ALL_FAULTS[:1]])
+def test_composed_status_matches_own_metrics(faults):
+    for seed in range(25):
+        result = run_baseline_simulation(seed=seed)
+        timeline = compose_failures(result, faults)
+
+        assert np.array_equal(
+            timeline.status, classify_health(timeline.latency_ms, timeline.error_rate_pct)
+        )
+        assert timeline.error_rate_pct.max() <= 0.15
+        for j, svc in enumerate(result.services.values()):
+            assert svc.status == STATUS_BY_CODE[timeline.status[-1, j]]
+            assert svc.latency_ms == timeline.latency_ms[-1, j]
+
+
+def test_database_fault_degrades_its_dependent():
+    result = run_baseline_simulation(seed=3)
+    compose_failures(result, ALL_FAULTS[:1])
+
+    assert result.services["database"].status.value == "unhealthy"
+    assert result.services["orders_service"].status.value != "healthy"
@@ -0,0 +1,148 @@
+# tests/test_ollama_client.py
+#
+# AsyncOllamaClient against a local stub HTTP server (stdlib, one thread).
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.ai.explainer import AsyncOllamaClient, generate_ai_explanation_async
+
+EXPLANATION = {
+    "system_state_summary": "The database is degraded.",
+    "failure_explanation": "Database latency increased and propagated to dependent services.",
+    "identified_factors": ["database latency"],
+    "mitigation_suggestions": [{"title": "Limit retries", "description": "Add backoff."}],
+}
+
+# Valid JSON, but not an Ollama reply
+UNEXPECTED_BODIES = {
+    "list": b'[{"response": "x"}]',
+    "string": b'"just a string"',
+    "null": b'{"response": null, "done": true}',
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    POST /<mode>/api/generate, mode: ok | slow | error | garbage | list |
+    string | null
+    """
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        mode = self.path.strip("/").split("/")[0]
+
+        if mode == "slow":
+            time.sleep(1.0)
+        if mode == "error":
+            self._send(500, b"model not loaded")
+        elif mode == "garbage":
+            self._send(200, b"<html>not json</html>")
+        elif mode in UNEXPECTED_BODIES:
+            self._send(200, UNEXPECTED_BODIES[mode])
+        elif body.get("stream"):
+            text = json.dumps(EXPLANATION)
+            lines = [
+                json.dumps({"response": text[i:i + 40], "done": False})
+                for i in range(0, len(text), 40)
+            ] + [json.dumps({"response": "", "done": True})]
+            self._send(200, "\n".join(lines).encode())
+        else:
+            self._send(200, json.dumps({"response": json.dumps(EXPLANATION), "done": True}).encode())
+
+    def _send(self, status, payload):
+        try:
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass    # the client gave up (deadline tests)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _explain(url, mode, **kwargs):
+    async def run():
+        client = AsyncOllamaClient(url=f"{url}/{mode}/api/generate", **kwargs)
+        try:
+            return await generate_ai_explanation_async({"scenario": "x"}, client=client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_success(stub_url):
+    assert _explain(stub_url, "ok") == EXPLANATION
+
+
+def test_timeout_falls_back(stub_url):
+    assert _explain(stub_url, "slow", timeout_s=0.2) is None
+
+
+def test_http_error_falls_back(stub_url):
+    assert _explain(stub_url, "error") is None
+
+
+def test_malformed_body_falls_back(stub_url):
+    assert _explain(stub_url, "garbage") is None
+
+
+@pytest.mark.parametrize("mode", sorted(UNEXPECTED_BODIES))
+def test_unexpected_json_falls_back(stub_url, mode):
+    assert _explain(stub_url, mode) is None
+
+
+@pytest.mark.parametrize("mode", ["list", "string"])
+def test_stream_stops_on_unexpected_chunk(stub_url, mode):
+    async def run():
+        client = AsyncOllamaClient(url=f"{stub_url}/{mode}/api/generate")
+        try:
+            return [token async for token in client.stream("prompt")]
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == []
+
+
+def test_stream_assembles_completion(stub_url):
+    async def run():
+        client = AsyncOllamaClient(url=f"{stub_url}/ok/api/generate")
+        try:
+            return "".join([token async for token in client.stream("prompt")])
+        finally:
+            await client.aclose()
+
+    assert json.loads(asyncio.run(run())) == EXPLANATION
+
+
+def test_loop_change_replaces_pool(stub_url):
+    client = AsyncOllamaClient(url=f"{stub_url}/ok/api/generate")
+
+    async def generate():
+        return await client.generate("prompt"), client._client
+
+    first, pool = asyncio.run(generate())
+    second, replacement = asyncio.run(generate())
+
+    assert first and second
+    assert replacement is not pool
+    assert pool.is_closed
+    asyncio.run(client.aclose())
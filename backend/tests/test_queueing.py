@@ -0,0 +1,71 @@
+# tests/test_queueing.py
+
+import numpy as np
+import pytest
+
+from app.core.queueing import RHO_MAX, queueing_delay
+
+# One service, 100 req/s, 10 ms per request: c = 1 server (M/M/1)
+MM1 = (np.array([100.0]), np.array([10.0]), np.array([1.0]))
+# Four services with different server counts and traffic shares
+FLEET = (np.array([500.0, 200.0, 800.0, 50.0]), np.array([60.0, 120.0, 15.0, 300.0]), np.array([1.0, 0.6, 0.4, 0.2]))
+
+
+def _wait(volume, model=MM1, **kwargs):
+    wait_ms, _ = queueing_delay(np.asarray(volume, dtype=float), *model, **kwargs)
+    return wait_ms
+
+
+def test_single_server_is_exact_mm1():
+    rho = np.array([0.1, 0.5, 0.9])
+    wait = _wait(rho * 100)[:, 0]
+    assert wait == pytest.approx(10.0 * rho / (1 - rho))
+
+
+def test_wait_grows_monotonically_with_load():
+    volume = np.linspace(0, 1000, 401)
+    wait = _wait(volume, FLEET)
+    assert np.all(np.diff(wait, axis=0) >= 0)
+    assert np.all(wait >= 0)
+
+
+def test_wait_is_unbounded_as_utilization_nears_one():
+    rho = 1 - np.logspace(-1, np.log10(1 - RHO_MAX), 12)    # 0.9 ... RHO_MAX
+    wait = _wait(rho * 100)[:, 0]
+    assert np.all(np.diff(wait) > 0)
+    assert wait[-1] == pytest.approx(10.0 * RHO_MAX / (1 - RHO_MAX))
+    assert wait[-1] > 5 * wait[0]
+
+    # Past saturation the backlog keeps growing, so the wait has no bound
+    overload = _wait(np.full(600, 120.0))[:, 0]
+    assert np.all(np.diff(overload) > 0)
+    assert overload[-1] > 100 * overload[0]
+
+
+def test_backlog_matches_lindley_recursion():
+    rng = np.random.default_rng(0)
+    volume = rng.uniform(60, 140, size=(3, 50))
+    carried = np.array([[0.0], [25.0], [0.0]])
+
+    _, queue = queueing_delay(volume, *MM1, backlog=carried)
+
+    for run in range(3):
+        q = carried[run, 0]
+        for t in range(50):
+            q = max(0.0, q + volume[run, t] - 100.0)
+            assert queue[run, t, 0] == pytest.approx(q)
+
+
+def test_no_backlog_below_capacity():
+    wait_ms, queue = queueing_delay(np.full((2, 30), 240.0), *FLEET)
+    assert not queue.any()
+    assert np.allclose(wait_ms, wait_ms[:, :1])
+
+
+def test_last_only_is_the_last_tick():
+    volume = np.random.default_rng(1).uniform(100, 1200, size=(5, 40))
+    full_wait, full_queue = queueing_delay(volume, *FLEET)
+    last_wait, last_queue = queueing_delay(volume, *FLEET, last_only=True)
+
+    assert np.allclose(last_wait[:, 0], full_wait[:, -1])
+    assert np.allclose(last_queue[:, 0], full_queue[:, -1])
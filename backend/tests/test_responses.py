@@ -0,0 +1,83 @@
+# tests/test_responses.py
+#
+# FastJSONResponse routes skip FastAPI's response_model validation; the
+# content builders must still produce exactly the documented schema.
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.core.runstore as runstore
+from app.main import app
+from app.models.runs import RunBlastRadius, RunMetricScan
+from app.models.session import SessionDelta, SessionDeltaColumns, SessionState, SessionStateColumns
+from app.models.simulation_state import SimulationState, SimulationStateColumns
+
+SCENARIO = "database_latency_spike"
+
+STATE_MODELS = {"points": SimulationState, "columns": SimulationStateColumns}
+SESSION_MODELS = {"points": SessionState, "columns": SessionStateColumns}
+DELTA_MODELS = {"points": SessionDelta, "columns": SessionDeltaColumns}
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    store = runstore.RunStore(str(tmp_path / "runstore"))
+    monkeypatch.setattr(runstore, "_shared_store", store)
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    store.close()
+
+
+def assert_matches(model, response):
+    """
+    The body validates and nothing is dropped or coerced on the way.
+    """
+    assert response.status_code in (200, 201), response.text
+    body = response.json()
+    assert model.model_validate(body).model_dump(mode="json") == body
+
+
+@pytest.mark.parametrize("layout", sorted(STATE_MODELS))
+def test_simulation_routes(client, layout):
+    model = STATE_MODELS[layout]
+    params = {"layout": layout}
+
+    baseline = client.post("/simulate", params=params, json={"seed": 1})
+    assert_matches(model, baseline)
+    simulated = client.post("/simulate", params=params, json={"scenario": SCENARIO, "seed": 1})
+    assert_matches(model, simulated)
+
+    assert_matches(model, client.post("/inject-failure", params=params, json={"scenario": SCENARIO, "seed": 2}))
+    assert_matches(model, client.post("/inject-failure", params=params, json={
+        "faults": [{"scenario": SCENARIO, "start": 3, "ramp": 2}, {"scenario": "retry_amplification", "start": 10}],
+        "seed": 2,
+    }))
+
+    stored = client.get(f"/runs/{simulated.json()['run_id']}", params=params)
+    assert_matches(model, stored)
+    assert stored.json() == simulated.json()
+
+
+@pytest.mark.parametrize("layout", sorted(SESSION_MODELS))
+def test_session_routes(client, layout):
+    params = {"layout": layout}
+    created = client.post("/sessions", params=params, json={"scenario": SCENARIO, "seed": 3, "window": 10})
+    assert created.status_code == 201
+    assert_matches(SESSION_MODELS[layout], created)
+
+    session_id = created.json()["session_id"]
+    assert_matches(DELTA_MODELS[layout], client.post(f"/sessions/{session_id}/tick", params={**params, "ticks": 4}))
+    assert_matches(SESSION_MODELS[layout], client.get(f"/sessions/{session_id}", params=params))
+
+
+def test_run_analysis_routes(client):
+    for seed in range(3):
+        run_id = client.post("/simulate", json={"scenario": SCENARIO, "seed": seed}).json()["run_id"]
+
+    assert_matches(RunBlastRadius, client.get(f"/runs/{run_id}/blast-radius"))
+
+    scan = client.get("/runs/scan", params={"metric": "latency_ms"})
+    assert_matches(RunMetricScan, scan)
+    assert len(scan.json()["runs"]) == 3
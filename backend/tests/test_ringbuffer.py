@@ -0,0 +1,134 @@
+# tests/test_ringbuffer.py
+
+import numpy as np
+import pytest
+
+from app.core.ringbuffer import MetricHistory, Ring
+from app.core.series import MetricSeries
+
+
+# -----------------------------
+# Ring
+# -----------------------------
+
+def test_push_wraps_and_keeps_newest():
+    ring = Ring(3, (("time", np.int64), ("value", np.float64)))
+    for t in range(5):
+        ring.push(t, t * 10.0)
+
+    time, value = ring.view()
+    assert time.tolist() == [2, 3, 4]
+    assert value.tolist() == [20.0, 30.0, 40.0]
+    assert len(ring) == 3
+    assert ring.last() == (4, 40.0)
+    assert ring.view(2)[0].tolist() == [3, 4]
+    assert ring.view(10)[0].tolist() == [2, 3, 4]
+
+
+def test_extend_longer_than_capacity():
+    ring = Ring(4, (("value", np.float64),))
+    ring.push(-1.0)
+    ring.extend(np.arange(10, dtype=float))
+
+    assert ring.view()[0].tolist() == [6.0, 7.0, 8.0, 9.0]
+    ring.push(10.0)
+    assert ring.view()[0].tolist() == [7.0, 8.0, 9.0, 10.0]
+
+
+def test_set_last_after_wrap():
+    ring = Ring(2, (("value", np.float64),))
+    for value in (1.0, 2.0, 3.0):
+        ring.push(value)
+    ring.set_last(9.0)
+    assert ring.view()[0].tolist() == [2.0, 9.0]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        Ring(0, (("value", np.float64),))
+
+
+# -----------------------------
+# Metric History
+# -----------------------------
+
+def _expected_rollup(time, values, resolution):
+    buckets = {}
+    for t, v in zip(time, values):
+        buckets.setdefault(t - t % resolution, []).append(v)
+    return buckets
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_rollups_match_buckets(bulk):
+    time = np.array([0, 1, 4, 9, 10, 15, 15, 29, 60, 61, 125])
+    values = np.arange(len(time), dtype=float) * 1.5
+    history = MetricHistory(capacity=64)
+    if bulk:
+        history.extend(MetricSeries(time[:3], values[:3]))
+        history.extend(MetricSeries(time[3:], values[3:]))
+    else:
+        for t, v in zip(time.tolist(), values.tolist()):
+            history.append(t, v)
+
+    for resolution in (1, 10, 60):
+        expected = _expected_rollup(time.tolist(), values.tolist(), resolution)
+        assert history.rollup(resolution, "count").time.tolist() == list(expected)
+        assert history.rollup(resolution, "count").values.tolist() == [len(v) for v in expected.values()]
+        assert history.rollup(resolution, "min").values.tolist() == [min(v) for v in expected.values()]
+        assert history.rollup(resolution, "max").values.tolist() == [max(v) for v in expected.values()]
+        assert np.allclose(history.rollup(resolution, "avg").values, [np.mean(v) for v in expected.values()])
+
+
+def test_bulk_extend_matches_appends():
+    rng = np.random.default_rng(3)
+    time = np.cumsum(rng.integers(0, 4, 200))
+    values = rng.normal(100, 10, 200)
+
+    one_by_one = MetricHistory(capacity=50, rollup_capacity=8)
+    for t, v in zip(time.tolist(), values.tolist()):
+        one_by_one.append(t, v)
+    bulk = MetricHistory.from_series(MetricSeries(time, values), capacity=50, rollup_capacity=8)
+
+    assert np.array_equal(one_by_one.window().values, bulk.window().values)
+    for resolution in (1, 10, 60):
+        for how in ("min", "max", "sum", "count"):
+            a, b = one_by_one.rollup(resolution, how), bulk.rollup(resolution, how)
+            assert np.array_equal(a.time, b.time)
+            assert np.allclose(a.values, b.values)
+
+
+def test_rollup_ring_wraps():
+    history = MetricHistory(capacity=4, resolutions=(10,), rollup_capacity=3)
+    for t in range(0, 50):
+        history.append(t, float(t))
+
+    assert history.window().time.tolist() == [46, 47, 48, 49]
+    avg = history.rollup(10)
+    assert avg.time.tolist() == [20, 30, 40]
+    assert avg.values.tolist() == [24.5, 34.5, 44.5]
+
+
+def test_time_must_not_go_back():
+    history = MetricHistory(capacity=8)
+    history.append(5, 1.0)
+    with pytest.raises(ValueError):
+        history.append(4, 1.0)
+    with pytest.raises(ValueError):
+        history.extend(MetricSeries(np.arange(3, 3 + 20), np.zeros(20)))
+
+
+def test_range_picks_finest_covering_resolution():
+    history = MetricHistory(capacity=20, resolutions=(10, 60), rollup_capacity=100)
+    for t in range(300):
+        history.append(t, 1.0)
+
+    # Raw points only reach back to t=280
+    resolution, series = history.range(285, 300)
+    assert resolution is None and series.time.tolist() == list(range(285, 300))
+
+    resolution, series = history.range(100, 300)
+    assert resolution == 10 and len(series) == 20
+
+    resolution, series = history.range(0, 300, max_points=5)
+    assert resolution == 60 and series.time.tolist() == [0, 60, 120, 180, 240]
@@ -0,0 +1,82 @@
+# tests/test_rules.py
+
+import numpy as np
+import pytest
+
+from app.core.rules import (
+    DEFAULT_THRESHOLDS,
+    STATUS_BY_CODE,
+    THRESHOLD_SETS,
+    HealthStatus,
+    HealthThresholds,
+    classify_health,
+    evaluate_health,
+    service_thresholds,
+)
+
+SERVICES = ["api_gateway", "orders_service", "database", "external_dependency"]
+
+
+def reference_health(latency_ms, error_rate_pct, t: HealthThresholds) -> HealthStatus:
+    """
+    The original scalar rule, one service at a time.
+    """
+    if latency_ms >= t.latency_unhealthy_ms or error_rate_pct >= t.error_rate_unhealthy_pct:
+        return HealthStatus.UNHEALTHY
+    if latency_ms >= t.latency_degraded_ms or error_rate_pct >= t.error_rate_degraded_pct:
+        return HealthStatus.DEGRADED
+    return HealthStatus.HEALTHY
+
+
+def _grid(t: HealthThresholds):
+    # Every threshold, just below / at / above it, on both metrics
+    latency = [0.0] + [x + d for x in (t.latency_degraded_ms, t.latency_unhealthy_ms) for d in (-1e-9, 0.0, 1e-9)]
+    errors = [0.0] + [x + d for x in (t.error_rate_degraded_pct, t.error_rate_unhealthy_pct) for d in (-1e-9, 0.0, 1e-9)]
+    return np.meshgrid(latency, errors, indexing="ij")
+
+
+@pytest.mark.parametrize("name", sorted(THRESHOLD_SETS))
+def test_shared_thresholds_match_scalar_rule(name):
+    t = THRESHOLD_SETS[name]
+    latency, errors = _grid(t)
+    codes = classify_health(latency, errors, t)
+
+    assert codes.dtype == np.int8 and codes.shape == latency.shape
+    for (i, j), code in np.ndenumerate(codes):
+        expected = reference_health(latency[i, j], errors[i, j], t)
+        assert STATUS_BY_CODE[code] == expected
+        assert evaluate_health(latency[i, j], errors[i, j], t) == expected
+
+
+def test_per_service_overrides_match_scalar_rule():
+    overrides = {"database": THRESHOLD_SETS["lenient"], "external_dependency": THRESHOLD_SETS["strict"]}
+    per_service = service_thresholds(SERVICES, overrides)
+    assert per_service == (DEFAULT_THRESHOLDS, DEFAULT_THRESHOLDS, THRESHOLD_SETS["lenient"], THRESHOLD_SETS["strict"])
+
+    rng = np.random.default_rng(7)
+    latency = rng.uniform(0, 1500, size=(40, 25, len(SERVICES)))
+    errors = rng.uniform(0, 15, size=latency.shape)
+    codes = classify_health(latency, errors, per_service)
+
+    for index in np.ndindex(latency.shape):
+        t = per_service[index[-1]]
+        assert STATUS_BY_CODE[codes[index]] == reference_health(latency[index], errors[index], t)
+
+
+def test_shared_and_repeated_thresholds_agree():
+    rng = np.random.default_rng(3)
+    latency = rng.uniform(0, 1500, size=(100, len(SERVICES)))
+    errors = rng.uniform(0, 15, size=latency.shape)
+
+    repeated = service_thresholds(SERVICES, default=THRESHOLD_SETS["strict"])
+    assert np.array_equal(
+        classify_health(latency, errors, THRESHOLD_SETS["strict"]),
+        classify_health(latency, errors, repeated),
+    )
+
+
+def test_worse_metric_wins():
+    assert classify_health(1000.0, 0.0).item() == 2
+    latency = np.array([100.0, 400.0, 950.0, 100.0, 400.0])
+    errors = np.array([0.0, 0.0, 0.0, 9.0, 3.5])
+    assert classify_health(latency, errors).tolist() == [0, 1, 2, 2, 1]
@@ -0,0 +1,105 @@
+# tests/test_runstore.py
+
+import os
+
+import numpy as np
+import pytest
+
+from app.core.rng import MAX_SEED
+from app.core.runstore import RunStore
+from app.core.simulation import run_simulation
+
+SCENARIO = "database_latency_spike"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RunStore(str(tmp_path), segment_bytes=64 * 1024)
+    yield store
+    store.close()
+
+
+def test_round_trip(store):
+    result = run_simulation(SCENARIO, seed=11)
+    store.put(result, "simulate", SCENARIO)
+
+    stored = store.get(result.run_id)
+    assert (stored.kind, stored.scenario, stored.seed) == ("simulate", SCENARIO, 11)
+    assert stored.result.services == result.services
+    assert stored.result.severity == result.severity
+    for name, series in result.metrics.items():
+        assert np.array_equal(stored.result.metrics[name].time, series.time)
+        assert np.array_equal(stored.result.metrics[name].values, series.values)
+        assert not stored.result.metrics[name].values.flags.writeable
+
+    timeline, expected = stored.result.timeline, result.timeline
+    assert timeline.service_keys == expected.service_keys
+    for column in ("time", "latency_ms", "error_rate_pct", "status"):
+        assert np.array_equal(getattr(timeline, column), getattr(expected, column))
+
+
+def test_put_is_idempotent_and_persists(tmp_path, store):
+    result = run_simulation(SCENARIO, seed=12)
+    store.put(result, "simulate", SCENARIO)
+    store.put(result, "simulate", SCENARIO)
+    assert len(store) == 1
+
+    reopened = RunStore(str(tmp_path))
+    try:
+        assert reopened.get(result.run_id).seed == 12
+        assert [run["run_id"] for run in reopened.list()] == [result.run_id]
+    finally:
+        reopened.close()
+
+
+def test_scan_and_filters(store):
+    for seed in range(3):
+        store.put(run_simulation(SCENARIO, seed=seed), "simulate", SCENARIO)
+    store.put(run_simulation(None, seed=0), "simulate")
+
+    assert len(list(store.scan("latency_ms"))) == 4
+    assert len(list(store.scan("latency_ms", scenario=SCENARIO))) == 3
+    assert list(store.scan("no_such_metric")) == []
+    assert store.get("missing") is None
+
+
+@pytest.mark.parametrize("seed", [-1, MAX_SEED])
+def test_seed_outside_sqlite_range_is_rejected(store, seed):
+    result = run_simulation(SCENARIO, seed=0)
+    result.seed = seed
+    with pytest.raises(ValueError, match="seed"):
+        store.put(result, "simulate", SCENARIO)
+    assert len(store) == 0
+
+
+def test_retention_by_run_count(tmp_path):
+    store = RunStore(str(tmp_path), max_runs=3)
+    try:
+        results = [run_simulation(SCENARIO, seed=seed) for seed in range(5)]
+        for result in results:
+            store.put(result, "simulate", SCENARIO)
+
+        assert store.evict() == 2
+        assert {run["run_id"] for run in store.list()} == {r.run_id for r in results[2:]}
+        assert store.get(results[0].run_id) is None
+    finally:
+        store.close()
+
+
+def test_retention_by_bytes_deletes_old_segments(tmp_path):
+    store = RunStore(str(tmp_path), segment_bytes=8 * 1024, max_bytes=32 * 1024)
+    try:
+        results = [run_simulation(SCENARIO, seed=seed) for seed in range(40)]
+        for result in results:
+            store.put(result, "simulate", SCENARIO)
+        store.evict()
+
+        segments = [name for name in os.listdir(tmp_path) if name.startswith("segment-")]
+        assert sum(os.path.getsize(tmp_path / name) for name in segments) <= 32 * 1024 + 8 * 1024
+        assert "segment-000000.bin" not in segments
+        # The newest runs are kept and still readable
+        newest = store.get(results[-1].run_id)
+        assert np.array_equal(newest.result.metrics["latency_ms"].values, results[-1].metrics["latency_ms"].values)
+        assert store.get(results[0].run_id) is None
+    finally:
+        store.close()
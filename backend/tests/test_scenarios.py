@@ -0,0 +1,78 @@
+# tests/test_scenarios.py
+
+import copy
+import json
+
+import pytest
+
+from app.core.scenarios import SCENARIOS_FILE, compile_scenario, load_scenarios
+from app.core.simulation import METRIC_RANGES, SCENARIO_PROFILES, SERVICE_PROFILES, SEVERITY_TIERS, run_simulation
+
+with open(SCENARIOS_FILE, encoding="utf-8") as f:
+    DOCUMENT = json.load(f)
+
+SPEC = DOCUMENT["scenarios"]["database_latency_spike"]
+
+
+def _compile(spec, name="test"):
+    return compile_scenario(name, spec, SERVICE_PROFILES, METRIC_RANGES, SEVERITY_TIERS)
+
+
+def test_scenario_file_compiles():
+    profiles = load_scenarios(SCENARIOS_FILE, SERVICE_PROFILES, METRIC_RANGES, SEVERITY_TIERS)
+
+    assert set(profiles) == set(DOCUMENT["scenarios"]) == set(SCENARIO_PROFILES)
+    for name, profile in profiles.items():
+        spec = DOCUMENT["scenarios"][name]
+        assert profile.target == spec["target"]
+        for code, tier in enumerate(SEVERITY_TIERS):
+            assert tuple(profile.latency_bounds[code]) == tuple(spec["severity"][tier]["latency_ms"])
+            assert tuple(profile.error_bounds[code]) == tuple(spec["severity"][tier]["error_rate_pct"])
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIO_PROFILES))
+def test_runs_follow_the_declared_ranges(name):
+    profile = SCENARIO_PROFILES[name]
+    for seed in range(30):
+        result = run_simulation(name, seed=seed)
+        target = result.services[profile.target]
+        # Queueing delay and propagation only add on top of the drawn values
+        assert target.latency_ms >= profile.latency_ms[result.severity][0]
+        assert target.error_rate_pct >= min(profile.error_rate_pct[result.severity][0], 0.15)
+
+
+def _broken(path, value):
+    spec = copy.deepcopy(SPEC)
+    node = spec
+    for key in path[:-1]:
+        node = node[key]
+    if value is None:
+        del node[path[-1]]
+    else:
+        node[path[-1]] = value
+    return spec
+
+
+@pytest.mark.parametrize("path, value, message", [
+    (("target",), "mainframe", "unknown target service"),
+    (("severity", "critical"), None, "missing severity tiers"),
+    (("severity", "minor", "latency_ms"), [700, 400], "expected \\[low, high\\]"),
+    (("severity", "minor", "error_rate_pct"), [0.01], "expected \\[low, high\\]"),
+    (("severity", "major", "latency_ms"), ["fast", "slow"], "expected \\[low, high\\]"),
+    (("metric_multipliers", "cpu"), [1, 2], "unknown metric"),
+])
+def test_bad_spec_is_rejected(path, value, message):
+    with pytest.raises(ValueError, match=message):
+        _compile(_broken(path, value))
+
+
+def test_bad_file_fails_the_load(tmp_path):
+    path = tmp_path / "scenarios.json"
+    path.write_text(json.dumps({"scenarios": {"ok": SPEC, "bad": _broken(("target",), "mainframe")}}))
+    with pytest.raises(ValueError, match="bad: unknown target"):
+        load_scenarios(str(path), SERVICE_PROFILES, METRIC_RANGES, SEVERITY_TIERS)
+
+
+def test_inject_is_optional():
+    assert _compile(_broken(("inject",), None)).injection is None
+    assert _compile(SPEC).injection == (SPEC["inject"]["latency_ms"], SPEC["inject"]["error_rate_pct"])
@@ -0,0 +1,121 @@
+# tests/test_sessions.py
+
+import threading
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import app.core.session as session_module
+from app.core.session import SessionStore, SimulationSession
+from app.core.ticker import SimulationTicker
+from app.main import app
+
+SCENARIO = "database_latency_spike"
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _apply(state, delta):
+    """
+    Client side of the delta protocol (columns layout).
+    """
+    services = {svc["id"]: svc for svc in state["topology"]["services"]}
+    services.update({svc["id"]: svc for svc in delta["services"]})
+    state["topology"]["services"] = list(services.values())
+    state["system_mode"] = delta["system_mode"]
+    state["tick"] = delta["tick"]
+
+    for name, new in delta["metrics"].items():
+        series = state["metrics"][name]
+        points = [
+            (t, v)
+            for t, v in zip(series["time"] + new["time"], series["values"] + new["values"])
+            if t >= delta["window_start"]
+        ]
+        series["time"] = [t for t, _ in points]
+        series["values"] = [v for _, v in points]
+
+
+@pytest.mark.parametrize("scenario", [None, SCENARIO])
+def test_applied_deltas_rebuild_full_state(client, scenario):
+    state = client.post("/sessions", params={"layout": "columns"}, json={
+        "scenario": scenario, "seed": 8, "window": 12,
+    }).json()
+    session_id = state["session_id"]
+
+    # Short polls, then one longer than the window
+    for ticks in (1, 1, 3, 5, 20, 2):
+        delta = client.post(f"/sessions/{session_id}/tick", params={"layout": "columns", "ticks": ticks}).json()
+        assert delta["window_start"] == max(0, delta["tick"] - 12)
+        assert all(len(series["time"]) == min(ticks, 12) for series in delta["metrics"].values())
+        _apply(state, delta)
+
+        full = client.get(f"/sessions/{session_id}", params={"layout": "columns"}).json()
+        assert state["tick"] == full["tick"]
+        assert state["system_mode"] == full["system_mode"]
+        assert state["topology"]["services"] == full["topology"]["services"]
+        assert state["metrics"] == full["metrics"]
+
+
+def test_delta_holds_exactly_the_changed_services():
+    session = SimulationSession(SCENARIO, seed=2, window=5)
+
+    def reported():
+        return {
+            key: (svc.status, round(svc.latency_ms, 1), round(svc.error_rate_pct, 2))
+            for key, svc in session.services.items()
+        }
+
+    for _ in range(20):
+        before = reported()
+        delta = session.advance()
+        after = reported()
+        assert set(delta.services) == {key for key in after if after[key] != before[key]}
+
+
+def test_session_window_is_the_ticker_sequence():
+    session = SimulationSession(SCENARIO, seed=4, window=6)
+    ticker = SimulationTicker(SCENARIO, seed=4, kind="session")
+    expected = ticker.advance(6).metrics["latency_ms"].values.tolist()
+
+    for ticks in (2, 3, 4):
+        session.advance(ticks)
+        expected += ticker.advance(ticks).metrics["latency_ms"].values.tolist()
+
+    window = session.metrics["latency_ms"]
+    assert window.time.tolist() == list(range(9, 15))
+    assert np.array_equal(window.values, expected[-6:])
+
+
+def test_store_evicts_least_recently_used_and_idle(monkeypatch):
+    store = SessionStore(max_sessions=2, ttl_s=60)
+    a, b = store.create(None, seed=1, window=2), store.create(None, seed=2, window=2)
+    assert store.get(a.id) is a
+    c = store.create(None, seed=3, window=2)
+
+    assert store.get(b.id) is None
+    assert store.get(a.id) is a and store.get(c.id) is c
+
+    now = session_module.time.monotonic()
+    monkeypatch.setattr(session_module.time, "monotonic", lambda: now + 61)
+    assert store.get(a.id) is None and len(store) == 0
+
+
+def test_shared_store_is_created_once(monkeypatch):
+    monkeypatch.setattr(session_module, "_shared_store", None)
+    stores = []
+    threads = [
+        threading.Thread(target=lambda: stores.append(session_module.get_session_store()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(store) for store in stores}) == 1
@@ -0,0 +1,59 @@
+# tests/test_simulate_stream.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.encoding import service_nodes, system_mode
+from app.core.ticker import SimulationTicker
+from app.main import app
+
+from .sse import parse_sse
+
+SCENARIO = "database_latency_spike"
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _stream(client, **params):
+    response = client.get("/simulate/stream", params={"tick_ms": 50, **params})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    return parse_sse(response.text)
+
+
+def test_one_tick_event_per_tick(client):
+    frames = _stream(client, scenario=SCENARIO, seed=4, ticks=3)
+
+    assert [frame["event"] for frame in frames] == ["tick"] * 3
+    assert [frame["id"] for frame in frames] == ["0", "1", "2"]
+    assert [frame["data"]["tick"] for frame in frames] == [0, 1, 2]
+    assert len({frame["data"]["run_id"] for frame in frames}) == 1
+    assert all(frame["data"]["seed"] == 4 for frame in frames)
+
+
+def test_frames_are_the_ticker_sequence(client):
+    frames = _stream(client, scenario=SCENARIO, seed=11, ticks=4)
+
+    ticker = SimulationTicker(SCENARIO, seed=11)
+    for frame in frames:
+        result = ticker.advance()
+        data = frame["data"]
+        assert data["system_mode"] == system_mode(result)
+        assert data["services"] == service_nodes(result.services)
+        assert data["metrics"] == {name: series[0] for name, series in result.metrics.items()}
+
+
+def test_seeded_stream_replays(client):
+    first = _stream(client, seed=2, ticks=3)
+    second = _stream(client, seed=2, ticks=3)
+    assert first == second
+
+
+@pytest.mark.parametrize("params", [{"tick_ms": 10}, {"ticks": 0}])
+def test_bad_stream_parameters_are_422(client, params):
+    assert client.get("/simulate/stream", params=params).status_code == 422
@@ -0,0 +1,74 @@
+# tests/test_singleflight.py
+
+import asyncio
+
+from app.ai.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def run():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await release.wait()
+            return {"v": len(calls)}
+
+        waiters = [asyncio.ensure_future(flight.do("k", work)) for _ in range(5)]
+        other = asyncio.ensure_future(flight.do("other", work))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        await other
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(run())
+    assert len(calls) == 2
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"calls": 6, "executions": 2, "coalesced": 4, "inflight": 0}
+
+
+def test_failure_reaches_every_waiter_and_is_not_kept():
+    async def run():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError("model down")
+
+        results = await asyncio.gather(
+            flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+        )
+
+        async def ok():
+            return "fresh"
+
+        return flight, results, await flight.do("k", ok)
+
+    flight, results, retry = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retry == "fresh"
+    assert flight.stats()["executions"] == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_work():
+    async def run():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        return first, await second
+
+    first, result = asyncio.run(run())
+    assert first.cancelled()
+    assert result == "done"
@@ -0,0 +1,69 @@
+# tests/test_sweep.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.sweep as sweep_api
+from app.main import app
+
+from .sse import parse_sse
+
+GRID = {
+    "scenarios": ["database_latency_spike"],
+    "severities": ["minor", "critical"],
+    "threshold_sets": ["default", "strict"],
+    "runs_per_cell": 400,
+    "chunk_size": 100,
+    "seed": 21,
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_seeded_sweep_is_deterministic(client):
+    first = client.post("/sweep", json=GRID)
+    assert first.status_code == 200
+
+    # Chunk seeds come from (seed, cell, chunk): worker count does not matter
+    for workers in (1, 3):
+        again = client.post("/sweep", json={**GRID, "workers": workers})
+        assert again.json() == first.json()
+
+    result = first.json()
+    assert result["seed"] == 21
+    assert result["axes"]["severity"] == ["minor", "critical"]
+    for cell in (0, 1):
+        for thresholds in (0, 1):
+            totals = [
+                sum(result[f"p_{status}"][0][cell][thresholds][k] for status in ("healthy", "degraded", "unhealthy"))
+                for k in range(len(result["axes"]["service"]))
+            ]
+            assert totals == pytest.approx([1.0] * len(totals))
+
+    other = client.post("/sweep", json={**GRID, "seed": 22}).json()
+    assert other["p_unhealthy"] != result["p_unhealthy"]
+
+
+def test_stream_reports_progress_then_same_result(client):
+    response = client.post("/sweep/stream", json=GRID)
+    frames = parse_sse(response.text)
+
+    progress = [frame["data"] for frame in frames if frame["event"] == "progress"]
+    assert [p["done"] for p in progress] == list(range(1, 17))
+    assert all(p["total"] == 16 for p in progress)
+    assert frames[-1]["event"] == "result"
+    assert frames[-1]["data"] == client.post("/sweep", json=GRID).json()
+
+
+def test_oversized_or_invalid_grid_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(sweep_api, "MAX_SWEEP_RUNS", 1599)
+    assert client.post("/sweep", json=GRID).status_code == 400
+
+    frames = parse_sse(client.post("/sweep/stream", json=GRID).text)
+    assert [frame["event"] for frame in frames] == ["error"]
+
+    assert client.post("/sweep", json={**GRID, "severities": ["apocalyptic"]}).status_code == 400
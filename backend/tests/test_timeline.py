@@ -0,0 +1,67 @@
+# tests/test_timeline.py
+
+import math
+
+import numpy as np
+import pytest
+
+from app.core.simulation import SCENARIO_PROFILES, run_simulation
+from app.core.timeline import HealthTimeline
+
+
+@pytest.mark.parametrize("scenario", ["database_latency_spike", "external_dependency_degradation"])
+def test_scenario_degradation_starts_after_first_tick(scenario):
+    target = SCENARIO_PROFILES[scenario].target
+    onsets = []
+    for seed in range(20):
+        result = run_simulation(scenario, seed=seed)
+        timeline = result.timeline
+
+        # Last tick is the reported state
+        assert timeline.latency_ms[-1].tolist() == [s.latency_ms for s in result.services.values()]
+        assert timeline.status[0, timeline.column(target)] == 0
+
+        onset = timeline.summary()[target]["time_to_degraded"]
+        if onset is not None:
+            onsets.append(onset)
+
+    assert onsets and all(t > 0 for t in onsets)
+    assert len(set(onsets)) > 1
+
+
+def test_seeded_timeline_replays():
+    a = run_simulation("database_latency_spike", seed=7).timeline
+    b = run_simulation("database_latency_spike", seed=7).timeline
+    assert np.array_equal(a.latency_ms, b.latency_ms)
+    assert np.array_equal(a.status, b.status)
+
+
+def test_stats_match_transitions():
+    # One service: healthy, degraded from tick 2, unhealthy at 4, healthy at 6
+    status = np.array([[0], [0], [1], [1], [2], [1], [0], [0]], dtype=np.int8)
+    timeline = HealthTimeline(
+        service_keys=["svc"],
+        time=np.arange(10, 18),
+        latency_ms=np.zeros(status.shape),
+        error_rate_pct=np.zeros(status.shape),
+        status=status,
+    )
+    stats = timeline.summary()["svc"]
+
+    assert stats["time_to_degraded"] == 2.0
+    assert stats["time_to_unhealthy"] == 4.0
+    assert stats["recovery_time"] == 4.0
+    assert stats["time_in_state"] == {"healthy": 4, "degraded": 3, "unhealthy": 1}
+
+
+def test_stats_never_degraded():
+    timeline = HealthTimeline(
+        service_keys=["svc"],
+        time=np.arange(3),
+        latency_ms=np.zeros((3, 1)),
+        error_rate_pct=np.zeros((3, 1)),
+        status=np.zeros((3, 1), dtype=np.int8),
+    )
+    stats = timeline.stats()
+    assert math.isnan(stats["time_to_degraded"][0])
+    assert math.isnan(stats["recovery_time"][0])
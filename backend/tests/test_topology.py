@@ -0,0 +1,76 @@
+# tests/test_topology.py
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.propagation import DependencyCycleError, PropagationGraph
+from app.core.topology import DEFAULT_TOPOLOGY, compile_topology
+from app.main import app
+
+
+def _spec(services, edges):
+    return {
+        "services": services,
+        "dependencies": [{"source": s, "target": t} for s, t in edges],
+    }
+
+
+def test_compiles_dag():
+    topology = compile_topology("shop", _spec(["api", "db", "cache"], [("api", "db"), ("api", "cache")]))
+    assert topology.services == ("api", "db", "cache")
+    assert topology.dependencies == (("api", "db"), ("api", "cache"))
+    assert topology.graph.level.tolist() == [1, 0, 0]
+    assert topology.graph_for(("db", "api")).nodes == ("db", "api")
+
+
+@pytest.mark.parametrize("edges", [
+    [("a", "a")],
+    [("a", "b"), ("b", "a")],
+    [("a", "b"), ("b", "c"), ("c", "a")],
+])
+def test_cycle_is_rejected(edges):
+    with pytest.raises(DependencyCycleError) as error:
+        compile_topology("loop", _spec(["a", "b", "c"], edges))
+    assert isinstance(error.value, ValueError)
+
+
+def test_cycle_error_names_its_nodes():
+    with pytest.raises(DependencyCycleError) as error:
+        PropagationGraph(["a", "b", "c", "d"], [("a", "b"), ("b", "c"), ("c", "b"), ("d", "a")])
+    assert set(error.value.nodes) >= {"b", "c"}
+
+
+@pytest.mark.parametrize("spec, message", [
+    (_spec([], []), "non-empty"),
+    (_spec(["a", "a"], []), "duplicate services"),
+    (_spec(["a", "b"], [("a", "x")]), "unknown service"),
+    (_spec(["a", "b"], [("a", "b"), ("a", "b")]), "duplicate edge"),
+    ({"services": ["a", "b"], "dependencies": [{"source": "a", "target": "b", "degraded": [1]}]}, "expected"),
+])
+def test_invalid_spec_is_rejected(spec, message):
+    with pytest.raises(ValueError, match=message):
+        compile_topology("bad", spec)
+
+
+def test_unknown_services_are_rejected():
+    with pytest.raises(ValueError, match="unknown services"):
+        compile_topology("bad", _spec(["api", "mystery"], []), known_services=["api"])
+
+
+# -----------------------------
+# HTTP caching
+# -----------------------------
+
+def test_latest_version_is_revalidated_and_versions_are_immutable():
+    with TestClient(app) as client:
+        latest = client.get(f"/topologies/{DEFAULT_TOPOLOGY}")
+        assert latest.status_code == 200
+        assert latest.headers["cache-control"] == "no-cache"
+
+        etag = latest.headers["etag"]
+        assert client.get(f"/topologies/{DEFAULT_TOPOLOGY}", headers={"If-None-Match": etag}).status_code == 304
+
+        version = latest.json()["version"]
+        pinned = client.get(f"/topologies/{DEFAULT_TOPOLOGY}/versions/{version}")
+        assert "immutable" in pinned.headers["cache-control"]
+        assert pinned.headers["etag"] == etag